@@ -1,49 +1,33 @@
-import torch
-from transformers import AutoModelForCausalLM, AutoTokenizer
+from .llm_backends import get_llm
+from .llm_cache import cache_llm_caller
 from .tools import classify_ticket, extract_entities, validate_required_fields
 from .tool_logger import log_tool_call
 
-# Завантаження моделі
-MODEL_ID = "unsloth/llama-3-8b-Instruct-bnb-4bit"
-print("Завантаження моделі...")
-tokenizer = AutoTokenizer.from_pretrained(MODEL_ID)
-model = AutoModelForCausalLM.from_pretrained(
-    MODEL_ID,
-    device_map="auto",
-    torch_dtype=torch.float16
-)
+SYSTEM_PROMPT = "Ти - ввічливий агент служби підтримки. Відповідай українською коротко і по суті."
 
 def _generate_llm_response(prompt: str) -> str:
-    """Допоміжна функція для генерації тексту через локальну модель."""
+    """Допоміжна функція для генерації тексту через спільний LLM-бекенд (llm_backends)."""
     messages = [
-        {"role": "system", "content": "Ти - ввічливий агент служби підтримки. Відповідай українською коротко і по суті."},
+        {"role": "system", "content": SYSTEM_PROMPT},
         {"role": "user", "content": prompt}
     ]
-    
-    inputs = tokenizer.apply_chat_template(
-        messages, 
-        add_generation_prompt=True, 
-        return_tensors="pt",
-        return_dict=True
-    ).to(model.device)
-    
-    outputs = model.generate(
-        **inputs, 
-        max_new_tokens=150, 
-        temperature=0.2, 
-        pad_token_id=tokenizer.eos_token_id
-    )
-    
-    prompt_length = inputs["input_ids"].shape[1]
-    
-    return tokenizer.decode(outputs[0][prompt_length:], skip_special_tokens=True)
+    return get_llm().generate(messages, max_new_tokens=150, temperature=0.2)
+
+# Відповідь семплюється (temperature=0.2), тому кеш вмикається явно через use_cache=True
+_cached_llm_response = cache_llm_caller(
+    _generate_llm_response,
+    params={"system": SYSTEM_PROMPT, "max_new_tokens": 150, "temperature": 0.2}
+)
+
+def _llm_response(prompt: str, use_cache: bool) -> str:
+    return _cached_llm_response(prompt) if use_cache else _generate_llm_response(prompt)
 
-def run_baseline(user_text: str) -> str:
+def run_baseline(user_text: str, use_cache: bool = False) -> str:
     """Варіант 1: LLM без tools (модель відповідає лише за промптом)."""
     prompt = f"Користувач написав: '{user_text}'. Сформуй відповідь служби підтримки."
-    return _generate_llm_response(prompt)
+    return _llm_response(prompt, use_cache)
 
-def run_agent(task_id: str, user_text: str) -> str:
+def run_agent(task_id: str, user_text: str, use_cache: bool = False) -> str:
     """Варіант 2: Single-agent + tools."""
     tools_results = {}
     
@@ -87,4 +71,4 @@ def run_agent(task_id: str, user_text: str) -> str:
     Сформуй відповідь. Враховуй категорію. Якщо знайдено номер замовлення - згадай його.
     {missing_info_str}
     """
-    return _generate_llm_response(prompt)
\ No newline at end of file
+    return _llm_response(prompt, use_cache)
\ No newline at end of file
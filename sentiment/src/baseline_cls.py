@@ -1,9 +1,10 @@
 import pandas as pd
 import matplotlib.pyplot as plt
 from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.linear_model import LogisticRegression
+from sklearn.linear_model import LogisticRegression, SGDClassifier
 from sklearn.pipeline import Pipeline
 from sklearn.metrics import classification_report, accuracy_score, f1_score, confusion_matrix, ConfusionMatrixDisplay
+from .out_of_core import train_out_of_core
 
 def run_logreg_baseline(X_train, y_train):
     """
@@ -24,6 +25,22 @@ def run_logreg_baseline(X_train, y_train):
     pipeline.fit(X_train, y_train)
     return pipeline
 
+def run_logreg_out_of_core(csv_path, text_col="text", label_col="target", chunksize=10_000, n_epochs=5,
+                           n_features=2 ** 20):
+    """
+    Out-of-core версія run_logreg_baseline для корпусів, що не вміщуються в пам'ять:
+    хешовані word (1,2)-грами з потоковим IDF + SGDClassifier(loss='log_loss')
+    з class_weight='balanced', навчання частинами з CSV.
+    
+    Повертає:
+    Pipeline: Навчена модель.
+    """
+    return train_out_of_core(
+        csv_path, SGDClassifier(loss='log_loss', random_state=42), 'logreg',
+        text_col=text_col, label_col=label_col, analyzer="word", ngram_range=(1, 2),
+        n_features=n_features, class_weight='balanced', chunksize=chunksize, n_epochs=n_epochs
+    )
+
 def evaluate_model(pipeline, X_test, y_test):
     """
     Оцінює навчену модель та виводить базові метрики.
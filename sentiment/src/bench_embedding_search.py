@@ -0,0 +1,84 @@
+import time
+import numpy as np
+import pandas as pd
+from gensim.models import KeyedVectors
+from .embeddings_train import train_w2v, train_ft
+from .embedding_search import EmbeddingIndex
+
+
+def synthetic_keyed_vectors(n_words=100_000, vector_size=100, n_clusters=2_000, seed=42):
+    """KeyedVectors з кластеризованими випадковими векторами (замінник великої моделі)."""
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(n_clusters, vector_size))
+    vectors = centers[rng.integers(0, n_clusters, n_words)] + 1.5 * rng.normal(size=(n_words, vector_size))
+    kv = KeyedVectors(vector_size)
+    kv.add_vectors([f"w{i}" for i in range(n_words)], vectors.astype(np.float32))
+    return kv
+
+
+def recall_at_k(approx, exact, k=10):
+    """Середня частка точних top-k сусідів, знайдених наближеним пошуком."""
+    hits = [len({w for w, _ in a[:k]} & {w for w, _ in e[:k]}) / len(e[:k])
+            for a, e in zip(approx, exact) if a is not None and e]
+    return float(np.mean(hits)) if hits else 0.0
+
+
+def benchmark_index(keyed_vectors, queries, topn=10, n_probe=16):
+    """
+    recall@topn та queries/sec: IVF-індекс проти точного пошуку
+    (пакетний перебір NumPy та посимвольний wv.most_similar).
+    """
+    start = time.perf_counter()
+    index = EmbeddingIndex.build(keyed_vectors, n_probe=n_probe)
+    build_sec = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for word in queries:
+        keyed_vectors.most_similar(word, topn=topn)
+    most_similar_qps = len(queries) / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    exact = index.exact_neighbors(queries, topn)
+    exact_qps = len(queries) / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    approx = index.neighbors(queries, topn)
+    ann_qps = len(queries) / (time.perf_counter() - start)
+
+    return {
+        "vocab": len(index.words),
+        "n_lists": len(index.centroids),
+        "n_probe": n_probe,
+        "build_sec": build_sec,
+        "recall": recall_at_k(approx, exact, topn),
+        "most_similar_qps": most_similar_qps,
+        "exact_qps": exact_qps,
+        "ann_qps": ann_qps,
+        "speedup": ann_qps / most_similar_qps
+    }
+
+
+def _print_report(name, report):
+    print(f"{name}: {report['vocab']} слів, {report['n_lists']} кластерів, n_probe={report['n_probe']} "
+          f"(побудова {report['build_sec']:.1f} с)")
+    print(f"  recall@10: {report['recall']:.3f}")
+    print(f"  wv.most_similar: {report['most_similar_qps']:.0f} q/s, точний пакетний: {report['exact_qps']:.0f} q/s, "
+          f"IVF: {report['ann_qps']:.0f} q/s (x{report['speedup']:.1f})")
+
+
+if __name__ == "__main__":
+    kv = synthetic_keyed_vectors()
+    queries = kv.index_to_key[::100]
+    for n_probe in (8, 32, 128):
+        _print_report("synthetic", benchmark_index(kv, queries, n_probe=n_probe))
+
+    # Моделі lab9 на семплі (токени — слова сирого тексту)
+    df = pd.read_csv("sentiment/data/sample/sample_raw.csv").dropna()
+    corpus = df["text"].str.lower().str.split().tolist()
+    model_w2v, model_ft = train_w2v(corpus, min_count=1), train_ft(corpus, min_count=1)
+    queries = model_w2v.wv.index_to_key[:200]
+    _print_report("word2vec (sample)", benchmark_index(model_w2v.wv, queries, n_probe=4))
+    _print_report("fasttext (sample)", benchmark_index(model_ft.wv, queries, n_probe=4))
+
+    index = EmbeddingIndex.build(model_ft.wv, n_probe=4)
+    print("FastText OOV 'доставочка':", index.neighbors(["доставочка"], topn=5)[0])
@@ -0,0 +1,68 @@
+import os
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+from .embeddings_train import train_w2v, train_ft
+from .embedding_store import DTYPES, save_keyed_vectors, load_keyed_vectors
+from .bench_embedding_search import synthetic_keyed_vectors
+
+# Слова з перевірок сусідів lab9 (аналіз 10 слів + доменні терміни)
+LAB9_WORDS = ["магазин", "цитрус", "навушник", "ноут", "розетко", "брак", "відгук", "менеджер",
+              "повернути", "глючити", "гарантія", "сервісний", "доставка", "коробка", "комплектація"]
+
+
+def _dir_size_mb(path):
+    return sum(os.path.getsize(os.path.join(path, f)) for f in os.listdir(path)) / 2 ** 20
+
+
+def benchmark_export(keyed_vectors, words, topn=5):
+    """
+    Розмір на диску, час відкриття та якість сусідів для кожного dtype:
+    overlap@topn з wv.most_similar і середня абсолютна різниця косинусів сусідів.
+    Слова без вектора (OOV у Word2Vec) пропускаються.
+    """
+    words = [w for w in words if w in keyed_vectors.key_to_index or hasattr(keyed_vectors, "vectors_ngrams")]
+    expected = {w: keyed_vectors.most_similar(w, topn=topn) for w in words}
+    original_mb = (keyed_vectors.vectors.nbytes + getattr(keyed_vectors, "vectors_ngrams", np.empty(0)).nbytes) / 2 ** 20
+
+    reports = []
+    for dtype in DTYPES:
+        with tempfile.TemporaryDirectory() as path:
+            save_keyed_vectors(keyed_vectors, path, dtype=dtype)
+            start = time.perf_counter()
+            store = load_keyed_vectors(path)
+            load_ms = (time.perf_counter() - start) * 1e3
+
+            overlap, cos_error = [], []
+            for word in words:
+                got = store.most_similar(word, topn=topn)
+                overlap.append(len({w for w, _ in got} & {w for w, _ in expected[word]}) / topn)
+                cos_error.extend(abs(store.similarity(word, w) - s) for w, s in expected[word])
+
+            reports.append({"dtype": dtype, "size_mb": _dir_size_mb(path), "original_mb": original_mb,
+                            "load_ms": load_ms, "overlap": float(np.mean(overlap)),
+                            "cos_error": float(np.mean(cos_error)), "words": len(words)})
+            del store
+    return reports
+
+
+def _print_reports(name, reports):
+    print(f"{name}:")
+    for r in reports:
+        print(f"  {r['dtype']:8s} {r['size_mb']:8.1f} MB (у пам'яті {r['original_mb']:.1f} MB), "
+              f"відкриття {r['load_ms']:.1f} мс, overlap@5 {r['overlap']:.3f}, "
+              f"|Δcos| {r['cos_error']:.5f} ({r['words']} слів)")
+
+
+if __name__ == "__main__":
+    kv = synthetic_keyed_vectors()
+    _print_reports("synthetic", benchmark_export(kv, kv.index_to_key[::1000]))
+
+    # Моделі lab9 на семплі (токени — слова сирого тексту)
+    df = pd.read_csv("sentiment/data/sample/sample_raw.csv").dropna()
+    corpus = df["text"].str.lower().str.split().tolist()
+    models = {"word2vec": train_w2v(corpus, min_count=1), "fasttext": train_ft(corpus, min_count=1)}
+
+    for name, model in models.items():
+        _print_reports(f"{name} (sample)", benchmark_export(model.wv, LAB9_WORDS))
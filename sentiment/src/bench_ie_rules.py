@@ -0,0 +1,123 @@
+import json
+import random
+import re
+import sys
+import time
+from .ie_rules import RuleBasedExtractor, TrieGazetteer, COLUMNS
+
+
+def load_gold_texts(path="sentiment/data/sample/lab4_gold_ie.jsonl"):
+    """Унікальні тексти з розмітки lab4 (у порядку появи)."""
+    texts = {}
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                texts.setdefault(json.loads(line)["text"], None)
+    return list(texts)
+
+
+def synthetic_corpus(n_docs, seed=42, gold_path="sentiment/data/sample/lab4_gold_ie.jsonl"):
+    """
+    Синтетичний корпус: тексти з gold-файлу зі зміненими датами, сумами та містами,
+    склеєні по 1-3 речення, щоб документи відрізнялися.
+    """
+    rng = random.Random(seed)
+    extractor = RuleBasedExtractor()
+    templates = load_gold_texts(gold_path)
+    months = list(extractor.months)
+    currencies = ["грн", "гр", "₴", "uah", "usd"]
+    cities = list(extractor.locations)
+
+    def sentence():
+        text = rng.choice(templates)
+        return rng.choice([
+            text,
+            f"{text} Доставка {rng.randint(1, 28):02d}.{rng.randint(1, 12):02d}.{rng.randint(15, 24)}.",
+            f"{text} Ціна {rng.randint(10, 9999)},{rng.randint(0, 99):02d} {rng.choice(currencies)}.",
+            f"{text} Відправили {rng.randint(1, 28)} {rng.choice(months)} 20{rng.randint(10, 24)} з {rng.choice(cities).capitalize()}.",
+        ])
+
+    return [" ".join(sentence() for _ in range(rng.randint(1, 3))) for _ in range(n_docs)]
+
+
+def columns_to_records(columns, n_docs):
+    """Переводить колонковий результат назад у списки словників extract_all."""
+    records = [[] for _ in range(n_docs)]
+    for row in zip(*(columns[name] for name in COLUMNS)):
+        records[row[0]].append(dict(zip(COLUMNS[1:], row[1:])))
+    return records
+
+
+def benchmark_extract_all_batch(texts, n_jobs=-1, chunksize=2048):
+    """
+    Порівнює цикл extract_all (список словників на документ) з extract_all_batch
+    (колонки) в одному процесі та в пулі процесів. Перевіряє ідентичність результатів.
+    """
+    extractor = RuleBasedExtractor()
+    report = {"docs": len(texts)}
+
+    start = time.perf_counter()
+    records = [extractor.extract_all(t) for t in texts]
+    report["loop_docs_per_sec"] = len(texts) / (time.perf_counter() - start)
+
+    for name, jobs in (("batch", 1), ("parallel", n_jobs)):
+        start = time.perf_counter()
+        columns = extractor.extract_all_batch(texts, n_jobs=jobs, chunksize=chunksize)
+        report[f"{name}_docs_per_sec"] = len(texts) / (time.perf_counter() - start)
+
+    report["spans"] = len(columns["doc_id"])
+    report["identical"] = columns_to_records(columns, len(texts)) == records
+    return report
+
+
+def synthetic_gazetteer(n_names, seed=42):
+    """Справжні міста з locations.json + випадкові назви з кириличних складів до n_names."""
+    rng = random.Random(seed)
+    names = dict.fromkeys(RuleBasedExtractor().locations)
+    syllables = ["ка", "ме", "ні", "во", "ро", "ди", "ля", "ус", "пі", "то", "бр", "жи", "ць", "го", "ле"]
+    while len(names) < n_names:
+        names.setdefault("".join(rng.choice(syllables) for _ in range(rng.randint(2, 5))), None)
+    return list(names)
+
+
+def benchmark_gazetteer(texts, n_names=50_000):
+    """
+    Пошук назв зі словника на n_names: TrieGazetteer проти колишнього регулярного виразу
+    (?i)\\b(назва1|назва2|...)\\b. Час на документ (мкс) та ідентичність збігів.
+    """
+    names = synthetic_gazetteer(n_names)
+    report = {"docs": len(texts), "names": len(names)}
+
+    start = time.perf_counter()
+    gazetteer = TrieGazetteer(names)
+    pattern = re.compile(r'(?i)\b(' + '|'.join(re.escape(name) for name in names) + r')\b')
+    report["build_sec"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    trie_matches = [list(gazetteer.finditer(t)) for t in texts]
+    report["trie_us_per_doc"] = (time.perf_counter() - start) / len(texts) * 1e6
+
+    start = time.perf_counter()
+    regex_matches = [[m.span() for m in pattern.finditer(t)] for t in texts]
+    report["regex_us_per_doc"] = (time.perf_counter() - start) / len(texts) * 1e6
+
+    report["matches"] = sum(len(m) for m in trie_matches)
+    report["identical"] = trie_matches == regex_matches
+    return report
+
+
+if __name__ == "__main__":
+    n_docs = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    texts = synthetic_corpus(n_docs)
+
+    report = benchmark_extract_all_batch(texts)
+    print(f"extract_all на {report['docs']} документах, {report['spans']} спанів (identical: {report['identical']})")
+    print(f"  цикл extract_all:         {report['loop_docs_per_sec']:.0f} docs/sec")
+    print(f"  extract_all_batch n_jobs=1: {report['batch_docs_per_sec']:.0f} docs/sec")
+    print(f"  extract_all_batch пул:      {report['parallel_docs_per_sec']:.0f} docs/sec")
+
+    report = benchmark_gazetteer(texts[:500])
+    print(f"Словник на {report['names']} назв, {report['docs']} документів, {report['matches']} збігів "
+          f"(identical: {report['identical']})")
+    print(f"  TrieGazetteer: {report['trie_us_per_doc']:.1f} мкс/док")
+    print(f"  regex:         {report['regex_us_per_doc']:.1f} мкс/док")
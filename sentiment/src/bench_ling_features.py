@@ -0,0 +1,40 @@
+import time
+from .preprocess import TextPreprocessor
+from .ling_features import LinguisticExtractor
+from .bench_preprocess import load_texts
+
+
+def benchmark_extract_features(extractor, texts, batch_size=64):
+    """
+    Порівнює пропускну здатність (docs/sec) extract_features по одному документу
+    та extract_features_batch. Також рахує частку однакових результатів.
+    """
+    start = time.perf_counter()
+    single = [extractor.extract_features(t) for t in texts]
+    single_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = extractor.extract_features_batch(texts, batch_size=batch_size)
+    batch_time = time.perf_counter() - start
+
+    same = sum(1 for a, b in zip(single, batch) if a == b)
+    return {
+        "docs": len(texts),
+        "batch_size": batch_size,
+        "single_docs_per_sec": len(texts) / single_time,
+        "batch_docs_per_sec": len(texts) / batch_time,
+        "speedup": single_time / batch_time,
+        "identical_rate": same / len(texts) if texts else 1.0
+    }
+
+
+if __name__ == "__main__":
+    tp = TextPreprocessor()
+    texts = [tp.preprocess(t)["clean_normalized"] for t in load_texts()]
+
+    extractor = LinguisticExtractor(use_gpu=False)
+    for batch_size in (16, 64):
+        report = benchmark_extract_features(extractor, texts, batch_size=batch_size)
+        print(f"batch_size={batch_size}: {report['single_docs_per_sec']:.1f} -> "
+              f"{report['batch_docs_per_sec']:.1f} docs/sec (x{report['speedup']:.2f}, "
+              f"identical: {report['identical_rate']:.1%})")
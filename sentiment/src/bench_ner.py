@@ -0,0 +1,99 @@
+import csv
+import time
+from collections import Counter
+from .ner_pipeline import (load_baseline_model, create_hybrid_model, create_rule_model, run_inference,
+                           run_inference_stream, run_routed_inference_stream, needs_full_model, common_lowercase_words,
+                           RULE_LABELS)
+
+
+def load_eval_data(csv_path="sentiment/data/sample/sample_raw.csv", repeat=10):
+    """Тексти семплу у форматі eval_data (без розмітки — лише для вимірювання швидкості)."""
+    with open(csv_path, 'r', encoding='utf-8', newline='') as f:
+        texts = [row["text"] for row in csv.DictReader(f) if row["text"]]
+    return [{"text": t, "expected_entities": [], "expected_types": []} for t in texts * repeat]
+
+
+def benchmark_inference(nlp_model, eval_data, batch_size=64, n_process=1):
+    """
+    Порівнює поточний цикл run_inference з run_inference_stream (nlp.pipe):
+    docs/sec та збіг передбачених сутностей.
+    """
+    start = time.perf_counter()
+    loop_results = run_inference(nlp_model, eval_data)
+    loop_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    stream_results = list(run_inference_stream(nlp_model, eval_data, batch_size=batch_size, n_process=n_process))
+    stream_time = time.perf_counter() - start
+
+    return {
+        "docs": len(eval_data),
+        "identical": loop_results == stream_results,
+        "loop_docs_per_sec": len(eval_data) / loop_time,
+        "stream_docs_per_sec": len(eval_data) / stream_time,
+        "speedup": loop_time / stream_time
+    }
+
+
+def entity_agreement(reference, predicted, labels=None):
+    """
+    Збіг сутностей (текст, мітка) на рівні документів: precision/recall/F1
+    відносно reference. labels обмежує порівняння підмножиною міток.
+    """
+    tp = n_ref = n_pred = 0
+    for ref, pred in zip(reference, predicted):
+        ref_ents = Counter(e for e in ref["predicted"] if labels is None or e[1] in labels)
+        pred_ents = Counter(e for e in pred["predicted"] if labels is None or e[1] in labels)
+        tp += sum((ref_ents & pred_ents).values())
+        n_ref += sum(ref_ents.values())
+        n_pred += sum(pred_ents.values())
+
+    precision = tp / n_pred if n_pred else 1.0
+    recall = tp / n_ref if n_ref else 1.0
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    return {"precision": precision, "recall": recall, "f1": f1}
+
+
+def benchmark_rule_routing(full_model, eval_data, batch_size=64):
+    """
+    Порівнює повну гібридну модель з легкою моделлю правил та з роутером:
+    docs/sec, частка документів, відправлених у повну модель, і збіг сутностей.
+    """
+    rule_model = create_rule_model()
+    # Словник малих літер для роутера — з того самого корпусу (розмітка не потрібна)
+    common_words = common_lowercase_words(rule_model, (d["text"] for d in eval_data))
+    modes = {
+        "full": lambda: run_inference_stream(full_model, eval_data, batch_size=batch_size),
+        "rules": lambda: run_inference_stream(rule_model, eval_data, batch_size=batch_size),
+        "routed": lambda: run_routed_inference_stream(rule_model, full_model, eval_data, batch_size=batch_size,
+                                                      common_words=common_words),
+    }
+
+    results, report = {}, {"docs": len(eval_data)}
+    for name, run in modes.items():
+        start = time.perf_counter()
+        results[name] = list(run())
+        report[f"{name}_docs_per_sec"] = len(eval_data) / (time.perf_counter() - start)
+
+    routed = sum(needs_full_model(doc, common_words) for doc in rule_model.pipe(d["text"] for d in eval_data))
+    report["routed_share"] = routed / len(eval_data) if eval_data else 0.0
+    report["rules_agreement"] = entity_agreement(results["full"], results["rules"], labels=RULE_LABELS)
+    report["routed_agreement"] = entity_agreement(results["full"], results["routed"])
+    return report
+
+
+if __name__ == "__main__":
+    eval_data = load_eval_data()
+    for name, model in (("baseline", load_baseline_model()), ("hybrid", create_hybrid_model())):
+        report = benchmark_inference(model, eval_data)
+        print(f"{name}: {report['docs']} документів (identical: {report['identical']})")
+        print(f"  run_inference:        {report['loop_docs_per_sec']:.0f} docs/sec")
+        print(f"  run_inference_stream: {report['stream_docs_per_sec']:.0f} docs/sec (x{report['speedup']:.2f})")
+
+    report = benchmark_rule_routing(create_hybrid_model(), eval_data)
+    print(f"Правила без статистичної моделі ({report['docs']} документів)")
+    print(f"  повна гібридна модель: {report['full_docs_per_sec']:.0f} docs/sec")
+    print(f"  лише правила:          {report['rules_docs_per_sec']:.0f} docs/sec, "
+          f"F1 на мітках правил {report['rules_agreement']['f1']:.3f}")
+    print(f"  роутер:                {report['routed_docs_per_sec']:.0f} docs/sec, "
+          f"у повну модель {report['routed_share']:.0%}, F1 {report['routed_agreement']['f1']:.3f}")
@@ -0,0 +1,72 @@
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import pandas as pd
+from sklearn.metrics import f1_score
+from sklearn.model_selection import train_test_split
+from .baseline_cls import run_logreg_baseline, run_logreg_out_of_core
+from .svm_experiments import run_linear_svm, run_linear_svm_out_of_core
+
+
+def _measure(train):
+    """Навчає модель, повертаючи (модель, пік пам'яті в МБ за tracemalloc, час у секундах)."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    model = train()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return model, peak / 2 ** 20, elapsed
+
+
+def benchmark_out_of_core(csv_path="sentiment/data/sample/sample_raw.csv", text_col="text", label_col="target",
+                          test_size=0.2, chunksize=10_000):
+    """
+    Порівнює поточні in-memory пайплайни з out-of-core режимом:
+    пік пам'яті під час навчання та macro-F1 на відкладеній частині.
+    """
+    df = pd.read_csv(csv_path, usecols=[text_col, label_col]).dropna()
+    train_df, test_df = train_test_split(df, test_size=test_size, stratify=df[label_col], random_state=42)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        train_path = os.path.join(tmp, "train.csv")
+        train_df.to_csv(train_path, index=False)
+        X_train, y_train = train_df[text_col].astype(str), train_df[label_col]
+
+        setups = {
+            "logreg word(1,2) balanced": (
+                lambda: run_logreg_baseline(X_train, y_train),
+                lambda: run_logreg_out_of_core(train_path, text_col, label_col, chunksize=chunksize)),
+            "svm word(1,2)": (
+                lambda: run_linear_svm(X_train, y_train),
+                lambda: run_linear_svm_out_of_core(train_path, text_col, label_col, chunksize=chunksize)),
+            "svm char_wb(3,5)": (
+                lambda: run_linear_svm(X_train, y_train, analyzer="char_wb", ngram_range=(3, 5)),
+                lambda: run_linear_svm_out_of_core(train_path, text_col, label_col, analyzer="char_wb",
+                                                   ngram_range=(3, 5), chunksize=chunksize)),
+        }
+
+        report = {"train_docs": len(train_df), "test_docs": len(test_df)}
+        for name, modes in setups.items():
+            report[name] = {}
+            for mode, train in zip(("in_memory", "out_of_core"), modes):
+                model, peak_mb, elapsed = _measure(train)
+                y_pred = model.predict(test_df[text_col].astype(str))
+                report[name][mode] = {
+                    "peak_mb": peak_mb,
+                    "train_sec": elapsed,
+                    "macro_f1": f1_score(test_df[label_col], y_pred, average='macro')
+                }
+    return report
+
+
+if __name__ == "__main__":
+    csv_path = sys.argv[1] if len(sys.argv) > 1 else "sentiment/data/sample/sample_raw.csv"
+    report = benchmark_out_of_core(csv_path)
+    print(f"train: {report['train_docs']}, test: {report['test_docs']}")
+    for name in ("logreg word(1,2) balanced", "svm word(1,2)", "svm char_wb(3,5)"):
+        print(name)
+        for mode, r in report[name].items():
+            print(f"  {mode:12s} пік пам'яті {r['peak_mb']:8.1f} МБ, {r['train_sec']:6.2f} с, macro-F1 {r['macro_f1']:.4f}")
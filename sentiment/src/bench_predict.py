@@ -0,0 +1,59 @@
+import time
+import numpy as np
+import pandas as pd
+from .baseline_cls import run_logreg_baseline
+from .svm_experiments import run_linear_svm
+from .fast_predict import LinearTextPredictor
+
+
+def _latencies_us(func, inputs, repeat):
+    times = []
+    for _ in range(repeat):
+        for item in inputs:
+            start = time.perf_counter()
+            func(item)
+            times.append(time.perf_counter() - start)
+    return np.array(times) * 1e6
+
+
+def benchmark_latency(pipeline, texts, repeat=5, micro_batch=32):
+    """
+    Затримка на один текст (p50/p99, мкс): pipeline.predict([text]) проти
+    LinearTextPredictor.predict та predict_many на мікропакетах.
+    Перевіряє, що передбачення збігаються.
+    """
+    predictor = LinearTextPredictor(pipeline)
+    texts = list(texts)
+    expected = pipeline.predict(texts)
+
+    identical = (all(predictor.predict(t) == e for t, e in zip(texts, expected))
+                 and (predictor.predict_many(texts) == expected).all())
+
+    batches = [texts[i:i + micro_batch] for i in range(0, len(texts), micro_batch)]
+    modes = {
+        "pipeline": _latencies_us(lambda t: pipeline.predict([t]), texts, repeat),
+        "predictor": _latencies_us(predictor.predict, texts, repeat),
+        # Для мікропакетів — час пакета, поділений на кількість текстів у ньому
+        "predict_many": np.concatenate([
+            _latencies_us(predictor.predict_many, [batch], repeat) / len(batch) for batch in batches
+        ]),
+    }
+
+    report = {"texts": len(texts), "identical": identical}
+    for name, latencies in modes.items():
+        report[name] = {"p50_us": np.percentile(latencies, 50), "p99_us": np.percentile(latencies, 99)}
+    return report
+
+
+if __name__ == "__main__":
+    df = pd.read_csv("sentiment/data/sample/sample_raw.csv").dropna()
+    models = {
+        "logreg word(1,2)": run_logreg_baseline(df["text"], df["target"]),
+        "svm char_wb(3,5)": run_linear_svm(df["text"], df["target"], analyzer="char_wb", ngram_range=(3, 5)),
+    }
+    for name, pipeline in models.items():
+        report = benchmark_latency(pipeline, df["text"])
+        print(f"{name}: {report['texts']} текстів (identical: {report['identical']})")
+        for mode in ("pipeline", "predictor", "predict_many"):
+            r = report[mode]
+            print(f"  {mode:13s} p50 {r['p50_us']:8.1f} мкс, p99 {r['p99_us']:8.1f} мкс")
@@ -0,0 +1,175 @@
+import csv
+import html
+import json
+import time
+import regex as re
+from .preprocess import TextPreprocessor
+
+
+def legacy_mask_pii(text: str) -> str:
+    """Попередня реалізація TextPreprocessor.mask_pii (еталон для порівняння)."""
+    text = re.sub(r"\S+@\S+", " <EMAIL> ", text)
+
+    url_pattern = r'https?://\S+|www\.\S+|\b[a-z0-9.-]+\.(?:com|ua|net|org|edu|gov|io)\b(?:\/\S*)?'
+    text = re.sub(url_pattern, " <URL> ", text)
+
+    text = re.sub(r"(?i)(?:№+|код|замовлення|номер)\s*#?[\d\s,]{4,}\d", " <ID> ", text)
+    text = re.sub(r"\b\d{5,15}\b(?!\s*(?:грн|usd|eur|₴|\$|%|шт))", " <ID> ", text, flags=re.I)
+
+    phone_pattern = r"(\+?38)?\s?\(?\d{3}\)?[\s\.-]?\d{3}[\s\.-]?\d{2}[\s\.-]?\d{2}"
+    text = re.sub(phone_pattern, " <PHONE> ", text)
+
+    text = re.sub(r"(<ID>\s*[,/]*\s*)+", "<ID> ", text)
+    text = re.sub(r"\s+", " ", text)
+    return text.strip()
+
+
+def legacy_clean_basic(text: str) -> str:
+    """Попередня реалізація TextPreprocessor.clean_basic."""
+    if not text: return ""
+    text = html.unescape(text)
+    text = re.sub(r"(?i)\b(розгорнути|згорнути|читати далі|відповідь|розгорнутим)\b", " ", text)
+    return text.strip()
+
+
+def legacy_normalize_content(text: str, cyrillic_map: dict) -> str:
+    """Попередня реалізація TextPreprocessor.normalize_content."""
+    parts = re.split(r"(<[A-Z]+>)", text)
+    translation_table = str.maketrans(cyrillic_map)
+
+    for i in range(len(parts)):
+        if not re.match(r"<[A-Z]+>", parts[i]):
+            part = parts[i]
+            part = part.translate(translation_table)
+            part = re.sub(r"[`'’‘]", "'", part)
+
+            def lower_caps(match):
+                word = match.group(0)
+                if any(char.isdigit() for char in word): return word
+                return word.lower()
+
+            part = re.sub(r"\b[А-ЯІЇЄҐA-Z]{2,}\b", lower_caps, part)
+
+            part = re.sub(r"\s+([.,!?])", r"\1", part)
+            part = re.sub(r"!{2,}", "!!", part)
+            part = re.sub(r"\?{2,}", "??", part)
+            part = re.sub(r"\.{4,}", "...", part)
+
+            part = re.sub(r"\b(м|вул|кв|просп|бул)\.(?=[А-ЯІЇЄҐа-яіїєґA-Za-z])", r"\1. ", part)
+            part = re.sub(r"(\d+)\s*(грн|usd|eur|%|шт|тб|gb|tb|кг|₴|\$)\b", lambda m: f"{m.group(1)} {m.group(2).lower()}", part, flags=re.I)
+
+            parts[i] = part
+
+    return "".join(parts)
+
+
+def legacy_sentence_split(text: str, ua_abbreviations: list) -> list[str]:
+    """Попередня реалізація TextPreprocessor.sentence_split."""
+    abbs_pattern = "|".join([re.escape(a.replace('.', '')) for a in ua_abbreviations])
+    pattern = rf"(?<!\b(?:{abbs_pattern}))(?<=[.!?])\s+(?=[А-ЯІЇЄҐA-Z])"
+
+    sentences = re.split(pattern, text)
+    return [s.strip() for s in sentences if len(s.strip()) > 1]
+
+
+def legacy_preprocess(text: str, tp: TextPreprocessor) -> dict:
+    """Попередній pipeline preprocess цілком (словники беруться з tp)."""
+    t = legacy_clean_basic(text)
+    t = legacy_mask_pii(t)
+    t = legacy_normalize_content(t, tp.cyrillic_map)
+    sentences = legacy_sentence_split(t, tp.ua_abbreviations)
+    return {
+        "original": text,
+        "clean_normalized": t,
+        "sentences": sentences,
+        "sentence_count": len(sentences)
+    }
+
+
+def load_texts(edge_cases_path="sentiment/tests/edge_cases.jsonl", csv_path="sentiment/data/sample/sample_raw.csv"):
+    """Збирає тексти для бенчмарку: edge cases + сирий семпл."""
+    texts = []
+    with open(edge_cases_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                texts.append(json.loads(line)["raw_text"])
+    if csv_path:
+        with open(csv_path, 'r', encoding='utf-8', newline='') as f:
+            texts.extend(row["text"] for row in csv.DictReader(f))
+    return texts
+
+
+def _time_per_doc(func, texts, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for text in texts:
+            func(text)
+        best = min(best, time.perf_counter() - start)
+    return best / len(texts)
+
+
+def benchmark_mask_pii(texts, repeat=5):
+    """
+    Порівнює PIIMasker зі старою реалізацією: ідентичність виходу та пропускна здатність.
+    """
+    tp = TextPreprocessor()
+    inputs = [tp.clean_basic(t) for t in texts] + list(texts)
+
+    mismatches = [t for t in inputs if tp.mask_pii(t) != legacy_mask_pii(t)]
+
+    legacy = _time_per_doc(legacy_mask_pii, inputs, repeat)
+    engine = _time_per_doc(tp.mask_pii, inputs, repeat)
+    return {
+        "docs": len(inputs),
+        "identical": not mismatches,
+        "mismatches": len(mismatches),
+        "legacy_docs_per_sec": 1 / legacy,
+        "engine_docs_per_sec": 1 / engine,
+        "speedup": legacy / engine
+    }
+
+
+def benchmark_preprocess(texts, repeat=5):
+    """
+    Мікробенчмарк вартості одного документа (мкс) до/після для normalize_content,
+    sentence_split та повного preprocess. Також перевіряє ідентичність результатів.
+    """
+    tp = TextPreprocessor()
+    masked = [tp.mask_pii(tp.clean_basic(t)) for t in texts]
+    normalized = [tp.normalize_content(t) for t in masked]
+
+    identical = (
+        all(tp.normalize_content(t) == legacy_normalize_content(t, tp.cyrillic_map) for t in masked)
+        and all(tp.sentence_split(t) == legacy_sentence_split(t, tp.ua_abbreviations) for t in normalized)
+        and all(tp.preprocess(t) == legacy_preprocess(t, tp) for t in texts)
+    )
+
+    stages = {
+        "normalize_content": (masked, lambda t: legacy_normalize_content(t, tp.cyrillic_map), tp.normalize_content),
+        "sentence_split": (normalized, lambda t: legacy_sentence_split(t, tp.ua_abbreviations), tp.sentence_split),
+        "preprocess": (texts, lambda t: legacy_preprocess(t, tp), tp.preprocess),
+    }
+    report = {"docs": len(texts), "identical": identical}
+    for name, (inputs, before, after) in stages.items():
+        before_us = _time_per_doc(before, inputs, repeat) * 1e6
+        after_us = _time_per_doc(after, inputs, repeat) * 1e6
+        report[name] = {"before_us": before_us, "after_us": after_us, "speedup": before_us / after_us}
+    return report
+
+
+if __name__ == "__main__":
+    edge_report = benchmark_mask_pii(load_texts(csv_path=None))
+    print(f"tests/edge_cases.jsonl identical: {edge_report['identical']} ({edge_report['mismatches']} mismatches)")
+
+    report = benchmark_mask_pii(load_texts())
+    print(f"mask_pii на {report['docs']} текстах (identical: {report['identical']})")
+    print(f"  legacy: {report['legacy_docs_per_sec']:.0f} docs/sec")
+    print(f"  engine: {report['engine_docs_per_sec']:.0f} docs/sec")
+    print(f"  speedup: x{report['speedup']:.2f}")
+
+    report = benchmark_preprocess(load_texts())
+    print(f"Вартість документа, мкс (identical: {report['identical']})")
+    for stage in ("normalize_content", "sentence_split", "preprocess"):
+        r = report[stage]
+        print(f"  {stage}: {r['before_us']:.1f} -> {r['after_us']:.1f} (x{r['speedup']:.2f})")
@@ -0,0 +1,414 @@
+import bisect
+import json
+import re
+import threading
+import torch
+from transformers import LogitsProcessor
+
+# Обмежене декодування за JSON-схемою: скінченний автомат на рівні байтів,
+# побудований зі схеми (json_schema.EXTRACTION_SCHEMA), перетворюється на маску
+# токенів для кожного кроку генерації. Вихід — валідний за схемою JSON за побудовою.
+#
+# Підтримувана підмножина схем: object (усі properties у порядку схеми), array,
+# string (з enum), number, integer, boolean, null та списки типів.
+
+WHITESPACE = frozenset(b" \t\n\r")
+# Пробіли між елементами JSON (поспіль): 2 допускають звичне '"key": value, ...',
+# але не багаторядкове форматування, що лише додає згенерованих токенів
+MAX_WHITESPACE = 2
+# Обмеження довжини числа: інакше модель може генерувати цифри до max_new_tokens
+MAX_NUMBER_LENGTH = 16
+_ESCAPES = frozenset(b'"\\/bfnrt')
+_HEX = frozenset(b"0123456789abcdefABCDEF")
+_DIGITS = frozenset(b"0123456789")
+
+# Автомат числа JSON: фаза -> {байт: наступна фаза}; кінцеві фази — 2, 3, 5, 8
+_NUMBER_FINAL = frozenset((2, 3, 5, 8))
+
+
+def _number_transitions(integer):
+    nonzero = {d: 2 for d in b"123456789"}
+    fraction = {} if integer else {ord("."): 4, ord("e"): 6, ord("E"): 6}
+    return {
+        0: {ord("-"): 1, ord("0"): 3, **nonzero},
+        1: {ord("0"): 3, **nonzero},
+        2: {**{d: 2 for d in _DIGITS}, **fraction},
+        3: fraction,
+        4: {d: 5 for d in _DIGITS},
+        5: {**{d: 5 for d in _DIGITS}, ord("e"): 6, ord("E"): 6},
+        6: {ord("+"): 7, ord("-"): 7, **{d: 8 for d in _DIGITS}},
+        7: {d: 8 for d in _DIGITS},
+        8: {d: 8 for d in _DIGITS},
+    }
+
+
+_NUMBER_TRANSITIONS = {False: _number_transitions(False), True: _number_transitions(True)}
+
+
+class SchemaAutomaton:
+    """
+    Байтовий автомат для JSON за схемою.
+
+    Стан — кортеж (стек кадрів, кількість пробілів поспіль); кадр — (вузол, фаза, дані).
+    Стани незмінні й хешовані, тож маски токенів кешуються за станом: усередині
+    довільного рядка стан не залежить від уже згенерованого тексту.
+    """
+    def __init__(self, schema, max_whitespace=MAX_WHITESPACE):
+        self.max_whitespace = max_whitespace
+        self.nodes = []
+        self.root = self._compile(schema)
+
+    def _add(self, node):
+        self.nodes.append(node)
+        return len(self.nodes) - 1
+
+    def _compile(self, schema):
+        types = schema.get("type")
+        if isinstance(types, list):
+            options = [self._compile({**schema, "type": t}) for t in types]
+            return options[0] if len(options) == 1 else self._add(("union", tuple(options)))
+
+        if "enum" in schema and types in (None, "string"):
+            values = tuple(json.dumps(v, ensure_ascii=False)[1:-1].encode("utf-8") for v in schema["enum"])
+            return self._add(("string", values))
+        if types == "object":
+            properties = schema.get("properties", {})
+            keys = tuple((json.dumps(name, ensure_ascii=False).encode("utf-8"), self._compile(child))
+                         for name, child in properties.items())
+            return self._add(("object", keys))
+        if types == "array":
+            return self._add(("array", self._compile(schema.get("items", {"type": "string"}))))
+        if types == "string":
+            return self._add(("string", None))
+        if types in ("number", "integer"):
+            return self._add(("number", types == "integer"))
+        if types == "boolean":
+            return self._add(("union", (self._add(("literal", b"true")), self._add(("literal", b"false")))))
+        if types == "null":
+            return self._add(("literal", b"null"))
+        raise ValueError(f"Непідтримуваний тип у схемі: {types}")
+
+    def initial_state(self):
+        return ((self.root, 0, None),), 0
+
+    @staticmethod
+    def is_complete(state):
+        return not state[0]
+
+    def step(self, state, byte):
+        """Новий стан після байта або None, якщо байт порушує схему."""
+        stack, whitespace = state
+        if stack:
+            node_id, phase, _ = stack[-1]
+            kind = self.nodes[node_id][0]
+            if kind == "string" and phase == 1:
+                # Усередині рядка пробіл — це вміст
+                stack = self._feed(stack, byte)
+                return None if stack is None else (stack, 0)
+            if byte in WHITESPACE and kind == "number" and phase in _NUMBER_FINAL:
+                # Пробіл після завершеного числа завершує його
+                stack = self._complete(stack[:-1])
+
+        if byte in WHITESPACE:
+            if whitespace >= self.max_whitespace or not self._allows_whitespace(stack):
+                return None
+            return stack, whitespace + 1
+
+        stack = self._feed(stack, byte)
+        return None if stack is None else (stack, 0)
+
+    def _allows_whitespace(self, stack):
+        if not stack:
+            return False
+        node_id, phase, _ = stack[-1]
+        kind = self.nodes[node_id][0]
+        if kind == "object":
+            return phase in (0, 1, 3, 5)
+        if kind == "array":
+            return phase in (0, 1, 2)
+        return phase == 0
+
+    def _feed(self, stack, byte):
+        if not stack:
+            return None
+        node_id, phase, data = stack[-1]
+        node = self.nodes[node_id]
+        rest = stack[:-1]
+        kind = node[0]
+
+        if kind == "object":
+            keys = node[1]
+            if phase == 0:
+                return rest + ((node_id, 1, 0),) if byte == ord("{") else None
+            if phase == 1:
+                # Очікуємо ключ номер data (або '}' для порожнього об'єкта)
+                if data == len(keys):
+                    return self._complete(rest) if byte == ord("}") else None
+                return rest + ((node_id, 2, (data, 1)),) if byte == keys[data][0][0] else None
+            if phase == 2:
+                index, pos = data
+                key = keys[index][0]
+                if byte != key[pos]:
+                    return None
+                return rest + ((node_id, 2, (index, pos + 1)) if pos + 1 < len(key) else (node_id, 3, index),)
+            if phase == 3:
+                if byte != ord(":"):
+                    return None
+                return rest + ((node_id, 5, data), (keys[data][1], 0, None))
+            if phase == 5:
+                if data + 1 < len(keys):
+                    return rest + ((node_id, 1, data + 1),) if byte == ord(",") else None
+                return self._complete(rest) if byte == ord("}") else None
+
+        elif kind == "array":
+            item = node[1]
+            if phase == 0:
+                return rest + ((node_id, 1, None),) if byte == ord("[") else None
+            if phase == 1:
+                if byte == ord("]"):
+                    return self._complete(rest)
+                return self._feed(rest + ((node_id, 2, None), (item, 0, None)), byte)
+            if phase == 2:
+                if byte == ord(","):
+                    return rest + ((node_id, 2, None), (item, 0, None))
+                return self._complete(rest) if byte == ord("]") else None
+
+        elif kind == "string":
+            values = node[1]
+            if phase == 0:
+                return rest + ((node_id, 1, b"" if values is not None else 0),) if byte == ord('"') else None
+            if values is not None:
+                if byte == ord('"'):
+                    return self._complete(rest) if data in values else None
+                prefix = data + bytes((byte,))
+                return rest + ((node_id, 1, prefix),) if any(v.startswith(prefix) for v in values) else None
+            # data: 0 — звичайний символ, 1 — після '\', 2..5 — цифри \uXXXX
+            if data == 0:
+                if byte == ord('"'):
+                    return self._complete(rest)
+                if byte == ord("\\"):
+                    return rest + ((node_id, 1, 1),)
+                return stack if byte >= 0x20 else None
+            if data == 1:
+                if byte == ord("u"):
+                    return rest + ((node_id, 1, 2),)
+                return rest + ((node_id, 1, 0),) if byte in _ESCAPES else None
+            if byte not in _HEX:
+                return None
+            return rest + ((node_id, 1, 0 if data == 5 else data + 1),)
+
+        elif kind == "number":
+            integer = node[1]
+            transitions = _NUMBER_TRANSITIONS[integer][phase]
+            length = data or 0
+            if byte in transitions and length < MAX_NUMBER_LENGTH:
+                return rest + ((node_id, transitions[byte], length + 1),)
+            # Число закінчується на першому символі, що його не продовжує
+            if phase in _NUMBER_FINAL:
+                completed = self._complete(rest)
+                return None if completed is None else self._feed(completed, byte)
+            return None
+
+        elif kind == "literal":
+            literal = node[1]
+            if byte != literal[phase]:
+                return None
+            return rest + ((node_id, phase + 1, None),) if phase + 1 < len(literal) else self._complete(rest)
+
+        elif kind == "union":
+            if phase != 0:
+                return None
+            for option in node[1]:
+                result = self._feed(rest + ((option, 0, None),), byte)
+                if result is not None:
+                    return result
+            return None
+        return None
+
+    def _complete(self, rest):
+        """Дочірнє значення завершено: батьківський кадр переходить далі."""
+        if not rest:
+            return ()
+        node_id, phase, data = rest[-1]
+        if self.nodes[node_id][0] == "array":
+            return rest[:-1] + ((node_id, 2, None),)
+        return rest  # об'єкт уже у фазі 5 (після значення)
+
+
+def _bytes_to_unicode():
+    """Відображення байтів у символи byte-level BPE (як у GPT-2 / Llama 3)."""
+    bs = list(range(ord("!"), ord("~") + 1)) + list(range(ord("¡"), ord("¬") + 1)) + list(range(ord("®"), ord("ÿ") + 1))
+    cs = bs[:]
+    n = 0
+    for b in range(256):
+        if b not in bs:
+            bs.append(b)
+            cs.append(256 + n)
+            n += 1
+    return dict(zip(bs, map(chr, cs)))
+
+
+def token_bytes(tokenizer):
+    """
+    Байти кожного токена словника (None для спецтокенів).
+    Спецтокени — all_special_ids та додані токени з special=True (у Llama 3
+    <|end_of_text|>, <|start_header_id|>, <|reserved_special_token_*|> тощо).
+    Підтримує byte-level BPE (Llama 3, GPT-2) та SentencePiece (▁ і <0xXX>).
+    """
+    byte_decoder = {c: b for b, c in _bytes_to_unicode().items()}
+    special = set(tokenizer.all_special_ids)
+    special.update(token_id for token_id, token in getattr(tokenizer, "added_tokens_decoder", {}).items()
+                   if getattr(token, "special", False))
+    vocab = tokenizer.get_vocab()
+    pieces = [None] * (max(vocab.values()) + 1)
+    for piece, token_id in vocab.items():
+        pieces[token_id] = piece
+
+    byte_level = all(c in byte_decoder for token_id, piece in enumerate(pieces)
+                     if piece and token_id not in special for c in piece)
+    byte_token = re.compile(r"^<0x([0-9A-Fa-f]{2})>$")
+    result = []
+    for token_id, piece in enumerate(pieces):
+        if piece is None or token_id in special:
+            result.append(None)
+        elif byte_level:
+            result.append(bytes(byte_decoder[c] for c in piece))
+        elif byte_token.match(piece):
+            result.append(bytes((int(piece[3:5], 16),)))
+        else:
+            result.append(piece.replace("▁", " ").encode("utf-8"))
+    return result
+
+
+class SchemaTokenMasker:
+    """
+    Маски дозволених токенів для станів SchemaAutomaton.
+
+    Токени відсортовані за байтами; обхід іде спільними префіксами, а гілки,
+    що порушують схему, пропускаються бінарним пошуком. Маски кешуються за станом
+    і перевикористовуються між документами, тож обчислюються один раз на
+    кожен різний стан (позиція у схемі, префікс enum тощо).
+    """
+    def __init__(self, schema, tokenizer, eos_token_ids=None, max_whitespace=MAX_WHITESPACE):
+        self.automaton = SchemaAutomaton(schema, max_whitespace)
+        self.tokenizer = tokenizer
+        self.token_bytes = token_bytes(tokenizer)
+        # Для чат-моделей кінець відповіді часто позначає окремий токен (напр. <|eot_id|>)
+        self.eos_token_ids = set(eos_token_ids or ())
+        if tokenizer.eos_token_id is not None:
+            self.eos_token_ids.add(tokenizer.eos_token_id)
+        # EOS ніколи не є текстом: дозволяється лише після завершеного JSON
+        for token_id in self.eos_token_ids:
+            if token_id < len(self.token_bytes):
+                self.token_bytes[token_id] = None
+        order = sorted((b, i) for i, b in enumerate(self.token_bytes) if b)
+        self._sorted_bytes = [b for b, _ in order]
+        self._sorted_ids = [i for _, i in order]
+        self._masks = {}
+        self._lock = threading.Lock()
+
+    def _successor(self, prefix):
+        """Найменший рядок байтів, більший за всі рядки з префіксом prefix."""
+        prefix = prefix.rstrip(b"\xff")
+        return prefix[:-1] + bytes((prefix[-1] + 1,)) if prefix else None
+
+    def allowed_ids(self, state):
+        automaton = self.automaton
+        if automaton.is_complete(state):
+            return sorted(self.eos_token_ids)
+
+        allowed = []
+        states = [state]
+        current = b""
+        tokens = self._sorted_bytes
+        i = 0
+        while i < len(tokens):
+            token = tokens[i]
+            depth = 0
+            limit = min(len(current), len(token))
+            while depth < limit and current[depth] == token[depth]:
+                depth += 1
+            del states[depth + 1:]
+            current = token[:depth]
+
+            rejected = False
+            for k in range(depth, len(token)):
+                next_state = automaton.step(states[k], token[k])
+                if next_state is None:
+                    # Усі токени з префіксом token[:k + 1] теж недопустимі
+                    successor = self._successor(token[:k + 1])
+                    i = len(tokens) if successor is None else bisect.bisect_left(tokens, successor, lo=i + 1)
+                    rejected = True
+                    break
+                states.append(next_state)
+                current = token[:k + 1]
+            if not rejected:
+                allowed.append(self._sorted_ids[i])
+                i += 1
+        return allowed
+
+    def mask(self, state, vocab_size, device):
+        """Булева маска дозволених токенів (кешується за станом)."""
+        key = (state, vocab_size, str(device))
+        with self._lock:
+            mask = self._masks.get(key)
+        if mask is None:
+            mask = torch.zeros(vocab_size, dtype=torch.bool)
+            ids = [i for i in self.allowed_ids(state) if i < vocab_size]
+            mask[ids] = True
+            mask = mask.to(device)
+            with self._lock:
+                self._masks[key] = mask
+        return mask
+
+    def advance(self, state, token_id):
+        """Стан після згенерованого токена (None, якщо токен не допускався)."""
+        data = self.token_bytes[token_id] if token_id < len(self.token_bytes) else None
+        if not data:
+            # EOS допустимий лише після завершеного JSON
+            complete = state is not None and self.automaton.is_complete(state)
+            return state if complete and token_id in self.eos_token_ids else None
+        for byte in data:
+            if state is None:
+                return None
+            state = self.automaton.step(state, byte)
+        return state
+
+    def processor(self):
+        """Новий JsonSchemaLogitsProcessor для одного виклику generate."""
+        return JsonSchemaLogitsProcessor(self)
+
+
+class JsonSchemaLogitsProcessor(LogitsProcessor):
+    """
+    LogitsProcessor для model.generate / pipeline: на кожному кроці залишає
+    лише токени, що продовжують валідний за схемою JSON; EOS дозволено лише
+    після завершеного об'єкта. Стан кожного рядка пакета оновлюється за
+    новими токенами (промпт з лівим паддінгом має однакову довжину для всіх рядків).
+    """
+    def __init__(self, masker):
+        self.masker = masker
+        self._states = None
+        self._prompt_length = None
+        self._last_length = None
+
+    def __call__(self, input_ids, scores):
+        batch_size, length = input_ids.shape
+        if self._states is None or len(self._states) != batch_size or length != self._last_length + 1:
+            # Новий виклик generate
+            self._states = [self.masker.automaton.initial_state()] * batch_size
+            self._prompt_length = length
+        else:
+            new_tokens = input_ids[:, -1].tolist()
+            for row, token_id in enumerate(new_tokens):
+                state = self._states[row]
+                if state is not None and not self.masker.automaton.is_complete(state):
+                    self._states[row] = self.masker.advance(state, token_id)
+        self._last_length = length
+
+        masks = torch.stack([
+            self.masker.mask(state, scores.shape[-1], scores.device) if state is not None
+            else torch.ones(scores.shape[-1], dtype=torch.bool, device=scores.device)
+            for state in self._states
+        ])
+        return scores.masked_fill(~masks, float("-inf"))
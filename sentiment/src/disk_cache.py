@@ -0,0 +1,179 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from collections import OrderedDict
+
+
+class DiskCache:
+    """
+    Key-value кеш у SQLite з LRU-шаром у пам'яті.
+    Значення зберігаються як JSON; при перевищенні max_entries з диска
+    видаляються записи, до яких найдовше не зверталися.
+    ttl (секунди) — необов'язковий строк життя запису від моменту запису;
+    прострочені записи вважаються відсутніми і видаляються при наступному записі.
+
+    last_access для влучань у пам'ять оновлюється на диску пачками (touch_batch),
+    а кількість записів перевіряється раз на evict_every вставок, тож кеш може
+    ненадовго перевищити max_entries на кілька записів.
+    """
+    def __init__(self, path, max_entries=100_000, memory_size=1024, ttl=None, touch_batch=256, evict_every=None):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        self.path = path
+        self.max_entries = max_entries
+        self.memory_size = memory_size
+        self.ttl = ttl
+        self._memory = OrderedDict()
+        self.touch_batch = touch_batch
+        self.evict_every = evict_every or max(1, min(1000, max_entries // 100))
+        self._touched = {}
+        # Перший запис одразу перевіряє розмір кешу, відкритого з диска
+        self._inserts_since_evict = self.evict_every
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.expired = 0
+
+        # Доступ з кількох потоків серіалізує викликач (див. CachedLLM)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, last_access REAL NOT NULL, created REAL NOT NULL)"
+        )
+        columns = [row[1] for row in self._conn.execute("PRAGMA table_info(cache)")]
+        if "created" not in columns:
+            # Кеш, створений до появи TTL: час запису невідомий, беремо час останнього доступу
+            self._conn.execute("ALTER TABLE cache ADD COLUMN created REAL NOT NULL DEFAULT 0")
+            self._conn.execute("UPDATE cache SET created = last_access")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS cache_last_access ON cache(last_access)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS cache_created ON cache(created)")
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(*parts) -> str:
+        """Хеш від усіх частин ключа (текст, версія моделі, параметри тощо)."""
+        return hashlib.sha256("\x1f".join(str(p) for p in parts).encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        """Повертає значення або None, якщо ключа немає."""
+        return self.get_many([key]).get(key)
+
+    def _is_expired(self, created, now):
+        return self.ttl is not None and created < now - self.ttl
+
+    def get_many(self, keys) -> dict:
+        found = {}
+        missing = []
+        now = time.time()
+        for key in keys:
+            if key in self._memory and not self._is_expired(self._memory[key][1], now):
+                self._memory.move_to_end(key)
+                found[key] = self._memory[key][0]
+                self._touched[key] = now
+                self.memory_hits += 1
+            else:
+                self._memory.pop(key, None)
+                missing.append(key)
+
+        if missing:
+            # SQLite обмежує кількість параметрів у запиті, тому читаємо частинами
+            for start in range(0, len(missing), 500):
+                chunk = missing[start:start + 500]
+                rows = self._conn.execute(
+                    f"SELECT key, value, created FROM cache WHERE key IN ({','.join('?' * len(chunk))})", chunk
+                ).fetchall()
+                fresh = []
+                for key, value, created in rows:
+                    if self._is_expired(created, now):
+                        self.expired += 1
+                        continue
+                    found[key] = json.loads(value)
+                    self._remember(key, found[key], created)
+                    fresh.append(key)
+                self._conn.executemany("UPDATE cache SET last_access = ? WHERE key = ?",
+                                       [(now, key) for key in fresh])
+            self._conn.commit()
+
+            self.disk_hits += sum(1 for key in missing if key in found)
+            self.misses += sum(1 for key in missing if key not in found)
+        if len(self._touched) >= self.touch_batch:
+            self._flush_touched()
+            self._conn.commit()
+        return found
+
+    def _flush_touched(self):
+        """Записує на диск last_access для ключів, знайдених у пам'яті."""
+        if self._touched:
+            self._conn.executemany("UPDATE cache SET last_access = ? WHERE key = ?",
+                                   [(at, key) for key, at in self._touched.items()])
+            self._touched.clear()
+
+    def set(self, key, value):
+        self.set_many({key: value})
+
+    def set_many(self, items: dict):
+        if not items:
+            return
+        now = time.time()
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO cache (key, value, last_access, created) VALUES (?, ?, ?, ?)",
+            [(key, json.dumps(value, ensure_ascii=False), now, now) for key, value in items.items()]
+        )
+        for key, value in items.items():
+            self._remember(key, value, now)
+            self._touched.pop(key, None)
+        self._inserts_since_evict += len(items)
+        if self._inserts_since_evict >= self.evict_every:
+            self._evict()
+        self._conn.commit()
+
+    def _remember(self, key, value, created):
+        self._memory[key] = (value, created)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def purge_expired(self):
+        """Видаляє з диска всі прострочені записи (за наявності ttl)."""
+        if self.ttl is not None:
+            self._conn.execute("DELETE FROM cache WHERE created < ?", (time.time() - self.ttl,))
+
+    def _evict(self):
+        self._inserts_since_evict = 0
+        self._flush_touched()
+        self.purge_expired()
+        n_entries = self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+        if n_entries > self.max_entries:
+            # Видаляємо із запасом (10%), щоб не чистити кеш на кожному записі
+            n_delete = n_entries - int(self.max_entries * 0.9)
+            evicted = [row[0] for row in self._conn.execute(
+                "SELECT key FROM cache ORDER BY last_access LIMIT ?", (n_delete,)
+            )]
+            self._conn.executemany("DELETE FROM cache WHERE key = ?", [(key,) for key in evicted])
+            # Шар у пам'яті не повинен віддавати видалені з диска записи
+            for key in evicted:
+                self._memory.pop(key, None)
+
+    def stats(self) -> dict:
+        hits = self.memory_hits + self.disk_hits
+        total = hits + self.misses
+        return {
+            "hits": hits,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "expired": self.expired,
+            "hit_rate": hits / total if total else 0.0,
+            "entries": self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+        }
+
+    def close(self):
+        self._flush_touched()
+        self._conn.commit()
+        self._conn.close()
@@ -0,0 +1,160 @@
+import json
+import os
+import numpy as np
+
+
+def _normalize(vectors):
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1
+    return (vectors / norms).astype(np.float32)
+
+
+def _top_k(scores, k):
+    """Індекси k найбільших значень (за спаданням) для кожного рядка."""
+    k = min(k, scores.shape[1])
+    if k <= 0:
+        return np.empty((scores.shape[0], 0), dtype=np.intp)
+    top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    order = np.argsort(-np.take_along_axis(scores, top, axis=1), axis=1, kind="stable")
+    return np.take_along_axis(top, order, axis=1)
+
+
+class EmbeddingIndex:
+    """
+    IVF-індекс (inverted file) для пошуку найближчих сусідів у KeyedVectors на чистому NumPy.
+
+    Нормовані вектори розбиваються сферичним k-means на n_lists кластерів; запит
+    порівнюється лише з векторами n_probe найближчих кластерів. Косинусна схожість,
+    як у wv.most_similar. Для FastText OOV-слова отримують вектор з n-грам
+    (якщо передано keyed_vectors).
+    """
+    def __init__(self, words, vectors, centroids, list_ids, list_offsets, keyed_vectors=None, n_probe=16):
+        self.words = list(words)
+        self.word_index = {w: i for i, w in enumerate(self.words)}
+        self.vectors = vectors
+        self.centroids = centroids
+        self.list_ids = list_ids
+        self.list_offsets = list_offsets
+        self.keyed_vectors = keyed_vectors
+        self.n_probe = n_probe
+
+    @classmethod
+    def build(cls, keyed_vectors, n_lists=None, n_probe=16, n_iter=10, sample_size=100_000, seed=42):
+        """Будує індекс по wv моделі з train_w2v / train_ft (або будь-яких KeyedVectors)."""
+        vectors = _normalize(keyed_vectors.vectors)
+        n_lists = n_lists or max(1, int(4 * np.sqrt(len(vectors))))
+        n_lists = min(n_lists, len(vectors))
+
+        # Сферичний k-means на підвибірці
+        rng = np.random.default_rng(seed)
+        sample = vectors[rng.choice(len(vectors), min(sample_size, len(vectors)), replace=False)]
+        centroids = sample[rng.choice(len(sample), n_lists, replace=False)]
+        for _ in range(n_iter):
+            assignment = cls._assign(sample, centroids)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignment, sample)
+            empty = np.bincount(assignment, minlength=n_lists) == 0
+            sums[empty] = centroids[empty]
+            centroids = _normalize(sums)
+
+        # Інвертовані списки: id векторів, згруповані за кластером
+        assignment = cls._assign(vectors, centroids)
+        list_ids = np.argsort(assignment, kind="stable")
+        list_offsets = np.concatenate([[0], np.cumsum(np.bincount(assignment, minlength=n_lists))])
+        return cls(keyed_vectors.index_to_key, vectors, centroids, list_ids, list_offsets,
+                   keyed_vectors=keyed_vectors, n_probe=n_probe)
+
+    @staticmethod
+    def _assign(vectors, centroids, block=8192):
+        return np.concatenate([
+            (vectors[start:start + block] @ centroids.T).argmax(axis=1)
+            for start in range(0, len(vectors), block)
+        ])
+
+    def _query_vectors(self, words):
+        """Нормовані вектори запитів; None для слів без вектора (OOV у Word2Vec)."""
+        result = []
+        for word in words:
+            if word in self.word_index:
+                result.append(self.vectors[self.word_index[word]])
+            elif self.keyed_vectors is not None and hasattr(self.keyed_vectors, "vectors_ngrams"):
+                # FastText будує вектор OOV-слова з n-грам
+                result.append(_normalize(self.keyed_vectors.get_vector(word)[None, :])[0])
+            else:
+                result.append(None)
+        return result
+
+    def neighbors(self, words, topn=10, n_probe=None):
+        """
+        Пакетний пошук: для кожного слова список (сусід, схожість) довжини topn
+        (коротший, якщо в словнику менше слів) або None, якщо для слова немає вектора.
+        Саме слово в результат не входить.
+        """
+        n_probe = min(n_probe or self.n_probe, len(self.centroids))
+        queries = self._query_vectors(words)
+        known = [i for i, q in enumerate(queries) if q is not None]
+        results = [None] * len(words)
+        if not known:
+            return results
+
+        Q = np.stack([queries[i] for i in known])
+        centroid_scores = Q @ self.centroids.T
+        probes = _top_k(centroid_scores, n_probe)
+
+        for row, i in enumerate(known):
+            self_id = self.word_index.get(words[i])
+            candidates = self._candidates(probes[row], self_id)
+            if len(candidates) < topn and n_probe < len(self.centroids):
+                # Замало кандидатів у найближчих списках — добираємо з наступних за схожістю
+                order = np.argsort(-centroid_scores[row], kind="stable")
+                for end in range(n_probe + 1, len(order) + 1):
+                    candidates = self._candidates(order[:end], self_id)
+                    if len(candidates) >= topn:
+                        break
+            scores = self.vectors[candidates] @ Q[row]
+            top = _top_k(scores[None, :], topn)[0]
+            results[i] = [(self.words[candidates[j]], float(scores[j])) for j in top]
+        return results
+
+    def _candidates(self, lists, self_id=None):
+        """id векторів з інвертованих списків lists (без самого слова запиту)."""
+        candidates = np.concatenate([self.list_ids[self.list_offsets[c]:self.list_offsets[c + 1]] for c in lists])
+        return candidates[candidates != self_id] if self_id is not None else candidates
+
+    def exact_neighbors(self, words, topn=10, block=1024):
+        """Точний пошук повним перебором (еталон для recall); той самий формат, що й neighbors."""
+        queries = self._query_vectors(words)
+        known = [i for i, q in enumerate(queries) if q is not None]
+        results = [None] * len(words)
+
+        for start in range(0, len(known), block):
+            batch = known[start:start + block]
+            scores = np.stack([queries[i] for i in batch]) @ self.vectors.T
+            for row, i in enumerate(batch):
+                self_id = self.word_index.get(words[i])
+                if self_id is not None:
+                    scores[row, self_id] = -np.inf
+            for row, top in enumerate(_top_k(scores, topn)):
+                results[batch[row]] = [(self.words[j], float(scores[row, j])) for j in top
+                                       if scores[row, j] != -np.inf]
+        return results
+
+    def save(self, path):
+        """Зберігає індекс у каталог (.npy + words.json); вектори FastText-моделі не зберігаються."""
+        os.makedirs(path, exist_ok=True)
+        for name in ("vectors", "centroids", "list_ids", "list_offsets"):
+            np.save(os.path.join(path, f"{name}.npy"), getattr(self, name))
+        with open(os.path.join(path, "words.json"), "w", encoding="utf-8") as f:
+            json.dump({"words": self.words, "n_probe": self.n_probe}, f, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, path, keyed_vectors=None, mmap_mode="r"):
+        """
+        Відкриває збережений індекс (масиви через mmap).
+        keyed_vectors (model.wv для FastText) потрібні лише для OOV-запитів.
+        """
+        with open(os.path.join(path, "words.json"), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        arrays = {name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode=mmap_mode)
+                  for name in ("vectors", "centroids", "list_ids", "list_offsets")}
+        return cls(meta["words"], keyed_vectors=keyed_vectors, n_probe=meta["n_probe"], **arrays)
@@ -0,0 +1,178 @@
+import json
+import os
+import numpy as np
+from gensim.models import KeyedVectors
+from gensim.models.fasttext import ft_ngram_hashes
+from .model_store import term_hashes
+
+DTYPES = ("float32", "float16", "int8")
+
+
+def _quantize(vectors, dtype, block=65536):
+    """
+    Повертає (масив у dtype, масштаби рядків або None).
+    int8 — симетрична квантизація по рядку: v ≈ q * scale, scale = max|v| / 127.
+    """
+    if dtype != "int8":
+        return vectors.astype(dtype), None
+    quantized = np.empty(vectors.shape, dtype=np.int8)
+    scales = np.empty(len(vectors), dtype=np.float32)
+    for start in range(0, len(vectors), block):
+        part = vectors[start:start + block]
+        scale = np.abs(part).max(axis=1) / 127
+        scale[scale == 0] = 1
+        quantized[start:start + block] = np.rint(part / scale[:, None])
+        scales[start:start + block] = scale
+    return quantized, scales
+
+
+def save_keyed_vectors(keyed_vectors, path, dtype="float16"):
+    """
+    Експортує wv моделі з train_w2v / train_ft у каталог для сервінгу:
+    вектори (і n-грамні бакети FastText) у float32, float16 або int8 з масштабом на рядок,
+    словник — відсортовані 64-бітні хеші слів + номери рядків та UTF-8 блоб слів.
+    Усе — .npy, тож load_keyed_vectors відкриває їх через mmap і процеси ділять сторінки.
+    """
+    if dtype not in DTYPES:
+        raise ValueError(f"dtype має бути одним з {DTYPES}")
+    os.makedirs(path, exist_ok=True)
+    words = keyed_vectors.index_to_key
+    meta = {"dtype": dtype, "vector_size": keyed_vectors.vector_size, "count": len(words)}
+
+    hashes = term_hashes(words)
+    order = np.argsort(hashes)
+    if np.any(hashes[order][1:] == hashes[order][:-1]):
+        raise ValueError("Колізія хешів у словнику: збережіть модель через KeyedVectors.save")
+    np.save(os.path.join(path, "hashes.npy"), hashes[order])
+    np.save(os.path.join(path, "rows.npy"), order.astype(np.int64))
+
+    encoded = [w.encode("utf-8") for w in words]
+    np.save(os.path.join(path, "word_offsets.npy"), np.cumsum([0] + [len(w) for w in encoded]))
+    with open(os.path.join(path, "words.bin"), "wb") as f:
+        f.write(b"".join(encoded))
+
+    arrays = {"vectors": keyed_vectors.vectors}
+    if getattr(keyed_vectors, "bucket", 0):
+        # FastText: n-грамні бакети потрібні для векторів OOV-слів
+        meta.update(min_n=keyed_vectors.min_n, max_n=keyed_vectors.max_n, bucket=keyed_vectors.bucket)
+        arrays["vectors_ngrams"] = keyed_vectors.vectors_ngrams
+
+    for name, vectors in arrays.items():
+        quantized, scales = _quantize(vectors, dtype)
+        np.save(os.path.join(path, f"{name}.npy"), quantized)
+        if scales is not None:
+            np.save(os.path.join(path, f"{name}_scales.npy"), scales)
+
+    # Норми відновлених векторів для косинусної схожості
+    vectors = QuantizedKeyedVectors._dequantize(
+        np.load(os.path.join(path, "vectors.npy"), mmap_mode="r"),
+        np.load(os.path.join(path, "vectors_scales.npy")) if dtype == "int8" else None
+    )
+    np.save(os.path.join(path, "norms.npy"), np.linalg.norm(vectors, axis=1).astype(np.float32))
+
+    with open(os.path.join(path, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False, indent=2)
+
+
+def load_keyed_vectors(path, mmap_mode="r"):
+    """Відкриває вектори, збережені save_keyed_vectors (масиви через mmap)."""
+    return QuantizedKeyedVectors(path, mmap_mode)
+
+
+class QuantizedKeyedVectors:
+    """
+    Read-only замінник KeyedVectors поверх mmap-масивів: get_vector, most_similar,
+    similarity і `in` з тими самими результатами (до похибки квантизації), що й у wv
+    моделі. Вектори відновлюються у float32 лише для потрібних рядків або блоками.
+    """
+    def __init__(self, path, mmap_mode="r"):
+        with open(os.path.join(path, "meta.json"), "r", encoding="utf-8") as f:
+            self.meta = json.load(f)
+
+        def load(name, required=True):
+            file = os.path.join(path, f"{name}.npy")
+            return np.load(file, mmap_mode=mmap_mode) if required or os.path.exists(file) else None
+
+        self.vector_size = self.meta["vector_size"]
+        self.hashes = load("hashes")
+        self.rows = load("rows")
+        self.word_offsets = load("word_offsets")
+        self.vectors = load("vectors")
+        self.scales = load("vectors_scales", required=False)
+        self.norms = load("norms")
+        self.vectors_ngrams = load("vectors_ngrams", required=False)
+        self.ngram_scales = load("vectors_ngrams_scales", required=False)
+        with open(os.path.join(path, "words.bin"), "rb") as f:
+            self._words_blob = f.read()
+
+    @staticmethod
+    def _dequantize(vectors, scales):
+        vectors = np.asarray(vectors, dtype=np.float32)
+        return vectors * scales[:, None] if scales is not None else vectors
+
+    def __len__(self):
+        return len(self.vectors)
+
+    def __contains__(self, word):
+        return self.get_index(word, None) is not None
+
+    def get_index(self, word, default=None):
+        """Номер рядка слова через бінарний пошук по хешах (без словника в пам'яті)."""
+        h = term_hashes([word])[0]
+        pos = np.searchsorted(self.hashes, h)
+        if pos < len(self.hashes) and self.hashes[pos] == h:
+            return int(self.rows[pos])
+        return default
+
+    def get_key(self, index):
+        start, end = self.word_offsets[index], self.word_offsets[index + 1]
+        return self._words_blob[start:end].decode("utf-8")
+
+    def get_vector(self, word, norm=False):
+        """Вектор слова; для FastText OOV — середнє n-грамних бакетів, як у FastTextKeyedVectors."""
+        index = self.get_index(word)
+        if index is not None:
+            vector = self._dequantize(self.vectors[index:index + 1],
+                                      self.scales[index:index + 1] if self.scales is not None else None)[0]
+        elif self.vectors_ngrams is None:
+            raise KeyError(f"Key '{word}' not present")
+        else:
+            hashes = ft_ngram_hashes(word, self.meta["min_n"], self.meta["max_n"], self.meta["bucket"])
+            if not hashes:
+                return np.zeros(self.vector_size, dtype=np.float32)
+            hashes = np.array(hashes)
+            ngrams = self._dequantize(self.vectors_ngrams[hashes],
+                                      self.ngram_scales[hashes] if self.ngram_scales is not None else None)
+            vector = ngrams.mean(axis=0)
+        if norm:
+            vector = vector / (np.linalg.norm(vector) or 1)
+        return vector
+
+    def similarity(self, w1, w2):
+        return float(np.dot(self.get_vector(w1, norm=True), self.get_vector(w2, norm=True)))
+
+    def most_similar(self, word, topn=10, block=65536):
+        """Точні найближчі сусіди за косинусом (блоковий перебір mmap-масиву), формат як у wv.most_similar."""
+        query = self.get_vector(word, norm=True)
+        self_index = self.get_index(word)
+        scores = np.empty(len(self), dtype=np.float32)
+        for start in range(0, len(self), block):
+            part = np.asarray(self.vectors[start:start + block], dtype=np.float32) @ query
+            if self.scales is not None:
+                part *= self.scales[start:start + block]
+            norms = self.norms[start:start + block]
+            scores[start:start + block] = np.where(norms > 0, part / np.where(norms > 0, norms, 1), 0)
+        if self_index is not None:
+            scores[self_index] = -np.inf
+
+        topn = min(topn, len(scores) - (self_index is not None))
+        top = np.argpartition(-scores, topn - 1)[:topn]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(self.get_key(i), float(scores[i])) for i in top]
+
+    def to_keyed_vectors(self):
+        """Відновлює звичайні gensim KeyedVectors (float32, у пам'яті) без n-грам."""
+        keyed_vectors = KeyedVectors(self.vector_size)
+        keyed_vectors.add_vectors([self.get_key(i) for i in range(len(self))],
+                                  self._dequantize(self.vectors, self.scales))
+        return keyed_vectors
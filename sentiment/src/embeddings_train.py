@@ -1,3 +1,6 @@
+import json
+import os
+import shutil
 import pandas as pd
 from gensim.models import Word2Vec, FastText
 
@@ -11,14 +14,110 @@ def prepare_corpus(df):
     corpus_tokens = df_filtered['lemma_text'].astype(str).apply(lambda x: x.split()).tolist()
     return corpus_tokens, len(df), len(df_filtered)
 
-def train_w2v(corpus_tokens, vector_size=100, window=5, min_count=3, sg=1):
-    """Тренує та повертає модель Word2Vec"""
-    model = Word2Vec(sentences=corpus_tokens, vector_size=vector_size, 
-                     window=window, min_count=min_count, sg=sg, workers=4, seed=42)
+def train_w2v(corpus_tokens=None, vector_size=100, window=5, min_count=3, sg=1, workers=None, corpus_file=None):
+    """
+    Тренує та повертає модель Word2Vec.
+    Замість списку токенів можна передати corpus_file (LemmaCorpus.to_corpus_file):
+    тоді навчання масштабується на всі workers (за замовчуванням — усі ядра).
+    """
+    model = Word2Vec(sentences=corpus_tokens, corpus_file=corpus_file, vector_size=vector_size,
+                     window=window, min_count=min_count, sg=sg, workers=workers or os.cpu_count(), seed=42)
     return model
 
-def train_ft(corpus_tokens, vector_size=100, window=5, min_count=3, sg=1):
-    """Тренує та повертає модель FastText"""
-    model = FastText(sentences=corpus_tokens, vector_size=vector_size, 
-                     window=window, min_count=min_count, sg=sg, workers=4, seed=42)
-    return model
\ No newline at end of file
+def train_ft(corpus_tokens=None, vector_size=100, window=5, min_count=3, sg=1, workers=None, corpus_file=None):
+    """Тренує та повертає модель FastText (параметри як у train_w2v)"""
+    model = FastText(sentences=corpus_tokens, corpus_file=corpus_file, vector_size=vector_size,
+                     window=window, min_count=min_count, sg=sg, workers=workers or os.cpu_count(), seed=42)
+    return model
+
+class LemmaCorpus:
+    """
+    Потоковий корпус лем: читає CSV (колонка text_col) частинами або текстовий файл
+    рядок за рядком, з тим самим фільтром, що й prepare_corpus (тексти довші за min_chars).
+    Кожна ітерація починає читання спочатку, тож gensim може проходити корпус кілька разів.
+    """
+    def __init__(self, path, text_col='lemma_text', min_chars=20, chunksize=10_000):
+        self.path = path
+        self.text_col = text_col
+        self.min_chars = min_chars
+        self.chunksize = chunksize
+
+    def _texts(self):
+        if self.path.endswith('.csv'):
+            for chunk in pd.read_csv(self.path, usecols=[self.text_col], chunksize=self.chunksize):
+                yield from chunk[self.text_col].dropna().astype(str)
+        else:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    yield line.rstrip('\n')
+
+    def __iter__(self):
+        for text in self._texts():
+            if len(text) > self.min_chars:
+                yield text.split()
+
+    def to_corpus_file(self, out_path):
+        """
+        Записує корпус у формат corpus_file gensim (документ на рядок, токени через пробіл)
+        для багатоядерного навчання. Повертає out_path.
+        """
+        if os.path.dirname(out_path):
+            os.makedirs(os.path.dirname(out_path), exist_ok=True)
+        with open(out_path, 'w', encoding='utf-8') as f:
+            for tokens in self:
+                f.write(' '.join(tokens) + '\n')
+        return out_path
+
+def _latest_checkpoint(checkpoint_dir):
+    """Шлях до останньої завершеної епохи (epoch-N) або None."""
+    epochs = [int(name.split("-", 1)[1]) for name in os.listdir(checkpoint_dir)
+              if name.startswith("epoch-") and name.split("-", 1)[1].isdigit()]
+    return os.path.join(checkpoint_dir, f"epoch-{max(epochs)}") if epochs else None
+
+def train_resumable(checkpoint_dir, model_type="w2v", corpus_tokens=None, corpus_file=None, epochs=5,
+                    vector_size=100, window=5, min_count=3, sg=1, workers=None):
+    """
+    Навчання Word2Vec/FastText з контрольними точками після кожної епохи.
+    Якщо в checkpoint_dir уже є модель, навчання продовжується з наступної епохи
+    з тим самим лінійним спаданням learning rate, що й при безперервному навчанні.
+    corpus_tokens має бути перезапускним ітерабельним (список або LemmaCorpus).
+    """
+    os.makedirs(checkpoint_dir, exist_ok=True)
+    model_cls = Word2Vec if model_type == "w2v" else FastText
+
+    latest = _latest_checkpoint(checkpoint_dir)
+    if latest:
+        model = model_cls.load(os.path.join(latest, "model.ckpt"))
+        with open(os.path.join(latest, "state.json"), 'r', encoding='utf-8') as f:
+            state = json.load(f)
+    else:
+        model = model_cls(vector_size=vector_size, window=window, min_count=min_count, sg=sg,
+                          workers=workers or os.cpu_count(), seed=42, epochs=epochs)
+        model.build_vocab(corpus_iterable=corpus_tokens, corpus_file=corpus_file)
+        # train() перезаписує model.alpha, тому початковий графік зберігається окремо
+        state = {"epochs_done": 0, "epochs": epochs, "alpha": model.alpha, "min_alpha": model.min_alpha}
+
+    alpha, min_alpha = state["alpha"], state["min_alpha"]
+    for epoch in range(state["epochs_done"], epochs):
+        # Частина загального графіка alpha -> min_alpha, що припадає на цю епоху
+        start_alpha = alpha - (alpha - min_alpha) * epoch / epochs
+        end_alpha = alpha - (alpha - min_alpha) * (epoch + 1) / epochs
+        model.train(corpus_iterable=corpus_tokens, corpus_file=corpus_file, epochs=1,
+                    total_examples=model.corpus_count, total_words=model.corpus_total_words,
+                    start_alpha=start_alpha, end_alpha=end_alpha)
+
+        # Модель (з усіма *.npy) і state.json пишуться в нову тимчасову теку, яка
+        # з'являється як epoch-N одним os.replace: обірваний запис лишає тільки *.tmp
+        tmp_dir = os.path.join(checkpoint_dir, f".epoch-{epoch + 1}.tmp")
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        os.makedirs(tmp_dir)
+        model.save(os.path.join(tmp_dir, "model.ckpt"))
+        with open(os.path.join(tmp_dir, "state.json"), 'w', encoding='utf-8') as f:
+            json.dump({**state, "epochs_done": epoch + 1, "epochs": epochs}, f)
+        os.replace(tmp_dir, os.path.join(checkpoint_dir, f"epoch-{epoch + 1}"))
+
+        for name in os.listdir(checkpoint_dir):
+            if name.startswith("epoch-") and name != f"epoch-{epoch + 1}":
+                shutil.rmtree(os.path.join(checkpoint_dir, name), ignore_errors=True)
+
+    return model
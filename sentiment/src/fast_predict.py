@@ -0,0 +1,112 @@
+import numpy as np
+import scipy.sparse as sp
+from sklearn.preprocessing import normalize
+from sklearn.utils import murmurhash3_32
+from .out_of_core import HashingTfidfVectorizer
+
+
+class LinearTextPredictor:
+    """
+    Швидкий інференс для навченого пайплайну TF-IDF + LogisticRegression/LinearSVC
+    (або out-of-core версії з HashingTfidfVectorizer) без валідації sklearn на кожен виклик.
+    Текст токенізується аналізатором векторизатора, n-грами шукаються у словнику
+    (або хешуються), а оцінка класу — прямий скалярний добуток з рядками coef_.
+    """
+    def __init__(self, pipeline):
+        vectorizer = pipeline.steps[0][1]
+        classifier = pipeline.steps[-1][1]
+
+        if isinstance(vectorizer, HashingTfidfVectorizer):
+            hasher = vectorizer._hasher()
+            n_features = vectorizer.n_features
+            self.analyzer = hasher.build_analyzer()
+            # Та сама формула колонки, що й у HashingVectorizer (alternate_sign=False)
+            self.lookup = lambda term: abs(murmurhash3_32(term, seed=0)) % n_features
+            self.binary, self.sublinear_tf, self.norm = False, vectorizer.sublinear_tf, "l2"
+        else:
+            self.analyzer = vectorizer.build_analyzer()
+            self.lookup = vectorizer.vocabulary_.get
+            self.binary, self.sublinear_tf, self.norm = vectorizer.binary, vectorizer.sublinear_tf, vectorizer.norm
+
+        self.idf = vectorizer.idf_ if getattr(vectorizer, "use_idf", True) else None
+        self.coef = np.ascontiguousarray(classifier.coef_)
+        self.intercept = classifier.intercept_
+        self.classes_ = classifier.classes_
+        self.n_features = self.coef.shape[1]
+
+    def _column_counts(self, text) -> dict:
+        counts = {}
+        lookup = self.lookup
+        for term in self.analyzer(text):
+            column = lookup(term)
+            if column is not None:
+                counts[column] = counts.get(column, 0) + 1
+        return counts
+
+    def _weights(self, columns, tf):
+        if self.binary:
+            tf[:] = 1
+        if self.sublinear_tf:
+            np.log(tf, out=tf)
+            tf += 1
+        if self.idf is not None:
+            tf *= self.idf[columns]
+        return tf
+
+    def decision_function_one(self, text):
+        """Оцінки класів для одного тексту (як decision_function([text])[0])."""
+        counts = self._column_counts(text)
+        if not counts:
+            scores = self.intercept.copy()
+        else:
+            columns = np.fromiter(counts.keys(), dtype=np.int64, count=len(counts))
+            tf = np.fromiter(counts.values(), dtype=np.float64, count=len(counts))
+            weights = self._weights(columns, tf)
+
+            if self.norm == "l2":
+                norm = np.sqrt(weights @ weights)
+            elif self.norm == "l1":
+                norm = np.abs(weights).sum()
+            else:
+                norm = 1.0
+            if norm:
+                weights /= norm
+            scores = self.coef[:, columns] @ weights + self.intercept
+        return scores[0] if len(scores) == 1 else scores
+
+    def predict(self, text):
+        """Мітка класу для одного тексту."""
+        scores = self.decision_function_one(text)
+        if np.ndim(scores) == 0:
+            return self.classes_[int(scores > 0)]
+        return self.classes_[scores.argmax()]
+
+    def decision_function_many(self, texts):
+        """Оцінки для мікропакета текстів однією розрідженою матрицею."""
+        texts = list(texts)
+        if not texts:
+            n_classes = self.coef.shape[0]
+            return np.empty((0,) if n_classes == 1 else (0, n_classes))
+
+        indptr, indices, data = [0], [], []
+        for text in texts:
+            counts = self._column_counts(text)
+            indices.extend(counts.keys())
+            data.extend(counts.values())
+            indptr.append(len(indices))
+
+        indices = np.asarray(indices, dtype=np.int64)
+        data = self._weights(indices, np.asarray(data, dtype=np.float64))
+        X = sp.csr_matrix((data, indices, np.asarray(indptr)), shape=(len(indptr) - 1, self.n_features))
+        if self.norm:
+            X = normalize(X, norm=self.norm, copy=False)
+
+        scores = X @ self.coef.T + self.intercept
+        return scores.ravel() if scores.shape[1] == 1 else scores
+
+    def predict_many(self, texts):
+        """Мітки для мікропакета текстів (порядок збігається з входом)."""
+        scores = self.decision_function_many(texts)
+        if scores.ndim == 1:
+            return self.classes_[(scores > 0).astype(int)]
+        return self.classes_[scores.argmax(axis=1)]
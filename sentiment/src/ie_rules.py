@@ -1,8 +1,103 @@
 import re
 import json
 import os
+from concurrent.futures import ProcessPoolExecutor
+
+# Колонки результату extract_all_batch (і поля словника в extract_all, крім doc_id)
+COLUMNS = ("doc_id", "field_type", "value", "start_char", "end_char", "method")
+
+# Усі правила починаються з \b перед символом слова, тож кандидати — початки слів
+_WORD_START = re.compile(r'\b\w')
+
+
+def _is_word_char(char):
+    # Те саме визначення \w, що й у модулі re для str
+    return char.isalnum() or char == '_'
+
+
+def _is_boundary(text, pos):
+    """Аналог \\b: слово починається або закінчується в позиції pos."""
+    before = pos > 0 and _is_word_char(text[pos - 1])
+    after = pos < len(text) and _is_word_char(text[pos])
+    return before != after
+
+
+def _fold(text):
+    # Нижній регістр без зміни довжини, щоб позиції збігалися з оригіналом
+    folded = text.lower()
+    if len(folded) == len(text):
+        return folded
+    return "".join(c.lower() if len(c.lower()) == 1 else c for c in text)
+
+
+def _as_dict(span):
+    return dict(zip(COLUMNS[1:], span))
+
+
+_worker_extractor = None
+
+
+def _init_worker(extractor):
+    global _worker_extractor
+    _worker_extractor = extractor
+
+
+def _extract_chunk(offset, texts):
+    return _worker_extractor._extract_chunk(offset, texts)
+
+
+class TrieGazetteer:
+    """
+    Словниковий матчер на префіксному дереві: пошук не залежить від кількості назв.
+    Семантика як у (?i)\\b(ключ1|ключ2|...)\\b — якщо в одній позиції підходять
+    кілька ключів, перемагає той, що стоїть у словнику раніше.
+    """
+    _END = ""  # порожній рядок не може бути символом тексту
+
+    def __init__(self, entries):
+        self.root = {}
+        for index, key in enumerate(entries):
+            node = self.root
+            for char in _fold(key):
+                node = node.setdefault(char, {})
+            node.setdefault(self._END, index)
+
+    def match(self, text, folded, pos):
+        """
+        Повертає кінець найкращого збігу, що починається в pos, або None.
+        folded — результат _fold(text), щоб не обчислювати його для кожної позиції.
+        """
+        if folded[pos] not in self.root:
+            return None
+
+        node, best_index, best_end = self.root, None, None
+        for i in range(pos, len(text) + 1):
+            index = node.get(self._END)
+            if index is not None and (best_index is None or index < best_index) and _is_boundary(text, i):
+                best_index, best_end = index, i
+            if i == len(text):
+                break
+            node = node.get(folded[i])
+            if node is None:
+                break
+        return best_end
+
+    def finditer(self, text):
+        """Неперетинні збіги зліва направо: пари (start, end)."""
+        folded = _fold(text)
+        next_pos = 0
+        for word in _WORD_START.finditer(text):
+            start = word.start()
+            if start >= next_pos:
+                end = self.match(text, folded, start)
+                if end is not None:
+                    next_pos = end
+                    yield start, end
+
 
 class RuleBasedExtractor:
+    NUMERIC_DATE = re.compile(r'\b([0-3]?\d)\.([0-1]?\d)\.(20\d{2}|19\d{2}|\d{2})\b')
+
     def __init__(self, resources_path='sentiment/resources'):
         with open(os.path.join(resources_path, 'months_ua.json'), 'r', encoding='utf-8') as f:
             self.months = json.load(f)
@@ -11,45 +106,129 @@ class RuleBasedExtractor:
         with open(os.path.join(resources_path, 'locations.json'), 'r', encoding='utf-8') as f:
             self.locations = json.load(f)
 
-    def extract_dates(self, text):
-        results = []
-        for match in re.finditer(r'\b([0-3]?\d)\.([0-1]?\d)\.(20\d{2}|19\d{2}|\d{2})\b', text):
-            d, m, y = match.groups()
-            y = "20" + y if len(y) == 2 else y
-            if 1 <= int(m) <= 12 and 1 <= int(d) <= 31:
-                results.append({"field_type": "DATE", "value": f"{y}-{int(m):02d}-{int(d):02d}", 
-                                "start_char": match.start(), "end_char": match.end(), "method": "regex_numeric_date"})
-        
+        # Шаблони залежать від словників, тому компілюються один раз тут
         month_keys = "|".join(self.months.keys())
-        pattern2 = fr'\b([0-3]?\d)\s+({month_keys})\s+(20\d{{2}})\b'
-        for match in re.finditer(pattern2, text, re.IGNORECASE):
-            d, m_str, y = match.groups()
-            m = self.months.get(m_str.lower())
-            if m and 1 <= int(d) <= 31:
-                results.append({"field_type": "DATE", "value": f"{y}-{m}-{int(d):02d}", 
-                                "start_char": match.start(), "end_char": match.end(), "method": "regex_text_date"})
-        return results
+        self.text_date_pattern = re.compile(fr'\b([0-3]?\d)\s+({month_keys})\s+(20\d{{2}})\b', re.IGNORECASE)
 
-    def extract_amounts(self, text):
-        results = []
         curr_keys = "|".join(re.escape(k) for k in self.currencies.keys())
-        pattern = fr'\b(\d+([.,]\d{{1,2}})?)\s*({curr_keys})\b'
-        for match in re.finditer(pattern, text, re.IGNORECASE):
-            val_str = match.group(1).replace(',', '.')
-            curr = self.currencies.get(match.group(3).lower(), "UNKNOWN")
-            results.append({"field_type": "AMOUNT", "value": f"{float(val_str)} {curr}", 
-                            "start_char": match.start(), "end_char": match.end(), "method": "regex_currency"})
-        return results
+        self.amount_pattern = re.compile(fr'\b(\d+([.,]\d{{1,2}})?)\s*({curr_keys})\b', re.IGNORECASE)
+
+        self.location_gazetteer = TrieGazetteer(self.locations)
+
+    def extract_dates(self, text):
+        spans = [self._numeric_date(m) for m in self.NUMERIC_DATE.finditer(text)]
+        spans += [self._text_date(m) for m in self.text_date_pattern.finditer(text)]
+        return [_as_dict(span) for span in spans if span]
+
+    def extract_amounts(self, text):
+        return [_as_dict(self._amount(m)) for m in self.amount_pattern.finditer(text)]
 
     def extract_locations(self, text):
-        results = []
-        loc_keys = "|".join(self.locations.keys())
-        pattern = fr'(?i)\b({loc_keys})\b'
-        for match in re.finditer(pattern, text):
-            val = self.locations.get(match.group(1).lower())
-            results.append({"field_type": "LOCATION", "value": val, 
-                            "start_char": match.start(), "end_char": match.end(), "method": "dict_location_ua"})
-        return results
+        return [_as_dict(self._location(text, start, end)) for start, end in self.location_gazetteer.finditer(text)]
 
     def extract_all(self, text):
-        return self.extract_dates(text) + self.extract_amounts(text) + self.extract_locations(text)
\ No newline at end of file
+        return [_as_dict(span) for span in self._extract_spans(text)]
+
+    def extract_all_batch(self, texts, n_jobs=-1, chunksize=2048):
+        """
+        Пакетний extract_all у колонковому вигляді: словник паралельних списків
+        doc_id, field_type, value, start_char, end_char, method (doc_id — індекс тексту у вході).
+        Легко перетворюється на таблицю: pd.DataFrame(result).
+        n_jobs=-1 використовує всі ядра, n_jobs <= 1 і невеликі входи обробляються без пулу процесів.
+        """
+        texts = list(texts)
+        if n_jobs is None or n_jobs < 0:
+            n_jobs = os.cpu_count() or 1
+
+        columns = {name: [] for name in COLUMNS}
+        chunks = [(start, texts[start:start + chunksize]) for start in range(0, len(texts), chunksize)]
+
+        if n_jobs <= 1 or len(chunks) <= 1:
+            results = (self._extract_chunk(offset, chunk) for offset, chunk in chunks)
+            for chunk_columns in results:
+                for name, values in zip(COLUMNS, chunk_columns):
+                    columns[name].extend(values)
+            return columns
+
+        with ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_worker, initargs=(self,)) as executor:
+            offsets, chunk_texts = zip(*chunks)
+            for chunk_columns in executor.map(_extract_chunk, offsets, chunk_texts):
+                for name, values in zip(COLUMNS, chunk_columns):
+                    columns[name].extend(values)
+        return columns
+
+    def _extract_chunk(self, offset, texts):
+        doc_ids, field_types, values, starts, ends, methods = [], [], [], [], [], []
+        for doc_id, text in enumerate(texts, offset):
+            for field_type, value, start, end, method in self._extract_spans(text):
+                doc_ids.append(doc_id)
+                field_types.append(field_type)
+                values.append(value)
+                starts.append(start)
+                ends.append(end)
+                methods.append(method)
+        return doc_ids, field_types, values, starts, ends, methods
+
+    def _extract_spans(self, text):
+        """
+        Один прохід по початках слів замість трьох окремих сканів.
+        Кожне правило пам'ятає кінець свого останнього збігу, тому результати
+        (і їхній порядок) ті самі, що й у extract_dates + extract_amounts + extract_locations.
+        Повертає кортежі (field_type, value, start_char, end_char, method).
+        """
+        rules = (
+            (self.NUMERIC_DATE, self._numeric_date),
+            (self.text_date_pattern, self._text_date),
+            (self.amount_pattern, self._amount),
+        )
+        results = [[] for _ in rules]
+        next_pos = [0] * len(rules)
+
+        locations = []
+        next_location = 0
+        folded = _fold(text)
+
+        for word in _WORD_START.finditer(text):
+            start = word.start()
+
+            # Дати та суми починаються з цифри
+            if text[start].isdecimal():
+                for i, (pattern, build) in enumerate(rules):
+                    if start >= next_pos[i]:
+                        match = pattern.match(text, start)
+                        if match:
+                            next_pos[i] = match.end()
+                            result = build(match)
+                            if result:
+                                results[i].append(result)
+
+            if start >= next_location:
+                end = self.location_gazetteer.match(text, folded, start)
+                if end is not None:
+                    next_location = end
+                    locations.append(self._location(text, start, end))
+
+        return results[0] + results[1] + results[2] + locations
+
+    def _numeric_date(self, match):
+        d, m, y = match.groups()
+        y = "20" + y if len(y) == 2 else y
+        if 1 <= int(m) <= 12 and 1 <= int(d) <= 31:
+            return ("DATE", f"{y}-{int(m):02d}-{int(d):02d}", match.start(), match.end(), "regex_numeric_date")
+        return None
+
+    def _text_date(self, match):
+        d, m_str, y = match.groups()
+        m = self.months.get(m_str.lower())
+        if m and 1 <= int(d) <= 31:
+            return ("DATE", f"{y}-{m}-{int(d):02d}", match.start(), match.end(), "regex_text_date")
+        return None
+
+    def _amount(self, match):
+        val_str = match.group(1).replace(',', '.')
+        curr = self.currencies.get(match.group(3).lower(), "UNKNOWN")
+        return ("AMOUNT", f"{float(val_str)} {curr}", match.start(), match.end(), "regex_currency")
+
+    def _location(self, text, start, end):
+        val = self.locations.get(text[start:end].lower())
+        return ("LOCATION", val, start, end, "dict_location_ua")
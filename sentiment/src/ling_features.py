@@ -1,19 +1,71 @@
+import os
+import threading
 import stanza
+from stanza.resources.common import DEFAULT_MODEL_DIR
+from stanza.pipeline.core import DownloadMethod
+from .disk_cache import DiskCache
+
+# Пайплайни, спільні для всіх екстракторів процесу: (мова, процесори, use_gpu, dir) -> Pipeline
+_PIPELINES = {}
+_PIPELINES_LOCK = threading.Lock()
+
+
+def get_pipeline(lang='uk', processors='tokenize,pos,lemma', use_gpu=True, model_dir=None, offline=False):
+    """
+    Повертає пайплайн Stanza з пулу процесу (створює при першому запиті).
+    Моделі завантажуються лише тоді, коли їх немає на диску;
+    offline=True взагалі не звертається до мережі.
+    Воркери, створені через fork після завантаження, успадковують готову модель.
+    """
+    # Порядок процесорів на результат не впливає
+    processors = ",".join(sorted(p.strip() for p in processors.split(",")))
+    key = (lang, processors, use_gpu, model_dir)
+
+    with _PIPELINES_LOCK:
+        if key not in _PIPELINES:
+            kwargs = {"dir": model_dir} if model_dir else {}
+            _PIPELINES[key] = stanza.Pipeline(
+                lang,
+                processors=processors,
+                use_gpu=use_gpu,
+                logging_level='WARN',
+                download_method=DownloadMethod.NONE if offline else DownloadMethod.REUSE_RESOURCES,
+                **kwargs
+            )
+        return _PIPELINES[key]
+
 
 class LinguisticExtractor:
-    def __init__(self, use_gpu=True):
+    PROCESSORS = 'tokenize,pos,lemma'
+
+    def __init__(self, use_gpu=True, cache_path=None, cache_max_entries=1_000_000, cache_memory_size=10_000,
+                 model_dir=None, offline=False):
         """
-        Ініціалізує пайплайн Stanza для української мови.
-        Завантажує модель, якщо її ще немає на диску.
+        Налаштовує екстрактор для української мови. Пайплайн Stanza створюється
+        лише при першому використанні та береться зі спільного пулу (get_pipeline).
+        offline=True забороняє завантаження моделей (для ізольованих від мережі машин).
+        Якщо задано cache_path, результати аналізу кешуються на диску (SQLite).
         """
-        # Завантажуємо тільки необхідні процесори для швидкості
-        stanza.download('uk', processors='tokenize,pos,lemma')
-        
-        # Ініціалізуємо пайплайн (вимкнули зайві логи, щоб не спамити в консоль)
-        self.nlp = stanza.Pipeline('uk', 
-                                   processors='tokenize,pos,lemma', 
-                                   use_gpu=use_gpu, 
-                                   logging_level='WARN')
+        self.use_gpu = use_gpu
+        self.model_dir = model_dir
+        self.offline = offline
+        self._nlp = None
+
+        # Ключ кешу враховує версію Stanza, каталог моделей та процесори, щоб не брати застарілі результати
+        self.resolved_model_dir = os.path.abspath(model_dir or DEFAULT_MODEL_DIR)
+        self.cache = None
+        if cache_path:
+            self.cache = DiskCache(cache_path, max_entries=cache_max_entries, memory_size=cache_memory_size)
+
+    @property
+    def nlp(self):
+        if self._nlp is None:
+            self._nlp = get_pipeline('uk', self.PROCESSORS, self.use_gpu, self.model_dir, self.offline)
+        return self._nlp
+
+    @nlp.setter
+    def nlp(self, pipeline):
+        self._nlp = pipeline
 
     def extract_features(self, text: str) -> dict:
         """
@@ -25,23 +77,28 @@ class LinguisticExtractor:
                 "pos_seq": "",
                 "pos_text": ""
             }
-        
-        # Проганяємо текст через Stanza
-        doc = self.nlp(text)
-        
+
+        # Проганяємо текст через Stanza (або беремо з кешу)
+        return self._features_from_words(self._analyze([text])[0])
+
+    def extract_features_batch(self, texts, batch_size: int = 64) -> list:
+        """
+        Пакетна версія extract_features: документи йдуть у Stanza пачками
+        через bulk_process. Результати повертаються в порядку входу.
+        """
+        return self._process_batch(texts, batch_size, self._features_from_words,
+                                   lambda: {"lemma_text": "", "pos_seq": "", "pos_text": ""})
+
+    def _features_from_words(self, words) -> dict:
         lemmas = []
         upos_tags = []
-        
-        for sentence in doc.sentences:
-            for word in sentence.words:
-                # Беремо лему (якщо Stanza не змогла, беремо оригінальне слово)
-                lemma = word.lemma if word.lemma else word.text
-                lemmas.append(lemma.lower()) # Зводимо леми до нижнього регістру
-                
-                # Беремо Universal POS tag (UPOS)
-                upos = word.upos if word.upos else "X"
-                upos_tags.append(upos)
-                
+
+        for lemma, upos in words:
+            lemmas.append(lemma.lower()) # Зводимо леми до нижнього регістру
+
+            # Беремо Universal POS tag (UPOS)
+            upos_tags.append(upos if upos else "X")
+
         return {
             "lemma_text": " ".join(lemmas),         # "lemma"
             "pos_seq": " ".join(upos_tags),         # "ADJ NOUN"
@@ -54,14 +111,60 @@ class LinguisticExtractor:
         """
         if not text or not isinstance(text, str):
             return ""
-            
-        doc = self.nlp(text)
-        filtered_lemmas = []
-        
-        for sentence in doc.sentences:
-            for word in sentence.words:
-                if word.upos in allowed_pos:
-                    lemma = word.lemma if word.lemma else word.text
-                    filtered_lemmas.append(lemma.lower())
-                    
-        return " ".join(filtered_lemmas)
\ No newline at end of file
+
+        return self._filtered_lemmas_from_words(self._analyze([text])[0], allowed_pos)
+
+    def filter_by_pos_batch(self, texts, allowed_pos: set = {"NOUN", "ADJ", "VERB"}, batch_size: int = 64) -> list:
+        """
+        Пакетна версія filter_by_pos (порядок результатів збігається з входом).
+        """
+        return self._process_batch(texts, batch_size,
+                                   lambda words: self._filtered_lemmas_from_words(words, allowed_pos), str)
+
+    def _filtered_lemmas_from_words(self, words, allowed_pos) -> str:
+        return " ".join(lemma.lower() for lemma, upos in words if upos in allowed_pos)
+
+    def cache_stats(self) -> dict:
+        """Лічильники влучань/промахів кешу (порожній словник, якщо кеш вимкнено)."""
+        return self.cache.stats() if self.cache else {}
+
+    def _process_batch(self, texts, batch_size, from_words, empty_result) -> list:
+        texts = list(texts)
+
+        # Порожні та нетекстові значення в Stanza не відправляємо
+        indices = [i for i, text in enumerate(texts) if text and isinstance(text, str)]
+        results = [empty_result() for _ in texts]
+
+        for start in range(0, len(indices), batch_size):
+            chunk = indices[start:start + batch_size]
+            for i, words in zip(chunk, self._analyze([texts[i] for i in chunk])):
+                results[i] = from_words(words)
+        return results
+
+    def _analyze(self, texts) -> list:
+        """
+        Повертає для кожного тексту список пар [лема, UPOS].
+        Тексти, яких немає в кеші, проходять через Stanza одним bulk-викликом.
+        """
+        keys = [self._cache_key(t) for t in texts] if self.cache else []
+        cached = self.cache.get_many(keys) if self.cache else {}
+
+        # Дублікати в межах пачки аналізуємо один раз
+        pending = list(dict.fromkeys(t for i, t in enumerate(texts) if not self.cache or keys[i] not in cached))
+        analyzed = {}
+        if pending:
+            docs = self.nlp.bulk_process(pending)
+            analyzed = {t: self._words_from_doc(doc) for t, doc in zip(pending, docs)}
+            if self.cache:
+                self.cache.set_many({self._cache_key(t): words for t, words in analyzed.items()})
+
+        return [analyzed[t] if t in analyzed else cached[keys[i]] for i, t in enumerate(texts)]
+
+    def _cache_key(self, text) -> str:
+        return DiskCache.make_key(stanza.__version__, self.resolved_model_dir, 'uk', self.PROCESSORS, text)
+
+    @staticmethod
+    def _words_from_doc(doc) -> list:
+        # Беремо лему (якщо Stanza не змогла, беремо оригінальне слово)
+        return [[word.lemma if word.lemma else word.text, word.upos]
+                for sentence in doc.sentences for word in sentence.words]
@@ -0,0 +1,262 @@
+import copy
+import json
+import os
+import threading
+from collections import OrderedDict, deque
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+# Реєстр LLM-бекендів зі спільним ледачим екземпляром для llm_extract та agent.
+# Вибір — через configure_llm(...) або змінні середовища LLM_BACKEND, LLM_MODEL_ID, LLM_SERVER_URL, LLM_DTYPE.
+
+DEFAULT_MODEL_ID = "unsloth/llama-3-8b-Instruct-bnb-4bit"
+
+_BACKENDS = {}
+_CONFIG = {"backend": None, "options": {}}
+_INSTANCE = None
+_LOCK = threading.Lock()
+
+
+def register_backend(name):
+    """Декоратор: реєструє клас бекенда під іменем name."""
+    def decorator(cls):
+        _BACKENDS[name] = cls
+        return cls
+    return decorator
+
+
+def configure_llm(backend=None, **options):
+    """
+    Задає бекенд ('transformers', 'llama_cpp', 'stub' або зареєстрований) та його параметри.
+    Попередній екземпляр відкидається; новий створиться при першому get_llm().
+    """
+    global _INSTANCE
+    if backend is not None and backend not in _BACKENDS:
+        raise ValueError(f"Невідомий LLM-бекенд: {backend}. Доступні: {sorted(_BACKENDS)}")
+    with _LOCK:
+        _CONFIG["backend"] = backend
+        _CONFIG["options"] = options
+        _INSTANCE = None
+
+
+def use_llm(backend):
+    """Встановлює готовий екземпляр бекенда (наприклад, обгортку для замірів або тестів)."""
+    global _INSTANCE
+    with _LOCK:
+        _INSTANCE = backend
+
+
+def get_llm():
+    """Спільний екземпляр бекенда; модель завантажується лише при першій генерації."""
+    global _INSTANCE
+    with _LOCK:
+        if _INSTANCE is None:
+            name = _CONFIG["backend"] or os.environ.get("LLM_BACKEND", "transformers")
+            if name not in _BACKENDS:
+                raise ValueError(f"Невідомий LLM-бекенд: {name}. Доступні: {sorted(_BACKENDS)}")
+            _INSTANCE = _BACKENDS[name](**_CONFIG["options"])
+        return _INSTANCE
+
+
+@register_backend("transformers")
+class TransformersBackend:
+    """
+    Локальна модель через transformers pipeline (створюється при першому виклику).
+
+    dtype (або LLM_DTYPE) — тип ваг; за замовчуванням bfloat16, як у llm_extract.
+    Агент раніше завантажував модель у float16: для старих GPU без bf16 —
+    configure_llm("transformers", dtype="float16").
+
+    prefix_cache=True (за замовчуванням вимкнено) вмикає повторне використання KV-кешу
+    статичних префіксів (системний промпт, інструкції, схема) для одиночних викликів generate:
+    спільний префікс токенів з одним з недавніх промптів (від min_prefix_tokens)
+    прораховується один раз і далі для кожного документа обробляється лише хвіст.
+    Ключ кешу — самі токени префікса, тож зміна схеми чи промпту дає новий запис;
+    зберігаються max_prefixes останніх префіксів.
+    """
+    def __init__(self, model_id=None, pipe=None, dtype=None, device_map="auto",
+                 prefix_cache=False, min_prefix_tokens=32, max_prefixes=8):
+        self.model_id = model_id or os.environ.get("LLM_MODEL_ID", DEFAULT_MODEL_ID)
+        self.dtype = dtype or os.environ.get("LLM_DTYPE", "bfloat16")
+        self.device_map = device_map
+        self.prefix_cache = prefix_cache
+        self.min_prefix_tokens = min_prefix_tokens
+        self.max_prefixes = max_prefixes
+        self._pipe = pipe
+        self._maskers = {}
+        self._prefixes = OrderedDict()
+        self._recent_ids = deque(maxlen=max_prefixes)
+        self._lock = threading.Lock()
+
+    @property
+    def pipe(self):
+        with self._lock:
+            if self._pipe is None:
+                import torch
+                from transformers import pipeline
+                print(f"Завантаження моделі {self.model_id}...")
+                self._pipe = pipeline(
+                    "text-generation",
+                    model=self.model_id,
+                    model_kwargs={"dtype": getattr(torch, self.dtype)},
+                    device_map=self.device_map,
+                )
+            return self._pipe
+
+    def _schema_kwargs(self, json_schema):
+        """logits_processor для обмеженого декодування за схемою (маски кешуються на схему)."""
+        if json_schema is None:
+            return {}
+        from transformers import LogitsProcessorList
+        from .constrained_decoding import SchemaTokenMasker
+
+        pipe = self.pipe
+        key = json.dumps(json_schema, sort_keys=True)
+        with self._lock:
+            if key not in self._maskers:
+                eos = pipe.model.generation_config.eos_token_id
+                self._maskers[key] = SchemaTokenMasker(json_schema, pipe.tokenizer,
+                                                       eos_token_ids=eos if isinstance(eos, list) else [eos])
+            masker = self._maskers[key]
+        return {"logits_processor": LogitsProcessorList([masker.processor()])}
+
+    def generate(self, messages, max_new_tokens=512, json_schema=None, **generate_kwargs):
+        if self.prefix_cache:
+            return self._generate_with_prefix(messages, max_new_tokens, **self._schema_kwargs(json_schema),
+                                              **generate_kwargs)
+        outputs = self.pipe(messages, max_new_tokens=max_new_tokens, **self._schema_kwargs(json_schema),
+                            **generate_kwargs)
+        return outputs[0]["generated_text"][-1]["content"]
+
+    def _cached_prefix(self, ids):
+        """
+        (довжина префікса, копія його KV-кешу) для токенів ids або (0, None).
+        Новий префікс реєструється, коли ids має з одним з недавніх промптів спільний
+        початок, помітно довший за вже закешований (чергування промптів Triager/Extractor
+        теж дає кожному свій префікс).
+        """
+        import torch
+
+        model = self.pipe.model
+        with self._lock:
+            best = max((prefix for prefix in self._prefixes
+                        if len(prefix) < len(ids) and tuple(ids[:len(prefix)]) == prefix), key=len, default=())
+
+            common = 0
+            for recent in self._recent_ids:
+                limit = min(len(recent), len(ids) - 1)  # хоча б один токен має пройти через модель
+                length = 0
+                while length < limit and recent[length] == ids[length]:
+                    length += 1
+                common = max(common, length)
+            self._recent_ids.append(ids)
+
+            # Новий префікс має бути довшим за наявний хоча б на min_prefix_tokens
+            if common < len(best) + self.min_prefix_tokens:
+                if not best:
+                    return 0, None
+                self._prefixes.move_to_end(best)
+                cache = self._prefixes[best]
+            else:
+                best, cache = tuple(ids[:common]), None
+
+        if cache is None:
+            # Прохід моделі — поза блокуванням, щоб не зупиняти інші виклики
+            with torch.no_grad():
+                cache = model(input_ids=torch.tensor([list(best)], device=model.device),
+                              use_cache=True).past_key_values
+            with self._lock:
+                self._prefixes[best] = cache
+                while len(self._prefixes) > self.max_prefixes:
+                    self._prefixes.popitem(last=False)
+
+        # Збережений кеш не змінюється: generate дописує в копію
+        return len(best), copy.deepcopy(cache)
+
+    def _generate_with_prefix(self, messages, max_new_tokens, **generate_kwargs):
+        """generate з перевикористанням KV-кешу префікса (поза pipeline, ті самі токени промпту)."""
+        import torch
+
+        pipe = self.pipe
+        tokenizer, model = pipe.tokenizer, pipe.model
+        ids = tokenizer.apply_chat_template(messages, add_generation_prompt=True, tokenize=True, return_dict=True)
+        ids = list(ids["input_ids"])
+        _, past_key_values = self._cached_prefix(ids)
+
+        input_ids = torch.tensor([ids], device=model.device)
+        with torch.no_grad():
+            outputs = model.generate(
+                input_ids=input_ids,
+                attention_mask=torch.ones_like(input_ids),
+                past_key_values=past_key_values,
+                max_new_tokens=max_new_tokens,
+                pad_token_id=tokenizer.pad_token_id if tokenizer.pad_token_id is not None else tokenizer.eos_token_id,
+                **generate_kwargs,
+            )
+        return tokenizer.decode(outputs[0][len(ids):], skip_special_tokens=True).strip()
+
+    def generate_batch(self, batch_messages, max_new_tokens=512, json_schema=None, **generate_kwargs):
+        """Один прохід generate для пакета чатів з лівим паддінгом (для decoder-only моделей)."""
+        pipe = self.pipe
+        pipe.tokenizer.padding_side = "left"
+        if pipe.tokenizer.pad_token is None:
+            pipe.tokenizer.pad_token = pipe.tokenizer.eos_token
+        outputs = pipe(batch_messages, batch_size=len(batch_messages), max_new_tokens=max_new_tokens,
+                       **self._schema_kwargs(json_schema), **generate_kwargs)
+        return [output[0]["generated_text"][-1]["content"] for output in outputs]
+
+
+@register_backend("llama_cpp")
+class LlamaCppServerBackend:
+    """
+    Локальний сервер llama.cpp (або інший з OpenAI-сумісним /v1/chat/completions).
+    Пакет надсилається паралельними запитами — сервер розкладає їх по слотах.
+    """
+    def __init__(self, url=None, model=None, timeout=600):
+        self.url = (url or os.environ.get("LLM_SERVER_URL", "http://127.0.0.1:8080")).rstrip("/")
+        self.model = model or os.environ.get("LLM_MODEL_ID", DEFAULT_MODEL_ID)
+        self.timeout = timeout
+
+    def generate(self, messages, max_new_tokens=512, do_sample=True, temperature=None, json_schema=None,
+                 **generate_kwargs):
+        payload = {"model": self.model, "messages": messages, "max_tokens": max_new_tokens}
+        if json_schema is not None:
+            # Граматика за схемою будується на боці сервера
+            payload["response_format"] = {"type": "json_object", "schema": json_schema}
+        if not do_sample:
+            payload["temperature"] = 0
+        elif temperature is not None:
+            payload["temperature"] = temperature
+        request = urllib.request.Request(
+            f"{self.url}/v1/chat/completions",
+            data=json.dumps(payload, ensure_ascii=False).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            body = json.loads(response.read().decode("utf-8"))
+        return body["choices"][0]["message"]["content"]
+
+    def generate_batch(self, batch_messages, max_new_tokens=512, **generate_kwargs):
+        with ThreadPoolExecutor(max_workers=len(batch_messages)) as executor:
+            return list(executor.map(
+                lambda messages: self.generate(messages, max_new_tokens, **generate_kwargs), batch_messages
+            ))
+
+
+@register_backend("stub")
+class StubBackend:
+    """
+    Детермінований бекенд для тестів і CPU-прогонів: повертає response або
+    responder(messages). Кількість викликів — у calls; json_schema ігнорується.
+    """
+    def __init__(self, response="{}", responder=None):
+        self.response = response
+        self.responder = responder
+        self.calls = 0
+
+    def generate(self, messages, max_new_tokens=512, **generate_kwargs):
+        self.calls += 1
+        return self.responder(messages) if self.responder else self.response
+
+    def generate_batch(self, batch_messages, max_new_tokens=512, **generate_kwargs):
+        return [self.generate(messages, max_new_tokens) for messages in batch_messages]
@@ -0,0 +1,104 @@
+import json
+import threading
+from .disk_cache import DiskCache
+from .llm_backends import get_llm
+
+DEFAULT_CACHE_PATH = "sentiment/cache/llm_responses.sqlite"
+DEFAULT_TTL = 30 * 24 * 3600
+
+
+def backend_model_id():
+    """Ідентифікатор поточного бекенда для ключа кешу (без завантаження моделі)."""
+    backend = get_llm()
+    model = getattr(backend, "model_id", None) or getattr(backend, "model", None) or ""
+    return f"{type(backend).__name__}:{model}"
+
+
+class CachedLLM:
+    """
+    Кешуюча обгортка над будь-яким LLM caller (prompt -> str): call_llm,
+    agent._generate_llm_response або llm_caller для TriagerAgent/ExtractorAgent/FallbackHandler.
+
+    Ключ — model_id, параметри генерації та повний текст промпту; відповіді
+    зберігаються в DiskCache (SQLite) з TTL та обмеженням кількості записів.
+    Кешувати варто детерміновані виклики (do_sample=False): для семплінгу кеш
+    фіксує одну з можливих відповідей. SQLite відкривається при першому виклику.
+    """
+    def __init__(self, llm_caller, params=None, model_id=None, batch_caller=None,
+                 cache_path=DEFAULT_CACHE_PATH, ttl=DEFAULT_TTL, max_entries=100_000, memory_size=1024):
+        self.llm_caller = llm_caller
+        self.batch_caller = batch_caller
+        self.params = params or {}
+        self.model_id = model_id
+        self.cache_path = cache_path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.memory_size = memory_size
+        self._cache = None
+        self._lock = threading.Lock()
+
+    @property
+    def cache(self):
+        if self._cache is None:
+            self._cache = DiskCache(self.cache_path, max_entries=self.max_entries,
+                                    memory_size=self.memory_size, ttl=self.ttl)
+        return self._cache
+
+    def make_key(self, prompt, **call_kwargs):
+        model_id = self.model_id or backend_model_id()
+        params = {**self.params, **call_kwargs}
+        return DiskCache.make_key(model_id, json.dumps(params, sort_keys=True, ensure_ascii=False), prompt)
+
+    def __call__(self, prompt, **call_kwargs):
+        """call_kwargs (наприклад, json_schema) передаються llm_caller і входять у ключ."""
+        key = self.make_key(prompt, **call_kwargs)
+        with self._lock:
+            cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        response = self.llm_caller(prompt, **call_kwargs)
+        with self._lock:
+            self.cache.set(key, response)
+        return response
+
+    def call_batch(self, prompts, batch_size=8, **call_kwargs):
+        """
+        Пакетний виклик: з кешу береться все, що є, а решта промптів іде одним
+        batch_caller(prompts, batch_size, **call_kwargs) (наприклад, call_llm_batch) або поштучно.
+        Підходить як llm_batch для run_extraction_pipeline_batch.
+        """
+        prompts = list(prompts)
+        keys = [self.make_key(prompt, **call_kwargs) for prompt in prompts]
+        with self._lock:
+            found = self.cache.get_many(keys)
+
+        missing = {}
+        for key, prompt in zip(keys, prompts):
+            if key not in found:
+                missing.setdefault(key, prompt)
+        if missing:
+            if self.batch_caller is not None:
+                responses = self.batch_caller(list(missing.values()), batch_size=batch_size, **call_kwargs)
+            else:
+                responses = [self.llm_caller(prompt, **call_kwargs) for prompt in missing.values()]
+            new_items = dict(zip(missing, responses))
+            with self._lock:
+                self.cache.set_many(new_items)
+            found.update(new_items)
+        return [found[key] for key in keys]
+
+    def stats(self) -> dict:
+        """Статистика кешу: hits, misses, expired, hit_rate, entries."""
+        with self._lock:
+            return self.cache.stats()
+
+    def close(self):
+        if self._cache is not None:
+            self._cache.close()
+            self._cache = None
+
+
+def cache_llm_caller(llm_caller, params=None, model_id=None, **cache_kwargs):
+    """Обгортає llm_caller у CachedLLM (параметри кешу — як у CachedLLM)."""
+    return CachedLLM(llm_caller, params=params, model_id=model_id, **cache_kwargs)
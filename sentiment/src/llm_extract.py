@@ -1,5 +1,5 @@
-import torch
-from transformers import pipeline
+from .llm_backends import get_llm
+from .llm_cache import cache_llm_caller
 
 def get_baseline_prompt(text, schema_str):
     """
@@ -20,34 +20,68 @@ def get_baseline_prompt(text, schema_str):
 """
     return prompt.strip()
 
-model_id = "unsloth/llama-3-8b-Instruct-bnb-4bit"
-pipe = pipeline(
-    "text-generation",
-    model=model_id,
-    model_kwargs={"dtype": torch.bfloat16}, 
-    device_map="auto",
-)
+SYSTEM_PROMPT = "Ти — помічник, який повертає ТІЛЬКИ чистий JSON згідно зі схемою."
 
-def call_llm(prompt):
-    """
-    Звертається до локальної Llama для отримання результату.
-    """
-    messages = [
-        {"role": "system", "content": "Ти — помічник, який повертає ТІЛЬКИ чистий JSON згідно зі схемою."},
+def _messages(prompt):
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
         {"role": "user", "content": prompt},
     ]
-    
-    outputs = pipe(
-        messages,
-        max_new_tokens=512,
-        do_sample=False, 
-    )
-    
-    raw_text = outputs[0]["generated_text"][-1]["content"].strip()
-    
+
+def _strip_fences(raw_text):
+    """Прибирає markdown-огородження ```json ... ``` навколо відповіді."""
+    raw_text = raw_text.strip()
     if "```json" in raw_text:
         raw_text = raw_text.split("```json")[1].split("```")[0]
     elif "```" in raw_text:
         raw_text = raw_text.split("```")[1].split("```")[0]
-        
-    return raw_text.strip()
\ No newline at end of file
+    return raw_text.strip()
+
+def call_llm(prompt, json_schema=None):
+    """
+    Звертається до локальної Llama для отримання результату
+    (бекенд — llm_backends.get_llm(), модель завантажується при першому виклику).
+    З json_schema генерація обмежується схемою (constrained decoding): вихід
+    валідний за побудовою. Для llm_caller агентів: partial(call_llm, json_schema=EXTRACTION_SCHEMA).
+    """
+    raw_text = get_llm().generate(
+        _messages(prompt),
+        max_new_tokens=512,
+        do_sample=False, 
+        json_schema=json_schema,
+    )
+    return _strip_fences(raw_text)
+
+def call_llm_batch(prompts, batch_size=8, backend=None, max_new_tokens=512, json_schema=None):
+    """
+    Пакетна версія call_llm: промпти генеруються разом по batch_size
+    (transformers-бекенд — з лівим паддінгом, щоб відповідь починалася одразу після промпту).
+    Промпти сортуються за довжиною, щоб у пакеті було менше паддінгу; результати
+    повертаються у вихідному порядку, з прибраними ```json огородженнями.
+
+    backend — за замовчуванням спільний get_llm(); для тестів на CPU можна передати
+    StubBackend або TransformersBackend(pipe=...) з маленькою локальною моделлю.
+    json_schema — обмежене декодування, як у call_llm.
+    """
+    backend = backend or get_llm()
+    prompts = list(prompts)
+    order = sorted(range(len(prompts)), key=lambda i: len(prompts[i]))
+    results = [None] * len(prompts)
+    for start in range(0, len(order), batch_size):
+        batch = order[start:start + batch_size]
+        outputs = backend.generate_batch(
+            [_messages(prompts[i]) for i in batch],
+            max_new_tokens=max_new_tokens,
+            do_sample=False,
+            json_schema=json_schema,
+        )
+        for i, raw_text in zip(batch, outputs):
+            results[i] = _strip_fences(raw_text)
+    return results
+
+# Параметри генерації call_llm для ключа кешу (системний промпт теж впливає на відповідь)
+CALL_LLM_PARAMS = {"system": SYSTEM_PROMPT, "max_new_tokens": 512, "do_sample": False}
+
+# Кешована версія call_llm: повторні прогони однакових промптів беруться з диска.
+# call_llm_cached.call_batch підходить як llm_batch для run_extraction_pipeline_batch.
+call_llm_cached = cache_llm_caller(call_llm, params=CALL_LLM_PARAMS, batch_caller=call_llm_batch)
@@ -0,0 +1,207 @@
+import hashlib
+import json
+import os
+import numpy as np
+import scipy.sparse as sp
+from scipy.special import expit, softmax
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.preprocessing import normalize
+from .out_of_core import HashingTfidfVectorizer
+
+# Параметри TfidfVectorizer, від яких залежить токенізація та вага ознак
+TFIDF_PARAMS = ("analyzer", "ngram_range", "lowercase", "strip_accents", "token_pattern", "stop_words",
+                "sublinear_tf", "norm", "use_idf", "smooth_idf", "binary")
+HASHING_PARAMS = ("analyzer", "ngram_range", "n_features", "sublinear_tf", "min_df")
+# Довільний код у векторизаторі не переноситься в meta.json
+CALLABLE_PARAMS = ("analyzer", "tokenizer", "preprocessor")
+
+
+def _proba_kind(classifier):
+    """Як класифікатор рахує predict_proba: 'softmax', 'ovr' (нормовані сигмоїди) або None."""
+    try:
+        has_proba = hasattr(classifier, "predict_proba")
+    except AttributeError:
+        has_proba = False
+    if not has_proba:
+        return None
+    if type(classifier).__name__ == "LogisticRegression" and getattr(classifier, "multi_class", "auto") != "ovr":
+        return "softmax"
+    return "ovr"
+
+
+def term_hashes(terms) -> np.ndarray:
+    """Стабільні між процесами 64-бітні хеші n-грам (вбудований hash() рандомізований)."""
+    return np.fromiter(
+        (int.from_bytes(hashlib.blake2b(t.encode("utf-8"), digest_size=8).digest(), "little") for t in terms),
+        dtype=np.uint64
+    )
+
+
+def save_linear_pipeline(pipeline, path):
+    """
+    Зберігає пайплайн TF-IDF + лінійний класифікатор (run_logreg_baseline, run_linear_svm
+    або їхні out-of-core версії) у компактному форматі: каталог з .npy та meta.json.
+
+    Словник зберігається як відсортований масив 64-бітних хешів n-грам + номери колонок,
+    idf і коефіцієнти — як .npy, тож load_linear_pipeline відкриває їх через mmap
+    і всі воркери ділять одну копію сторінок. Самі n-грами пишуться окремо (terms.bin)
+    лише для інтерпретації.
+    """
+    vec_name, vectorizer = pipeline.steps[0]
+    clf_name, classifier = pipeline.steps[-1]
+    custom = [p for p in CALLABLE_PARAMS if callable(getattr(vectorizer, p, None))]
+    if custom:
+        raise ValueError(f"Векторизатор з власними {', '.join(custom)} не зберігається в компактному форматі: "
+                         "збережіть модель через pickle")
+    os.makedirs(path, exist_ok=True)
+
+    meta = {"vectorizer_step": vec_name, "classifier_step": clf_name,
+            "classifier": type(classifier).__name__, "proba": _proba_kind(classifier)}
+
+    if isinstance(vectorizer, HashingTfidfVectorizer):
+        meta["vectorizer"] = "hashing"
+        meta["params"] = {p: getattr(vectorizer, p) for p in HASHING_PARAMS}
+    elif isinstance(vectorizer, TfidfVectorizer):
+        meta["vectorizer"] = "tfidf"
+        meta["params"] = {p: getattr(vectorizer, p) for p in TFIDF_PARAMS}
+
+        terms = list(vectorizer.vocabulary_)
+        columns = np.fromiter(vectorizer.vocabulary_.values(), dtype=np.int64, count=len(terms))
+        hashes = term_hashes(terms)
+        order = np.argsort(hashes)
+        if np.any(hashes[order][1:] == hashes[order][:-1]):
+            raise ValueError("Колізія хешів у словнику: збережіть модель через pickle")
+        np.save(os.path.join(path, "hashes.npy"), hashes[order])
+        np.save(os.path.join(path, "columns.npy"), columns[order])
+
+        # Назви ознак у порядку колонок: UTF-8 блоб + зміщення
+        names = [None] * len(terms)
+        for term, column in vectorizer.vocabulary_.items():
+            names[column] = term.encode("utf-8")
+        np.save(os.path.join(path, "term_offsets.npy"), np.cumsum([0] + [len(n) for n in names]))
+        with open(os.path.join(path, "terms.bin"), "wb") as f:
+            f.write(b"".join(names))
+    else:
+        raise TypeError(f"Непідтримуваний векторизатор: {type(vectorizer).__name__}")
+
+    if meta["params"].get("use_idf", True):
+        np.save(os.path.join(path, "idf.npy"), vectorizer.idf_)
+    np.save(os.path.join(path, "coef.npy"), np.ascontiguousarray(classifier.coef_))
+    np.save(os.path.join(path, "intercept.npy"), classifier.intercept_)
+    # Рядкові мітки зберігаємо як юнікод-масив, щоб не потрібен був pickle
+    classes = classifier.classes_
+    np.save(os.path.join(path, "classes.npy"), classes.astype(str) if classes.dtype == object else classes)
+
+    with open(os.path.join(path, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False, indent=2)
+
+
+def load_linear_pipeline(path, mmap_mode="r"):
+    """Відкриває модель, збережену save_linear_pipeline (масиви через mmap)."""
+    return CompactLinearModel(path, mmap_mode=mmap_mode)
+
+
+class CompactLinearModel:
+    """
+    Модель для інференсу з компактного артефакту: той самий результат, що й
+    pipeline.predict / decision_function / predict_proba (якщо вихідний класифікатор
+    його мав), але без словника Python у пам'яті.
+    """
+    def __init__(self, path, mmap_mode="r"):
+        with open(os.path.join(path, "meta.json"), "r", encoding="utf-8") as f:
+            self.meta = json.load(f)
+        self.path = path
+
+        def load(name):
+            file = os.path.join(path, name)
+            return np.load(file, mmap_mode=mmap_mode) if os.path.exists(file) else None
+
+        self.idf_ = load("idf.npy")
+        self.coef_ = load("coef.npy")
+        self.intercept_ = np.load(os.path.join(path, "intercept.npy"))
+        self.classes_ = np.load(os.path.join(path, "classes.npy"))
+        self.hashes = load("hashes.npy")
+        self.columns = load("columns.npy")
+        self.n_features = self.coef_.shape[1]
+
+        params = dict(self.meta["params"])
+        params["ngram_range"] = tuple(params["ngram_range"])
+        self.params = params
+        if self.meta["vectorizer"] == "tfidf":
+            self.analyzer = TfidfVectorizer(**params).build_analyzer()
+        else:
+            self.hashing_vectorizer = HashingTfidfVectorizer(**params)._hasher()
+
+    def transform(self, texts):
+        """TF-IDF матриця з тими самими колонками, що й у збереженого векторизатора."""
+        if self.meta["vectorizer"] == "hashing":
+            tf = self.hashing_vectorizer.transform(texts)
+            sublinear, use_idf, norm = self.params["sublinear_tf"], True, "l2"
+        else:
+            tf = self._count(texts)
+            sublinear, use_idf, norm = self.params["sublinear_tf"], self.params["use_idf"], self.params["norm"]
+
+        tf = tf.astype(np.float64)
+        if self.params.get("binary"):
+            tf.data[:] = 1
+        if sublinear:
+            np.log(tf.data, out=tf.data)
+            tf.data += 1
+        if use_idf:
+            tf.data *= self.idf_[tf.indices]
+            tf.eliminate_zeros()
+        return normalize(tf, norm=norm, copy=False) if norm else tf
+
+    def _count(self, texts):
+        ngrams, rows = [], []
+        n_docs = 0
+        for row, text in enumerate(texts):
+            doc_ngrams = self.analyzer(text)
+            ngrams.extend(doc_ngrams)
+            rows.extend([row] * len(doc_ngrams))
+            n_docs += 1
+
+        hashes = term_hashes(ngrams)
+        pos = np.searchsorted(self.hashes, hashes)
+        pos[pos == len(self.hashes)] = 0
+        known = self.hashes[pos] == hashes
+
+        rows = np.asarray(rows, dtype=np.int64)[known]
+        cols = np.asarray(self.columns[pos[known]])
+        counts = sp.csr_matrix((np.ones(len(cols)), (rows, cols)), shape=(n_docs, self.n_features))
+        counts.sum_duplicates()
+        return counts
+
+    def decision_function(self, texts):
+        scores = self.transform(texts) @ np.asarray(self.coef_).T + self.intercept_
+        return scores.ravel() if scores.shape[1] == 1 else scores
+
+    def predict(self, texts):
+        scores = self.decision_function(texts)
+        if scores.ndim == 1:
+            return self.classes_[(scores > 0).astype(int)]
+        return self.classes_[scores.argmax(axis=1)]
+
+    @property
+    def predict_proba(self):
+        if not self.meta.get("proba"):
+            raise AttributeError(f"{self.meta['classifier']} не має predict_proba")
+        return self._predict_proba
+
+    def _predict_proba(self, texts):
+        scores = self.decision_function(texts)
+        if scores.ndim == 1:
+            positive = expit(scores)
+            return np.column_stack([1 - positive, positive])
+        if self.meta["proba"] == "softmax":
+            return softmax(scores, axis=1)
+        proba = expit(scores)
+        return proba / proba.sum(axis=1, keepdims=True)
+
+    def get_feature_names_out(self):
+        """Назви ознак (лише для словникових моделей), читаються з terms.bin."""
+        offsets = np.load(os.path.join(self.path, "term_offsets.npy"))
+        with open(os.path.join(self.path, "terms.bin"), "rb") as f:
+            blob = f.read()
+        return np.array([blob[offsets[i]:offsets[i + 1]].decode("utf-8") for i in range(len(offsets) - 1)],
+                        dtype=object)
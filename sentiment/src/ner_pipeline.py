@@ -1,5 +1,23 @@
 import spacy
-from .ner_rules import add_hybrid_rules
+from itertools import islice
+from .ner_rules import add_hybrid_rules, get_hybrid_patterns
+
+# Компоненти, які безпосередньо ставлять сутності
+NER_COMPONENTS = ("entity_ruler", "ner")
+
+# Мітки, які повністю покриваються правилами
+RULE_LABELS = frozenset(pattern["label"] for pattern in get_hybrid_patterns())
+
+SENTENCE_END = (".", "!", "?", "…")
+
+# Типові слова на початку речення у відгуках, які не є назвами (стоп-слова spaCy перевіряються окремо)
+SENTENCE_OPENERS = frozenset("""
+привіт вітаю вчора позавчора товар замовлення доставка посилка якість ціна магазин продавець
+відгук загалом взагалі рекомендую раджу купила купив купили замовляла замовляв замовили отримала
+отримав отримали доставили прийшло прийшов прийшла гарний гарна гарне чудовий чудова чудове хороший
+хороша хороше добрий добра добре поганий погана погане жахливий жахлива жахливо швидко довго
+нормально погано відмінно класно супер задоволена задоволений незадоволена незадоволений
+""".split())
 
 def load_baseline_model(model_name="uk_core_news_sm"):
     """Завантажує базову модель spaCy."""
@@ -10,6 +28,57 @@ def create_hybrid_model(model_name="uk_core_news_sm"):
     nlp = spacy.load(model_name)
     return add_hybrid_rules(nlp)
 
+def create_rule_model(lang="uk"):
+    """
+    Легка модель без статистичних компонентів: токенізатор порожньої моделі
+    та EntityRuler з гібридними правилами (MONEY, ORDER_ID, ORG, DATE).
+    """
+    nlp = spacy.blank(lang)
+    ruler = nlp.add_pipe("entity_ruler")
+    ruler.add_patterns(get_hybrid_patterns())
+    return nlp
+
+def common_lowercase_words(rule_model, texts, min_count=2, batch_size=256):
+    """
+    Словник для роутера: слова, що в texts (наприклад, навчальному корпусі) трапляються
+    з малої літери щонайменше min_count разів. Такі слова на початку речення — звичайні
+    слова, а не назви.
+    """
+    counts = {}
+    for doc in rule_model.pipe(texts, batch_size=batch_size):
+        for token in doc:
+            if token.is_alpha and token.is_lower:
+                counts[token.text] = counts.get(token.text, 0) + 1
+    return frozenset(word for word, count in counts.items() if count >= min_count)
+
+def needs_full_model(doc, common_words=None):
+    """
+    Роутер: чи потрібна документу статистична модель.
+    Евристика — слово з великої літери поза сутностями правил (ймовірна PER/LOC/ORG).
+    На початку речення таке слово пропускається, лише якщо це стоп-слово, типовий
+    початок речення (SENTENCE_OPENERS) або слово, яке в корпусі пишуть з малої
+    літери (common_words, див. common_lowercase_words); імена там роутяться.
+    """
+    for token in doc:
+        if token.ent_type_ or not token.is_alpha or len(token) < 2:
+            continue
+        if not (token.is_title or token.is_upper):
+            continue
+        if _starts_sentence(token) and (token.is_stop or token.lower_ in SENTENCE_OPENERS
+                                        or (common_words is not None and token.lower_ in common_words)):
+            continue
+        return True
+    return False
+
+def _starts_sentence(token):
+    # Пропускаємо пробіли та відкривні лапки/дужки перед словом; новий рядок теж вважаємо межею речення
+    i = token.i - 1
+    while i >= 0 and (token.doc[i].is_space or token.doc[i].is_left_punct or token.doc[i].is_quote):
+        if "\n" in token.doc[i].text:
+            return True
+        i -= 1
+    return i < 0 or token.doc[i].text.endswith(SENTENCE_END)
+
 def run_inference(nlp_model, eval_data):
     """
     Проганяє список словників (eval_data) через модель.
@@ -28,4 +97,59 @@ def run_inference(nlp_model, eval_data):
             "expected": expected_ents,
             "predicted": predicted_ents
         })
-    return results
\ No newline at end of file
+    return results
+
+def ner_disabled_components(nlp_model):
+    """
+    Компоненти пайплайну, не потрібні для NER (parser, lemmatizer, morphologizer тощо).
+    Спільний tok2vec лишається, якщо його слухає ner.
+    """
+    needed = {name for name in NER_COMPONENTS if name in nlp_model.pipe_names}
+    for name, component in nlp_model.pipeline:
+        if needed & set(getattr(component, "listening_components", [])):
+            needed.add(name)
+    return [name for name in nlp_model.pipe_names if name not in needed]
+
+def run_inference_stream(nlp_model, eval_data, batch_size=64, n_process=1):
+    """
+    Потокова версія run_inference на базі nlp.pipe: документи обробляються пачками,
+    зайві для NER компоненти вимкнені. Генерує результати в порядку входу.
+    Підходить і для базової, і для гібридної моделі.
+    """
+    items = ((data["text"], data) for data in eval_data)
+    docs = nlp_model.pipe(items, as_tuples=True, batch_size=batch_size, n_process=n_process,
+                          disable=ner_disabled_components(nlp_model))
+
+    for doc, data in docs:
+        yield {
+            "text": data["text"],
+            "expected": list(zip(data["expected_entities"], data["expected_types"])),
+            "predicted": [(ent.text, ent.label_) for ent in doc.ents]
+        }
+
+def run_routed_inference_stream(rule_model, full_model, eval_data, batch_size=64, window=1024, common_words=None):
+    """
+    Гібридний інференс з роутером: усі документи проходять через легку модель правил,
+    і лише ті, для яких needs_full_model (з common_words), — через повну модель (nlp.pipe).
+    Формат і порядок результатів як у run_inference.
+    """
+    disabled = ner_disabled_components(full_model)
+    eval_data = iter(eval_data)
+
+    while True:
+        chunk = list(islice(eval_data, window))
+        if not chunk:
+            return
+
+        rule_docs = list(rule_model.pipe((data["text"] for data in chunk), batch_size=batch_size))
+        routed = [i for i, doc in enumerate(rule_docs) if needs_full_model(doc, common_words)]
+        full_docs = full_model.pipe((chunk[i]["text"] for i in routed), batch_size=batch_size, disable=disabled)
+        docs = dict(zip(routed, full_docs))
+
+        for i, data in enumerate(chunk):
+            doc = docs.get(i, rule_docs[i])
+            yield {
+                "text": data["text"],
+                "expected": list(zip(data["expected_entities"], data["expected_types"])),
+                "predicted": [(ent.text, ent.label_) for ent in doc.ents]
+            }
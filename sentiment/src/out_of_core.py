@@ -0,0 +1,97 @@
+from collections import Counter
+import numpy as np
+import pandas as pd
+from sklearn.base import BaseEstimator, TransformerMixin
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import normalize
+
+
+class HashingTfidfVectorizer(BaseEstimator, TransformerMixin):
+    """
+    Аналог TfidfVectorizer(sublinear_tf=True) без словника: n-грами хешуються
+    у n_features колонок, а IDF накопичується потоково через partial_fit.
+    Пам'ять не залежить від розміру корпусу (лише від n_features).
+    """
+    def __init__(self, analyzer="word", ngram_range=(1, 2), n_features=2 ** 20, sublinear_tf=True, min_df=1):
+        self.analyzer = analyzer
+        self.ngram_range = ngram_range
+        self.n_features = n_features
+        self.sublinear_tf = sublinear_tf
+        self.min_df = min_df
+
+    def _hasher(self):
+        return HashingVectorizer(analyzer=self.analyzer, ngram_range=self.ngram_range, n_features=self.n_features,
+                                 alternate_sign=False, norm=None)
+
+    def partial_fit(self, X, y=None):
+        """Оновлює document frequency на черговій порції текстів."""
+        if not hasattr(self, "df_"):
+            self.df_ = np.zeros(self.n_features, dtype=np.int64)
+            self.n_docs_ = 0
+
+        # У кожному рядку хешованої матриці індекси унікальні, тож bincount дає DF
+        counts = self._hasher().transform(X)
+        self.df_ += np.bincount(counts.indices, minlength=self.n_features)
+        self.n_docs_ += counts.shape[0]
+
+        # Та сама формула, що й у TfidfTransformer(smooth_idf=True)
+        self.idf_ = np.log((1 + self.n_docs_) / (1 + self.df_)) + 1
+        self.idf_[self.df_ < self.min_df] = 0
+        return self
+
+    def fit(self, X, y=None):
+        for attr in ("df_", "n_docs_", "idf_"):
+            self.__dict__.pop(attr, None)
+        return self.partial_fit(X)
+
+    def transform(self, X):
+        tf = self._hasher().transform(X)
+        if self.sublinear_tf:
+            np.log(tf.data, out=tf.data)
+            tf.data += 1
+        tf.data *= self.idf_[tf.indices]
+        tf.eliminate_zeros()
+        return normalize(tf, copy=False)
+
+
+def iter_csv_chunks(path, text_col="text", label_col="target", chunksize=10_000):
+    """Читає CSV частинами: пари (тексти, мітки) без завантаження всього файлу."""
+    for chunk in pd.read_csv(path, usecols=[text_col, label_col], chunksize=chunksize):
+        chunk = chunk.dropna(subset=[text_col, label_col])
+        yield chunk[text_col].astype(str), chunk[label_col]
+
+
+def train_out_of_core(csv_path, classifier, step_name, text_col="text", label_col="target", analyzer="word",
+                      ngram_range=(1, 2), min_df=1, n_features=2 ** 20, class_weight=None, C=1.0,
+                      chunksize=10_000, n_epochs=5, random_state=42):
+    """
+    Навчає HashingTfidfVectorizer + SGDClassifier (partial_fit) потоково з CSV.
+    Перший прохід рахує IDF та розподіл класів, далі n_epochs проходів навчання.
+    C перераховується в alpha = 1 / (C * n_samples), як у LogisticRegression/LinearSVC.
+    Повертає Pipeline з тим самим інтерфейсом, що й run_logreg_baseline/run_linear_svm.
+    """
+    vectorizer = HashingTfidfVectorizer(analyzer=analyzer, ngram_range=ngram_range, n_features=n_features,
+                                        min_df=min_df)
+    class_counts = Counter()
+    for texts, labels in iter_csv_chunks(csv_path, text_col, label_col, chunksize):
+        vectorizer.partial_fit(texts)
+        class_counts.update(labels)
+
+    classes = np.array(sorted(class_counts))
+    n_samples = sum(class_counts.values())
+
+    # partial_fit не підтримує 'balanced', тому ваги рахуємо самі з першого проходу
+    if class_weight == "balanced":
+        class_weight = {c: n_samples / (len(classes) * class_counts[c]) for c in classes}
+    classifier.set_params(alpha=1.0 / (C * n_samples), class_weight=class_weight)
+
+    # Перемішуємо в межах порції, бо CSV може бути впорядкований за мітками
+    rng = np.random.RandomState(random_state)
+    for _ in range(n_epochs):
+        for texts, labels in iter_csv_chunks(csv_path, text_col, label_col, chunksize):
+            order = rng.permutation(len(texts))
+            X = vectorizer.transform(texts.iloc[order])
+            classifier.partial_fit(X, labels.iloc[order].to_numpy(), classes=classes)
+
+    return Pipeline([('tfidf', vectorizer), (step_name, classifier)])
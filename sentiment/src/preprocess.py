@@ -1,7 +1,130 @@
 import regex as re
 import html
+import os
+import csv
+import json
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+class PIIMasker:
+    """
+    Маскування PII (EMAIL, URL, ID, PHONE) з одноразово скомпільованими шаблонами.
+
+    Текст сканується один раз регуляркою-тригером: без '@', цифр або ознак URL
+    жоден шаблон спрацювати не може. Правила застосовуються лише до вікон навколо
+    тригерів у старому порядку пріоритету, тому результат ідентичний послідовним sub.
+    """
+    EMAIL = re.compile(r"\S+@\S+")
+    URL = re.compile(r'https?://\S+|www\.\S+|\b[a-z0-9.-]+\.(?:com|ua|net|org|edu|gov|io)\b(?:\/\S*)?')
+    ID_KEYWORD = re.compile(r"(?i)(?:№+|код|замовлення|номер)\s*#?[\d\s,]{4,}\d")
+    ID_NUMBER = re.compile(r"\b\d{5,15}\b(?!\s*(?:грн|usd|eur|₴|\$|%|шт))", flags=re.I)
+    PHONE = re.compile(r"(\+?38)?\s?\(?\d{3}\)?[\s\.-]?\d{3}[\s\.-]?\d{2}[\s\.-]?\d{2}")
+
+    # Порядок важливий: кожне правило бачить текст після попередніх замін
+    RULES = (
+        (EMAIL, " <EMAIL> "),
+        (URL, " <URL> "),
+        (ID_KEYWORD, " <ID> "),
+        (ID_NUMBER, " <ID> "),
+        (PHONE, " <PHONE> "),
+    )
+
+    DUPLICATE_IDS = re.compile(r"(<ID>\s*[,/]*\s*)+")
+    SPACES = re.compile(r"\s+")
+
+    TRIGGER = re.compile(r"[@\d]|https?://|www\.|\.(?:com|ua|net|org|edu|gov|io)\b")
+
+    # Межа вікна: пробіли, через які не "перетікає" жоден шаблон
+    # (ID і PHONE продовжуються на цифри, '#', ',' та '('; ID_NUMBER дивиться на валюту)
+    _BOUNDARY = r"\s++(?![\s\d#,(]|(?i:грн|usd|eur|₴|\$|%|шт))"
+    BOUNDARY = re.compile(_BOUNDARY)
+    BOUNDARY_BACK = re.compile(r"(?r)" + _BOUNDARY)
+
+    def mask(self, text: str) -> str:
+        match = self.TRIGGER.search(text)
+        if match is not None:
+            parts, last = [], 0
+            while match is not None:
+                start = self._window_start(text, match.start(), last)
+                boundary = self.BOUNDARY.search(text, match.end())
+                end = boundary.start() if boundary is not None else len(text)
+
+                parts.append(text[last:start])
+                parts.append(self._mask_window(text[start:end]))
+                last = end
+                match = self.TRIGGER.search(text, end)
+            parts.append(text[last:])
+            text = "".join(parts)
+
+        # Видалення дублікатів тегів
+        text = self.DUPLICATE_IDS.sub("<ID> ", text)
+
+        # Очищення зайвих пробілів
+        text = self.SPACES.sub(" ", text)
+        return text.strip()
+
+    def _window_start(self, text: str, pos: int, last: int) -> int:
+        # Зворотний пошук обрізає текст на endpos, тож лишаємо запас під lookahead на валюту
+        boundary = self.BOUNDARY_BACK.search(text, last, pos + 4)
+        while boundary is not None and boundary.end() > pos:
+            boundary = self.BOUNDARY_BACK.search(text, last, boundary.start())
+        return boundary.end() if boundary is not None else last
+
+    def _mask_window(self, window: str) -> str:
+        for pattern, tag in self.RULES:
+            window = pattern.sub(tag, window)
+        return window
+
+
+_worker_preprocessor = None
+
+
+def _init_worker(preprocessor):
+    global _worker_preprocessor
+    _worker_preprocessor = preprocessor
+
+
+def _preprocess_chunk(texts):
+    return [_worker_preprocessor.preprocess(t) for t in texts]
+
+
+def _chunked(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _lower_caps(match):
+    word = match.group(0)
+    if any(char.isdigit() for char in word): return word
+    return word.lower()
+
+
+def _space_number_unit(match):
+    return f"{match.group(1)} {match.group(2).lower()}"
+
 
 class TextPreprocessor:
+    TECHNICAL_WORDS = re.compile(r"(?i)\b(розгорнути|згорнути|читати далі|відповідь|розгорнутим)\b")
+
+    TAG = re.compile(r"<[A-Z]+>")
+    TAG_SPLIT = re.compile(r"(<[A-Z]+>)")
+
+    APOSTROPHES = {'`': "'", '’': "'", '‘': "'"}
+    CAPS_WORD = re.compile(r"\b[А-ЯІЇЄҐA-Z]{2,}\b")
+
+    SPACE_BEFORE_PUNCT = re.compile(r"\s+([.,!?])")
+    MULTI_EXCLAMATION = re.compile(r"!{2,}")
+    MULTI_QUESTION = re.compile(r"\?{2,}")
+    MULTI_DOT = re.compile(r"\.{4,}")
+
+    ADDRESS_ABBR = re.compile(r"\b(м|вул|кв|просп|бул)\.(?=[А-ЯІЇЄҐа-яіїєґA-Za-z])")
+    NUMBER_UNIT = re.compile(r"(\d+)\s*(грн|usd|eur|%|шт|тб|gb|tb|кг|₴|\$)\b", flags=re.I)
+
     def __init__(self):
         self.ua_abbreviations = [
             'ім.', 'вул.', 'грн.', 'обл.', 'р.', 'див.', 'п.', 'с.', 'м.', 
@@ -14,83 +137,63 @@ class TextPreprocessor:
             'Y': 'У', 'B': 'В', 'K': 'К'
         }
 
+        self.pii_masker = PIIMasker()
+
+        # Таблиця та шаблон залежать від словників вище, тому будуються один раз тут
+        self.translation_table = str.maketrans({**self.cyrillic_map, **self.APOSTROPHES})
+
+        abbs_pattern = "|".join([re.escape(a.replace('.', '')) for a in self.ua_abbreviations])
+        self.sentence_boundary = re.compile(rf"(?<!\b(?:{abbs_pattern}))(?<=[.!?])\s+(?=[А-ЯІЇЄҐA-Z])")
+
     def clean_basic(self, text: str) -> str:
         if not text: return ""
         text = html.unescape(text)
 
         # Видаляємо технічні слова
-        text = re.sub(r"(?i)\b(розгорнути|згорнути|читати далі|відповідь|розгорнутим)\b", " ", text)
+        text = self.TECHNICAL_WORDS.sub(" ", text)
         return text.strip()
 
     def mask_pii(self, text: str) -> str:
         """Маскування даних"""
-        
-        # EMAIL
-        text = re.sub(r"\S+@\S+", " <EMAIL> ", text)
-
-        # URL
-        url_pattern = r'https?://\S+|www\.\S+|\b[a-z0-9.-]+\.(?:com|ua|net|org|edu|gov|io)\b(?:\/\S*)?'
-        text = re.sub(url_pattern, " <URL> ", text)
-
-        # ID
-        text = re.sub(r"(?i)(?:№+|код|замовлення|номер)\s*#?[\d\s,]{4,}\d", " <ID> ", text)
-        text = re.sub(r"\b\d{5,15}\b(?!\s*(?:грн|usd|eur|₴|\$|%|шт))", " <ID> ", text, flags=re.I)
-        
-        # PHONE
-        phone_pattern = r"(\+?38)?\s?\(?\d{3}\)?[\s\.-]?\d{3}[\s\.-]?\d{2}[\s\.-]?\d{2}"
-        text = re.sub(phone_pattern, " <PHONE> ", text)
-        
-        # Видалення дублікатів тегів
-        text = re.sub(r"(<ID>\s*[,/]*\s*)+", "<ID> ", text)
-        
-        # Очищення зайвих пробілів
-        text = re.sub(r"\s+", " ", text)
-        return text.strip()
+        return self.pii_masker.mask(text)
 
     def normalize_content(self, text: str) -> str:
         """Нормалізація."""
         
-        parts = re.split(r"(<[A-Z]+>)", text)
-        translation_table = str.maketrans(self.cyrillic_map)
+        parts = self.TAG_SPLIT.split(text)
         
         for i in range(len(parts)):
             # Якщо це НЕ тег, тоді нормалізуємо
-            if not re.match(r"<[A-Z]+>", parts[i]):
-                part = parts[i]
+            if not self.TAG.match(parts[i]):
+                parts[i] = self._normalize_segment(parts[i])
                 
-                # Гомогліфи
-                part = part.translate(translation_table)
+        return "".join(parts)
 
-                # Апострофи
-                part = re.sub(r"[`'’‘]", "'", part)
-                
-                # Caps Lock
-                def lower_caps(match):
-                    word = match.group(0)
-                    if any(char.isdigit() for char in word): return word
-                    return word.lower()
-                
-                part = re.sub(r"\b[А-ЯІЇЄҐA-Z]{2,}\b", lower_caps, part)
+    def _normalize_segment(self, part: str) -> str:
+        # Гомогліфи + апострофи (одна таблиця)
+        part = part.translate(self.translation_table)
 
-                # Пунктуація
-                part = re.sub(r"\s+([.,!?])", r"\1", part)
-                part = re.sub(r"!{2,}", "!!", part)
-                part = re.sub(r"\?{2,}", "??", part)
-                part = re.sub(r"\.{4,}", "...", part)
+        # Caps Lock: сегмент без великих літер пропускаємо
+        if not part.islower():
+            part = self.CAPS_WORD.sub(_lower_caps, part)
 
-                # Пробіли
-                part = re.sub(r"\b(м|вул|кв|просп|бул)\.(?=[А-ЯІЇЄҐа-яіїєґA-Za-z])", r"\1. ", part)
-                part = re.sub(r"(\d+)\s*(грн|usd|eur|%|шт|тб|gb|tb|кг|₴|\$)\b", lambda m: f"{m.group(1)} {m.group(2).lower()}", part, flags=re.I)
-                
-                parts[i] = part
-                
-        return "".join(parts)
+        # Пунктуація (стиснення запускаємо лише коли є що стискати)
+        part = self.SPACE_BEFORE_PUNCT.sub(r"\1", part)
+        if "!!" in part:
+            part = self.MULTI_EXCLAMATION.sub("!!", part)
+        if "??" in part:
+            part = self.MULTI_QUESTION.sub("??", part)
+        if "...." in part:
+            part = self.MULTI_DOT.sub("...", part)
+
+        # Пробіли
+        if "." in part:
+            part = self.ADDRESS_ABBR.sub(r"\1. ", part)
+        part = self.NUMBER_UNIT.sub(_space_number_unit, part)
+        return part
 
     def sentence_split(self, text: str) -> list[str]:
-        abbs_pattern = "|".join([re.escape(a.replace('.', '')) for a in self.ua_abbreviations])
-        pattern = rf"(?<!\b(?:{abbs_pattern}))(?<=[.!?])\s+(?=[А-ЯІЇЄҐA-Z])"
-        
-        sentences = re.split(pattern, text)
+        sentences = self.sentence_boundary.split(text)
         return [s.strip() for s in sentences if len(s.strip()) > 1]
 
     def preprocess(self, text: str) -> dict:
@@ -105,4 +208,73 @@ class TextPreprocessor:
             "clean_normalized": t,
             "sentences": sentences,
             "sentence_count": len(sentences)
-        }
\ No newline at end of file
+        }
+
+    def preprocess_batch(self, texts, n_jobs=-1, chunksize=256):
+        """
+        Пакетна обробка: генератор результатів preprocess у порядку входу.
+        n_jobs=-1 (або None) використовує всі ядра, n_jobs <= 1 працює без пулу процесів.
+        """
+        for results in self._map_chunks(_chunked(texts, chunksize), n_jobs):
+            yield from results
+
+    def preprocess_csv(self, path, out_path, text_col="text", n_jobs=-1, chunksize=256):
+        """
+        Потокова обробка CSV: рядки читаються та записуються частинами, без pandas.
+        До вихідних колонок додаються clean_normalized, sentences (JSON) та sentence_count.
+        Зайві поля рядка (понад заголовок) відкидаються, порожній текст у рядку — порожній рядок;
+        для порожнього файлу вихідний файл теж порожній. Без колонки text_col — ValueError.
+        Повертає кількість оброблених рядків.
+        """
+        with open(path, 'r', encoding='utf-8', newline='') as f_in, \
+             open(out_path, 'w', encoding='utf-8', newline='') as f_out:
+            reader = csv.DictReader(f_in)
+            if reader.fieldnames is None:
+                return 0
+            if text_col not in reader.fieldnames:
+                raise ValueError(f"У {path} немає колонки {text_col!r}; доступні: {reader.fieldnames}")
+            writer = csv.DictWriter(f_out, fieldnames=reader.fieldnames + ["clean_normalized", "sentences", "sentence_count"],
+                                    extrasaction="ignore")
+            writer.writeheader()
+
+            # Рядки чекають тут, поки їхній пакет обробляється у пулі
+            pending_rows = deque()
+
+            def text_chunks():
+                for rows in _chunked(reader, chunksize):
+                    pending_rows.append(rows)
+                    yield [row[text_col] or "" for row in rows]
+
+            n_rows = 0
+            for results in self._map_chunks(text_chunks(), n_jobs):
+                rows = pending_rows.popleft()
+                for row, result in zip(rows, results):
+                    row["clean_normalized"] = result["clean_normalized"]
+                    row["sentences"] = json.dumps(result["sentences"], ensure_ascii=False)
+                    row["sentence_count"] = result["sentence_count"]
+                    writer.writerow(row)
+                n_rows += len(rows)
+        return n_rows
+
+    def _map_chunks(self, chunks, n_jobs):
+        if n_jobs is None or n_jobs < 0:
+            n_jobs = os.cpu_count() or 1
+
+        if n_jobs <= 1:
+            for texts in chunks:
+                yield [self.preprocess(t) for t in texts]
+            return
+
+        # Обмежуємо кількість пакетів у польоті, щоб не читати весь вхід наперед
+        with ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_worker, initargs=(self,)) as executor:
+            pending = deque()
+            try:
+                for texts in chunks:
+                    pending.append(executor.submit(_preprocess_chunk, texts))
+                    if len(pending) >= 2 * n_jobs:
+                        yield pending.popleft().result()
+                while pending:
+                    yield pending.popleft().result()
+            finally:
+                for future in pending:
+                    future.cancel()
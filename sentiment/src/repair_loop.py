@@ -1,4 +1,4 @@
-from sentiment.src.llm_extract import get_baseline_prompt, call_llm
+from sentiment.src.llm_extract import get_baseline_prompt, call_llm, call_llm_batch
 from sentiment.src.validator import validate_extraction
 import json
 
@@ -28,15 +28,18 @@ def get_repair_prompt(original_text, broken_output, error_message, schema_str):
 """
     return prompt.strip()
 
-def run_extraction_pipeline(text, schema, max_repairs=2):
+def run_extraction_pipeline(text, schema, max_repairs=2, constrained=False):
     """
     Основний інженерний пайплайн: Extraction -> Validation -> (Repair Loop)
+    constrained=True вмикає декодування, обмежене схемою: вихід валідний
+    за побудовою, тож repair-раунди не потрібні.
     """
     schema_str = json.dumps(schema, indent=2, ensure_ascii=False)
     prompt = get_baseline_prompt(text, schema_str)
+    llm_kwargs = {"json_schema": schema} if constrained else {}
     
     # Перша спроба
-    current_output = call_llm(prompt)
+    current_output = call_llm(prompt, **llm_kwargs)
     
     repairs_made = 0
     while repairs_made <= max_repairs:
@@ -53,11 +56,62 @@ def run_extraction_pipeline(text, schema, max_repairs=2):
         repairs_made += 1
         if repairs_made <= max_repairs:
             repair_prompt = get_repair_prompt(text, current_output, error, schema_str)
-            current_output = call_llm(repair_prompt)
+            current_output = call_llm(repair_prompt, **llm_kwargs)
         else:
             return {
                 "status": "fail",
                 "error": error,
                 "repairs_attempted": max_repairs,
                 "last_output": current_output
-            }
\ No newline at end of file
+            }
+
+def run_extraction_pipeline_batch(texts, schema, max_repairs=2, batch_size=8, llm_batch=None, constrained=False):
+    """
+    Пакетна версія run_extraction_pipeline: перша спроба для всіх текстів одним
+    call_llm_batch, далі в кожному раунді repair повторно надсилаються лише ті
+    елементи, що не пройшли валідацію. Повертає список результатів у тому ж
+    форматі й порядку, що й виклики run_extraction_pipeline.
+
+    llm_batch — функція (prompts, batch_size, **kwargs) -> list[str]; за замовчуванням call_llm_batch.
+    constrained — як у run_extraction_pipeline (llm_batch отримує json_schema).
+    """
+    llm_batch = llm_batch or call_llm_batch
+    llm_kwargs = {"json_schema": schema} if constrained else {}
+    schema_str = json.dumps(schema, indent=2, ensure_ascii=False)
+    texts = list(texts)
+    results = [None] * len(texts)
+
+    # Перша спроба
+    outputs = llm_batch([get_baseline_prompt(text, schema_str) for text in texts], batch_size=batch_size,
+                        **llm_kwargs)
+    pending = list(range(len(texts)))
+
+    repairs_made = 0
+    while pending:
+        repair_ids, repair_prompts = [], []
+        for i, current_output in zip(pending, outputs):
+            is_valid, data, error = validate_extraction(current_output, schema)
+            if is_valid:
+                results[i] = {
+                    "status": "success",
+                    "data": data,
+                    "repairs_needed": repairs_made,
+                    "raw_output": current_output
+                }
+            elif repairs_made < max_repairs:
+                repair_ids.append(i)
+                repair_prompts.append(get_repair_prompt(texts[i], current_output, error, schema_str))
+            else:
+                results[i] = {
+                    "status": "fail",
+                    "error": error,
+                    "repairs_attempted": max_repairs,
+                    "last_output": current_output
+                }
+
+        repairs_made += 1
+        pending = repair_ids
+        if pending:
+            outputs = llm_batch(repair_prompts, batch_size=batch_size, **llm_kwargs)
+
+    return results
@@ -1,6 +1,20 @@
+import hashlib
+import itertools
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+import numpy as np
+import scipy.sparse as sp
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.svm import LinearSVC
 from sklearn.pipeline import Pipeline
+from sklearn.linear_model import SGDClassifier
+from sklearn.metrics import accuracy_score, f1_score
+from .out_of_core import train_out_of_core
+
+# Параметри, від яких залежить матриця TF-IDF; решта (C, class_weight) — лише класифікатора
+VECTORIZER_KEYS = ("analyzer", "ngram_range", "min_df")
 
 def run_linear_svm(X_train, y_train, analyzer="word", ngram_range=(1, 2), class_weight=None, C=1.0, min_df=1):
     """
@@ -12,4 +26,150 @@ def run_linear_svm(X_train, y_train, analyzer="word", ngram_range=(1, 2), class_
     ])
     
     pipeline.fit(X_train, y_train)
-    return pipeline
\ No newline at end of file
+    return pipeline
+
+def run_linear_svm_out_of_core(csv_path, text_col="text", label_col="target", analyzer="word", ngram_range=(1, 2),
+                               class_weight=None, C=1.0, min_df=1, chunksize=10_000, n_epochs=5, n_features=2 ** 20):
+    """
+    Out-of-core версія run_linear_svm: хешовані n-грами з потоковим IDF
+    + SGDClassifier(loss='hinge'), навчання частинами з CSV.
+    """
+    return train_out_of_core(
+        csv_path, SGDClassifier(loss='hinge', random_state=42), 'svm',
+        text_col=text_col, label_col=label_col, analyzer=analyzer, ngram_range=ngram_range, min_df=min_df,
+        n_features=n_features, class_weight=class_weight, C=C, chunksize=chunksize, n_epochs=n_epochs
+    )
+
+
+def _config_key(config) -> str:
+    return json.dumps(config, sort_keys=True, ensure_ascii=False)
+
+def _data_fingerprint(*arrays) -> str:
+    digest = hashlib.sha256()
+    for array in arrays:
+        for item in array:
+            digest.update(str(item).encode("utf-8"))
+            digest.update(b"\x1f")
+        digest.update(b"\x1e")
+    return digest.hexdigest()[:16]
+
+def _matrix_path(cache_dir, data_key, vec_config) -> str:
+    name = hashlib.sha256(f"{data_key}|{_config_key(vec_config)}".encode("utf-8")).hexdigest()[:16]
+    return os.path.join(cache_dir, name)
+
+def _vectorize_job(path, vec_config, X_train, X_val):
+    """
+    Векторизує train/val один раз для конфігурації векторизатора і кладе матриці в кеш на диску.
+    Кожен файл пишеться в *.tmp.npz і переміщується os.replace; _val.npz — останнім,
+    тож його наявність означає, що обидві матриці записані повністю.
+    """
+    if not os.path.exists(path + "_val.npz"):
+        vectorizer = TfidfVectorizer(analyzer=vec_config["analyzer"], ngram_range=tuple(vec_config["ngram_range"]),
+                                     sublinear_tf=True, min_df=vec_config["min_df"])
+        for suffix, matrix in (("_train", vectorizer.fit_transform(X_train)), ("_val", vectorizer.transform(X_val))):
+            sp.save_npz(path + suffix + ".tmp.npz", matrix)
+            os.replace(path + suffix + ".tmp.npz", path + suffix + ".npz")
+    return path
+
+_worker_matrices = {}
+
+def _fit_job(path, config, y_train, y_val):
+    """Навчає LinearSVC на закешованій матриці (у межах процесу матриця читається один раз)."""
+    if path not in _worker_matrices:
+        _worker_matrices.clear()
+        _worker_matrices[path] = (sp.load_npz(path + "_train.npz"), sp.load_npz(path + "_val.npz"))
+    X_train, X_val = _worker_matrices[path]
+
+    start = time.perf_counter()
+    svm = LinearSVC(C=config["C"], class_weight=config["class_weight"], random_state=42, max_iter=2000)
+    svm.fit(X_train, y_train)
+    y_pred = svm.predict(X_val)
+    return {
+        **config,
+        "macro_f1": f1_score(y_val, y_pred, average='macro'),
+        "accuracy": accuracy_score(y_val, y_pred),
+        "n_features": X_train.shape[1],
+        "fit_sec": time.perf_counter() - start
+    }
+
+def load_leaderboard(path, data_key=None):
+    """Читає JSONL-лідерборд, відсортований за macro-F1 (спадання); data_key — лише рядки для цих даних."""
+    if not os.path.exists(path):
+        return []
+    with open(path, 'r', encoding='utf-8') as f:
+        rows = [json.loads(line) for line in f if line.strip()]
+    if data_key is not None:
+        rows = [row for row in rows if row.get("data_key") == data_key]
+    return sorted(rows, key=lambda r: r["macro_f1"], reverse=True)
+
+def run_svm_sweep(X_train, y_train, X_val, y_val, grid, leaderboard_path,
+                  cache_dir="sentiment/cache/svm_sweep", n_jobs=-1):
+    """
+    Перебір гіперпараметрів run_linear_svm (TF-IDF + LinearSVC).
+
+    grid — словник списків значень для analyzer, ngram_range, min_df, C, class_weight.
+    Матриці TF-IDF кешуються на диску за конфігурацією векторизатора (і відбитком даних),
+    тож різні C та class_weight перевикористовують одну матрицю. Конфігурації рахуються
+    в пулі процесів, кожен результат одразу дописується в leaderboard_path (JSONL)
+    разом з відбитком даних data_key; при повторному запуску на тих самих даних
+    вже пораховані конфігурації пропускаються.
+    Повертає лідерборд для цих даних (load_leaderboard).
+    """
+    defaults = {"analyzer": ["word"], "ngram_range": [(1, 2)], "min_df": [1], "C": [1.0], "class_weight": [None]}
+    grid = {**defaults, **grid}
+    names = list(defaults)
+    configs = [dict(zip(names, values)) for values in itertools.product(*(grid[n] for n in names))]
+    for config in configs:
+        config["ngram_range"] = list(config["ngram_range"])
+
+    X_train, X_val = list(X_train), list(X_val)
+    y_train, y_val = np.asarray(y_train), np.asarray(y_val)
+    data_key = _data_fingerprint(X_train, y_train, X_val, y_val)
+
+    done = {_config_key({n: row[n] for n in names}) for row in load_leaderboard(leaderboard_path, data_key)}
+    pending = [c for c in configs if _config_key(c) not in done]
+    if not pending:
+        return load_leaderboard(leaderboard_path, data_key)
+
+    os.makedirs(cache_dir, exist_ok=True)
+    if os.path.dirname(leaderboard_path):
+        os.makedirs(os.path.dirname(leaderboard_path), exist_ok=True)
+
+    # Групуємо за векторизатором, щоб кожна матриця будувалася один раз
+    groups = {}
+    for config in pending:
+        vec_config = {k: config[k] for k in VECTORIZER_KEYS}
+        groups.setdefault(_config_key(vec_config), (vec_config, []))[1].append(config)
+
+    if n_jobs is None or n_jobs < 0:
+        n_jobs = os.cpu_count() or 1
+
+    with open(leaderboard_path, 'a', encoding='utf-8') as leaderboard:
+        def record(row):
+            leaderboard.write(json.dumps({**row, "data_key": data_key}, ensure_ascii=False) + "\n")
+            leaderboard.flush()
+
+        if n_jobs <= 1:
+            for vec_config, group in groups.values():
+                path = _vectorize_job(_matrix_path(cache_dir, data_key, vec_config), vec_config, X_train, X_val)
+                for config in group:
+                    record(_fit_job(path, config, y_train, y_val))
+        else:
+            with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+                vectorized = {
+                    executor.submit(_vectorize_job, _matrix_path(cache_dir, data_key, vec_config),
+                                    vec_config, X_train, X_val): group
+                    for vec_config, group in groups.values()
+                }
+                running = set(vectorized)
+                while running:
+                    finished, running = wait(running, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        if future in vectorized:
+                            path = future.result()
+                            running |= {executor.submit(_fit_job, path, config, y_train, y_val)
+                                        for config in vectorized[future]}
+                        else:
+                            record(future.result())
+
+    return load_leaderboard(leaderboard_path, data_key)
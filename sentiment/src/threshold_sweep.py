@@ -0,0 +1,128 @@
+import numpy as np
+import pandas as pd
+
+# Безголовий (без matplotlib) підбір порогів: придатний для CI та мільйонів рядків.
+# Рядок вважається позитивним для класу, якщо score >= threshold (як у evaluate_thresholds).
+
+
+def _one_vs_rest(y_true, y_scores, classes=None, pos_label=None):
+    """
+    Пари (is_positive, scores) для кожного класу.
+    1-D scores (decision_function бінарної моделі) стосуються pos_label;
+    2-D scores — по колонці на клас у порядку classes.
+    """
+    y_true = np.asarray(y_true)
+    y_scores = np.asarray(y_scores, dtype=np.float64)
+
+    if y_scores.ndim == 1:
+        if pos_label is None:
+            # Як у sklearn: додатна оцінка відповідає classes_[1]
+            pos_label = classes[1] if classes is not None else np.unique(y_true)[-1]
+        return {pos_label: (y_true == pos_label, y_scores)}
+
+    if classes is None:
+        classes = np.unique(y_true)
+    return {label: (y_true == label, y_scores[:, i]) for i, label in enumerate(classes)}
+
+
+def _metrics(tp, fp, n_pos, n, cost_fp, cost_fn):
+    """Метрики з матриці плутанини; працює з масивами будь-якої форми."""
+    fn = n_pos - tp
+    tn = n - n_pos - fp
+    with np.errstate(divide='ignore', invalid='ignore'):
+        precision = np.where(tp + fp > 0, tp / (tp + fp), 0.0)
+        recall = np.where(n_pos > 0, tp / np.maximum(n_pos, 1), 0.0)
+        f1 = np.where(2 * tp + fp + fn > 0, 2 * tp / (2 * tp + fp + fn), 0.0)
+    return {"tp": tp, "fp": fp, "fn": fn, "tn": tn, "precision": precision, "recall": recall, "f1": f1,
+            "cost": cost_fp * fp + cost_fn * fn}
+
+
+def threshold_sweep(y_true, y_scores, classes=None, pos_label=None, cost_fp=1.0, cost_fn=1.0):
+    """
+    Precision, recall, F1 та вартість помилок (cost_fp * FP + cost_fn * FN) для кожного
+    порогу-кандидата (унікальні оцінки) і кожного класу за один векторизований прохід
+    по відсортованих оцінках. Повертає DataFrame: class, threshold, tp, fp, fn, tn, precision, recall, f1, cost.
+    """
+    frames = []
+    for label, (is_pos, scores) in _one_vs_rest(y_true, y_scores, classes, pos_label).items():
+        order = np.argsort(-scores, kind="mergesort")
+        sorted_scores = scores[order]
+        tp = np.cumsum(is_pos[order])
+        fp = np.arange(1, len(scores) + 1) - tp
+
+        # Для однакових оцінок беремо останню позицію групи: поріг включає їх усі
+        last = np.r_[np.flatnonzero(sorted_scores[1:] != sorted_scores[:-1]), len(scores) - 1]
+        metrics = _metrics(tp[last], fp[last], is_pos.sum(), len(scores), cost_fp, cost_fn)
+
+        frame = pd.DataFrame({"threshold": sorted_scores[last], **metrics})
+        frame.insert(0, "class", label)
+        frames.append(frame)
+    return pd.concat(frames, ignore_index=True)
+
+
+def best_thresholds(sweep, metric="f1"):
+    """Найкращий поріг для кожного класу: максимум metric (для 'cost' — мінімум)."""
+    ascending = metric == "cost"
+    ranked = sweep.sort_values(["class", metric, "threshold"], ascending=[True, ascending, False])
+    return ranked.groupby("class", sort=False).head(1).reset_index(drop=True)
+
+
+def bootstrap_threshold_ci(y_true, y_scores, thresholds=None, classes=None, pos_label=None, n_boot=1000,
+                           ci=0.95, cost_fp=1.0, cost_fn=1.0, batch_size=256, grid_size=200, seed=42):
+    """
+    Бутстреп-інтервали precision/recall/F1/cost для заданих порогів кожного класу.
+
+    Метрики при фіксованих порогах залежать лише від кількості рядків у комірках
+    (клас × інтервал між порогами), тому замість перевибірки рядків кількості
+    комірок генеруються пачками з мультиноміального розподілу — результат той самий,
+    а вартість не залежить від кількості рядків.
+    thresholds — масив або словник {клас: масив}; за замовчуванням квантильна сітка з grid_size точок.
+    Також повертає інтервал для найкращого за F1 порогу (рядок metric='best_f1_threshold').
+    """
+    rng = np.random.default_rng(seed)
+    alpha = (1 - ci) / 2
+    rows = []
+
+    for label, (is_pos, scores) in _one_vs_rest(y_true, y_scores, classes, pos_label).items():
+        if thresholds is None:
+            grid = np.unique(np.quantile(scores, np.linspace(0, 1, grid_size)))
+        else:
+            grid = np.unique(np.asarray(thresholds[label] if isinstance(thresholds, dict) else thresholds, dtype=float))
+
+        # Кількість порогів, не більших за оцінку: рядок позитивний для grid[i], якщо i < bins
+        bins = np.searchsorted(grid, scores, side="right")
+        counts = np.concatenate([
+            np.bincount(bins[is_pos], minlength=len(grid) + 1),
+            np.bincount(bins[~is_pos], minlength=len(grid) + 1)
+        ])
+        n = len(scores)
+
+        samples = {name: [] for name in ("precision", "recall", "f1", "cost", "best_f1_threshold")}
+        for start in range(0, n_boot, batch_size):
+            boot = rng.multinomial(n, counts / n, size=min(batch_size, n_boot - start))
+            pos, neg = boot[:, :len(grid) + 1], boot[:, len(grid) + 1:]
+
+            # TP/FP для grid[i] — суми по комірках з bins > i (обернена кумулятивна сума)
+            tp = np.cumsum(pos[:, ::-1], axis=1)[:, ::-1][:, 1:]
+            fp = np.cumsum(neg[:, ::-1], axis=1)[:, ::-1][:, 1:]
+            metrics = _metrics(tp, fp, pos.sum(axis=1, keepdims=True), n, cost_fp, cost_fn)
+
+            for name in ("precision", "recall", "f1", "cost"):
+                samples[name].append(metrics[name])
+            samples["best_f1_threshold"].append(grid[metrics["f1"].argmax(axis=1)])
+
+        point = _metrics(np.cumsum(counts[:len(grid) + 1][::-1])[::-1][1:],
+                         np.cumsum(counts[len(grid) + 1:][::-1])[::-1][1:],
+                         is_pos.sum(), n, cost_fp, cost_fn)
+        for name in ("precision", "recall", "f1", "cost"):
+            values = np.concatenate(samples[name])
+            low, high = np.quantile(values, [alpha, 1 - alpha], axis=0)
+            rows.append(pd.DataFrame({"class": label, "threshold": grid, "metric": name,
+                                      "value": point[name], "low": low, "high": high}))
+
+        best = np.concatenate(samples["best_f1_threshold"])
+        rows.append(pd.DataFrame({"class": [label], "threshold": [grid[point["f1"].argmax()]],
+                                  "metric": ["best_f1_threshold"], "value": [grid[point["f1"].argmax()]],
+                                  "low": [np.quantile(best, alpha)], "high": [np.quantile(best, 1 - alpha)]}))
+
+    return pd.concat(rows, ignore_index=True)
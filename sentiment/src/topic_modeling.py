@@ -1,5 +1,12 @@
+import os
+from itertools import islice
+import joblib
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
 from sklearn.decomposition import TruncatedSVD, LatentDirichletAllocation
-from sklearn.feature_extraction.text import TfidfVectorizer, CountVectorizer
+from sklearn.feature_extraction.text import TfidfVectorizer, CountVectorizer, TfidfTransformer
+from sklearn.utils.extmath import randomized_svd
 
 def run_lsa(corpus, custom_stop_words, n_components=5):
     """Навчання LSA"""
@@ -29,4 +36,205 @@ def run_lda(corpus, custom_stop_words, n_components=5):
         learning_method='online'
     )
     lda_matrix = lda_model.fit_transform(count_matrix)
-    return lda_model, count_vectorizer, lda_matrix
\ No newline at end of file
+    return lda_model, count_vectorizer, lda_matrix
+
+class IncrementalTopicModel:
+    """
+    LDA або LSA з інкрементальним оновленням на нових документах.
+
+    Перший виклик update навчає векторизатор і модель так само, як run_lda/run_lsa;
+    далі словник (і IDF для LSA) фіксований, нові слова ігноруються.
+    LDA оновлюється через partial_fit на міні-пакетах, базис LSA — злиттям
+    поточного S·Vt з новими рядками та randomized SVD (Brand-style update),
+    тож вартість оновлення залежить лише від обсягу нових даних.
+    """
+    def __init__(self, kind="lda", n_components=5, custom_stop_words=None, batch_size=1024):
+        if kind not in ("lda", "lsa"):
+            raise ValueError("kind має бути 'lda' або 'lsa'")
+        self.kind = kind
+        self.n_components = n_components
+        self.custom_stop_words = custom_stop_words
+        self.batch_size = batch_size
+        self.vectorizer = None
+        self.model = None
+        self.n_docs_seen = 0
+
+    def update(self, corpus):
+        """Оновлює модель новими документами і повертає їхню матрицю документ-тема."""
+        if self.model is None:
+            return self._fit_initial(corpus)
+
+        X = self.vectorizer.transform(corpus)
+        if self.kind == "lda":
+            # total_samples задає масштаб онлайн-оновлення: оцінюємо його кількістю побачених документів
+            self.model.set_params(total_samples=self.n_docs_seen + X.shape[0])
+            for start in range(0, X.shape[0], self.batch_size):
+                self.model.partial_fit(X[start:start + self.batch_size])
+        else:
+            self._update_lsa(X)
+
+        self.n_docs_seen += X.shape[0]
+        return self.model.transform(X)
+
+    def _fit_initial(self, corpus):
+        if self.kind == "lda":
+            self.model, self.vectorizer, matrix = run_lda(corpus, self.custom_stop_words, self.n_components)
+        else:
+            self.model, self.vectorizer, matrix = run_lsa(corpus, self.custom_stop_words, self.n_components)
+        self.n_docs_seen = matrix.shape[0]
+        return matrix
+
+    def _update_lsa(self, X):
+        # A_old^T A_old ≈ Vt^T S^2 Vt, тож SVD від [S·Vt; X] дає оновлений базис для всієї історії
+        basis = sp.csr_matrix(self.model.singular_values_[:, None] * self.model.components_)
+        _, singular_values, components = randomized_svd(
+            sp.vstack([basis, X]).tocsr(), self.n_components, random_state=42
+        )
+        self.model.components_ = components
+        self.model.singular_values_ = singular_values
+        # Дисперсія рахується по всій матриці документів, якої вже немає: застарілі значення прибираємо
+        for name in ("explained_variance_", "explained_variance_ratio_"):
+            if hasattr(self.model, name):
+                delattr(self.model, name)
+
+    def transform(self, corpus):
+        return self.model.transform(self.vectorizer.transform(corpus))
+
+    def save(self, path):
+        """Зберігає стан (векторизатор, модель, лічильники) між запусками; обірване збереження не псує попередній."""
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        joblib.dump(self, path + ".tmp")
+        os.replace(path + ".tmp", path)
+
+    @classmethod
+    def load(cls, path):
+        return joblib.load(path)
+
+def run_topics_incremental(corpus, custom_stop_words, state_path, kind="lda", n_components=5):
+    """
+    Щоденне оновлення тем: завантажує стан з state_path (або створює нову модель),
+    оновлює її лише новим corpus і зберігає назад.
+    Повертає (model, vectorizer, doc_topic_matrix нових документів), як run_lda/run_lsa.
+    """
+    if os.path.exists(state_path):
+        topic_model = IncrementalTopicModel.load(state_path)
+        if (topic_model.kind, topic_model.n_components) != (kind, n_components):
+            raise ValueError(f"У {state_path} збережено {topic_model.kind} з {topic_model.n_components} темами, "
+                             f"а запитано {kind} з {n_components}")
+    else:
+        topic_model = IncrementalTopicModel(kind, n_components, custom_stop_words)
+
+    matrix = topic_model.update(corpus)
+    topic_model.save(state_path)
+    return topic_model.model, topic_model.vectorizer, matrix
+
+
+def iter_corpus(source, text_col="text", chunksize=10_000):
+    """
+    Потоковий корпус: шлях до CSV (колонка text_col), до текстового файлу
+    (документ на рядок) або будь-який ітерабельний набір текстів.
+    Генерує списки по chunksize документів.
+    """
+    if isinstance(source, str) and source.endswith(".csv"):
+        for chunk in pd.read_csv(source, usecols=[text_col], chunksize=chunksize):
+            yield chunk[text_col].fillna("").astype(str).tolist()
+    elif isinstance(source, str):
+        with open(source, 'r', encoding='utf-8') as f:
+            yield from iter_corpus((line.rstrip("\n") for line in f), chunksize=chunksize)
+    else:
+        iterator = iter(source)
+        while True:
+            chunk = list(islice(iterator, chunksize))
+            if not chunk:
+                return
+            yield chunk
+
+def build_corpus_matrix(source, custom_stop_words, kind="count", ngram_range=(1, 1), min_df=5, max_df=0.8,
+                        text_col="text", chunksize=10_000):
+    """
+    Будує count- або TF-IDF матрицю за один прохід по потоковому корпусу
+    (ті самі налаштування та результат, що й CountVectorizer/TfidfVectorizer у run_lda/run_lsa).
+    У пам'яті тримаються лише розріджені лічильники, а не тексти.
+    Повертає (матриця, векторизатор з тим самим словником для нових документів).
+    """
+    analyzer = CountVectorizer(ngram_range=ngram_range, stop_words=custom_stop_words).build_analyzer()
+    vocabulary = {}
+    indices, counts, indptr = [], [], [0]
+
+    for texts in iter_corpus(source, text_col, chunksize):
+        for text in texts:
+            doc_counts = {}
+            for term in analyzer(text):
+                column = vocabulary.setdefault(term, len(vocabulary))
+                doc_counts[column] = doc_counts.get(column, 0) + 1
+            indices.append(np.fromiter(doc_counts.keys(), dtype=np.int64, count=len(doc_counts)))
+            counts.append(np.fromiter(doc_counts.values(), dtype=np.int64, count=len(doc_counts)))
+            indptr.append(indptr[-1] + len(doc_counts))
+
+    n_docs = len(indptr) - 1
+    indices = np.concatenate(indices) if indices else np.zeros(0, dtype=np.int64)
+    counts = np.concatenate(counts) if counts else np.zeros(0, dtype=np.int64)
+
+    # Відсікання за min_df/max_df і сортування словника, як у CountVectorizer
+    df = np.bincount(indices, minlength=len(vocabulary))
+    max_doc_count = max_df if isinstance(max_df, int) else max_df * n_docs
+    min_doc_count = min_df if isinstance(min_df, int) else min_df * n_docs
+    terms = sorted(t for t, c in vocabulary.items() if min_doc_count <= df[c] <= max_doc_count)
+    new_columns = np.full(len(vocabulary), -1, dtype=np.int64)
+    new_columns[[vocabulary[t] for t in terms]] = np.arange(len(terms))
+
+    columns = new_columns[indices]
+    keep = columns >= 0
+    row_ids = np.repeat(np.arange(n_docs), np.diff(indptr))
+    matrix = sp.csr_matrix((counts[keep], (row_ids[keep], columns[keep])), shape=(n_docs, len(terms)))
+    matrix.sort_indices()
+    vocabulary = {t: i for i, t in enumerate(terms)}
+
+    if kind == "count":
+        return matrix, CountVectorizer(ngram_range=ngram_range, stop_words=custom_stop_words, vocabulary=vocabulary)
+
+    transformer = TfidfTransformer()
+    tfidf_matrix = transformer.fit_transform(matrix)
+    vectorizer = TfidfVectorizer(ngram_range=ngram_range, stop_words=custom_stop_words, vocabulary=vocabulary)
+    vectorizer.idf_ = transformer.idf_
+    return tfidf_matrix, vectorizer
+
+def write_doc_topic(model, matrix, path, chunksize=10_000):
+    """
+    Рахує матрицю документ-тема частинами і пише її у .npy через memmap.
+    Повертає відкриту лише для читання memmap-матрицю.
+    """
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    out = np.lib.format.open_memmap(path, mode='w+', dtype=np.float64, shape=(matrix.shape[0], model.n_components))
+    for start in range(0, matrix.shape[0], chunksize):
+        out[start:start + chunksize] = model.transform(matrix[start:start + chunksize])
+    out.flush()
+    del out
+    return np.load(path, mmap_mode='r')
+
+def run_lda_streaming(source, custom_stop_words, doc_topic_path, n_components=5, n_jobs=-1,
+                      text_col="text", chunksize=10_000):
+    """
+    run_lda для потокового корпусу (файл або генератор): count-матриця будується частинами,
+    E-крок LDA паралелиться на n_jobs процесів, матриця документ-тема пишеться в doc_topic_path (.npy).
+    """
+    count_matrix, count_vectorizer = build_corpus_matrix(source, custom_stop_words, "count", (1, 1),
+                                                         text_col=text_col, chunksize=chunksize)
+    lda_model = LatentDirichletAllocation(
+        n_components=n_components,
+        random_state=42,
+        learning_method='online',
+        n_jobs=n_jobs
+    )
+    lda_model.fit(count_matrix)
+    return lda_model, count_vectorizer, write_doc_topic(lda_model, count_matrix, doc_topic_path, chunksize)
+
+def run_lsa_streaming(source, custom_stop_words, doc_topic_path, n_components=5, text_col="text", chunksize=10_000):
+    """run_lsa для потокового корпусу; матриця документ-тема пишеться в doc_topic_path (.npy)."""
+    tfidf_matrix, tfidf_vectorizer = build_corpus_matrix(source, custom_stop_words, "tfidf", (1, 2),
+                                                         text_col=text_col, chunksize=chunksize)
+    lsa_model = TruncatedSVD(n_components=n_components, random_state=42)
+    lsa_model.fit(tfidf_matrix)
+    return lsa_model, tfidf_vectorizer, write_doc_topic(lsa_model, tfidf_matrix, doc_topic_path, chunksize)
@@ -11,11 +11,34 @@ def get_top_words(model, vectorizer, n_top_words=10):
         topics[f"Topic {topic_idx}"] = top_features
     return topics
 
-def get_top_documents(doc_topic_matrix, corpus, n_top_docs=2):
-    """Отримання топ-документів для кожної теми"""
+def get_top_documents(doc_topic_matrix, corpus, n_top_docs=2, chunk_rows=100_000):
+    """
+    Отримання топ-документів для кожної теми.
+    doc_topic_matrix може бути шляхом до .npy: тоді матриця відкривається через mmap
+    і читається блоками по chunk_rows рядків, не завантажуючись у пам'ять цілком.
+    """
+    if isinstance(doc_topic_matrix, str):
+        doc_topic_matrix = np.load(doc_topic_matrix, mmap_mode='r')
+    n_docs, n_topics = doc_topic_matrix.shape
+    n_top = min(n_top_docs, n_docs)
+
+    # Кандидати (вага, індекс) для кожної теми: з кожного блоку лише n_top найкращих через argpartition
+    candidates = [(np.empty(0), np.empty(0, dtype=np.int64)) for _ in range(n_topics)]
+    for start in range(0, n_docs, chunk_rows):
+        block = np.asarray(doc_topic_matrix[start:start + chunk_rows])
+        k = min(n_top, block.shape[0])
+        if k == 0:
+            continue
+        top = np.argpartition(-block, k - 1, axis=0)[:k]
+        for topic_idx in range(n_topics):
+            weights, indices = candidates[topic_idx]
+            candidates[topic_idx] = (np.concatenate([weights, block[top[:, topic_idx], topic_idx]]),
+                                     np.concatenate([indices, top[:, topic_idx] + start]))
+
     top_docs = {}
-    for topic_idx in range(doc_topic_matrix.shape[1]):
+    for topic_idx, (weights, indices) in enumerate(candidates):
         # Сортуємо документи за вагою поточної теми
-        top_doc_indices = np.argsort(doc_topic_matrix[:, topic_idx])[::-1][:n_top_docs]
-        top_docs[f"Topic {topic_idx}"] = [corpus.iloc[i] for i in top_doc_indices]
-    return top_docs
\ No newline at end of file
+        top_doc_indices = indices[np.argsort(weights)[::-1][:n_top_docs]]
+        top_docs[f"Topic {topic_idx}"] = [corpus.iloc[i] if hasattr(corpus, "iloc") else corpus[i]
+                                          for i in top_doc_indices]
+    return top_docs
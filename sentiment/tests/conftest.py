@@ -0,0 +1,33 @@
+import pytest
+
+
+@pytest.fixture(scope="session")
+def tiny_llm_pipe(tmp_path_factory):
+    """
+    Крихітна випадково ініціалізована Llama з байтовим BPE-токенізатором і chat_template
+    (без мережі): для перевірок бекенда та обмеженого декодування, а не якості відповідей.
+    """
+    torch = pytest.importorskip("torch")
+    tokenizers = pytest.importorskip("tokenizers")
+    from transformers import PreTrainedTokenizerFast, LlamaConfig, LlamaForCausalLM, pipeline
+
+    tokenizer = tokenizers.Tokenizer(tokenizers.models.BPE(unk_token=None))
+    tokenizer.pre_tokenizer = tokenizers.pre_tokenizers.ByteLevel(add_prefix_space=False)
+    tokenizer.decoder = tokenizers.decoders.ByteLevel()
+    tokenizer.train_from_iterator(
+        ['Відгук: товар добрий, доставка швидка {"sentiment_type": "positive", "rating_mentioned": null}'] * 10,
+        tokenizers.trainers.BpeTrainer(vocab_size=400, special_tokens=["<eos>", "<pad>"],
+                                       initial_alphabet=tokenizers.pre_tokenizers.ByteLevel.alphabet())
+    )
+    fast = PreTrainedTokenizerFast(tokenizer_object=tokenizer, eos_token="<eos>")
+    fast.chat_template = ("{% for m in messages %}{{ m['role'] }}: {{ m['content'] }}\n{% endfor %}"
+                          "{% if add_generation_prompt %}assistant: {% endif %}")
+
+    torch.manual_seed(0)
+    model = LlamaForCausalLM(LlamaConfig(vocab_size=len(fast), hidden_size=32, intermediate_size=64,
+                                         num_hidden_layers=2, num_attention_heads=4, num_key_value_heads=4,
+                                         max_position_embeddings=4096, eos_token_id=0))
+    path = str(tmp_path_factory.mktemp("tiny_llm"))
+    model.save_pretrained(path)
+    fast.save_pretrained(path)
+    return pipeline("text-generation", model=path, device="cpu")
@@ -0,0 +1,114 @@
+import json
+import jsonschema
+import pytest
+from sentiment.src.constrained_decoding import SchemaAutomaton, SchemaTokenMasker, MAX_NUMBER_LENGTH
+from sentiment.src.json_schema import EXTRACTION_SCHEMA
+from sentiment.src.llm_backends import TransformersBackend
+from sentiment.src.llm_extract import _messages
+
+VALID = [
+    '{"sentiment_type": "positive", "mentioned_aspects": ["ціна", "доставка"], "advantages": null, '
+    '"disadvantages": "довго", "rating_mentioned": 4.5}',
+    '{"sentiment_type":"neutral","mentioned_aspects":[],"advantages":"a \\"b\\" \\u0041","disadvantages":null,'
+    '"rating_mentioned":-1e3}',
+    '{"sentiment_type": "negative", "mentioned_aspects": ["x"], "advantages": "", "disadvantages": "", '
+    '"rating_mentioned": null}',
+]
+
+INVALID = [
+    # enum
+    '{"sentiment_type": "good"',
+    # бракує властивостей
+    '{"sentiment_type": "positive"}',
+    # рядок замість числа
+    '{"sentiment_type": "positive", "mentioned_aspects": [], "advantages": null, "disadvantages": null, '
+    '"rating_mentioned": "5"}',
+    # кома в кінці масиву
+    '{"sentiment_type": "positive", "mentioned_aspects": ["a",]',
+    # зайва властивість
+    '{"sentiment_type": "positive", "mentioned_aspects": [], "advantages": null, "disadvantages": null, '
+    '"rating_mentioned": 5, "extra": 1}',
+    # забагато пробілів поспіль
+    '{   "sentiment_type": "positive"',
+    # занадто довге число
+    '{"sentiment_type": "positive", "mentioned_aspects": [], "advantages": null, "disadvantages": null, '
+    '"rating_mentioned": ' + "1" * (MAX_NUMBER_LENGTH + 1),
+    # текст після завершеного об'єкта
+    '{"sentiment_type": "positive", "mentioned_aspects": [], "advantages": null, "disadvantages": null, '
+    '"rating_mentioned": 5} ',
+]
+
+
+def _run(automaton, text):
+    state = automaton.initial_state()
+    for byte in text.encode("utf-8"):
+        state = automaton.step(state, byte)
+        if state is None:
+            return None
+    return state
+
+
+@pytest.mark.parametrize("text", VALID)
+def test_automaton_accepts_schema_valid_json(text):
+    automaton = SchemaAutomaton(EXTRACTION_SCHEMA)
+    state = _run(automaton, text)
+    assert state is not None and automaton.is_complete(state)
+    jsonschema.validate(json.loads(text), EXTRACTION_SCHEMA)
+
+
+@pytest.mark.parametrize("text", INVALID)
+def test_automaton_rejects_invalid_json(text):
+    assert _run(SchemaAutomaton(EXTRACTION_SCHEMA), text) is None
+
+
+def test_automaton_incomplete_prefix():
+    automaton = SchemaAutomaton(EXTRACTION_SCHEMA)
+    state = _run(automaton, '{"sentiment_type": "pos')
+    assert state is not None and not automaton.is_complete(state)
+
+
+def test_masker_allows_only_valid_continuations(tiny_llm_pipe):
+    tokenizer = tiny_llm_pipe.tokenizer
+    masker = SchemaTokenMasker(EXTRACTION_SCHEMA, tokenizer)
+    state = masker.automaton.initial_state()
+    for token_id in masker.allowed_ids(state):
+        assert masker.advance(state, token_id) is not None
+    # EOS дозволено лише після завершеного об'єкта
+    assert tokenizer.eos_token_id not in masker.allowed_ids(state)
+    complete = _run(masker.automaton, VALID[0])
+    assert masker.allowed_ids(complete) == [tokenizer.eos_token_id]
+
+
+def test_constrained_generation_stays_within_schema(tiny_llm_pipe):
+    # Випадкова модель може не встигнути закрити JSON за max_new_tokens,
+    # але кожен згенерований байт має продовжувати валідний за схемою JSON
+    automaton = SchemaAutomaton(EXTRACTION_SCHEMA)
+    backend = TransformersBackend(pipe=tiny_llm_pipe)
+    for prompt in ("Відгук: товар добрий", "Відгук: доставка швидка"):
+        output = backend.generate(_messages(prompt), max_new_tokens=200, do_sample=False,
+                                  json_schema=EXTRACTION_SCHEMA)
+        state = _run(automaton, output)
+        assert output and state is not None
+        if automaton.is_complete(state):
+            jsonschema.validate(json.loads(output), EXTRACTION_SCHEMA)
+
+
+def test_added_special_tokens_are_never_text(tiny_llm_pipe):
+    from transformers import AddedToken, AutoTokenizer
+
+    tokenizer = AutoTokenizer.from_pretrained(tiny_llm_pipe.model.name_or_path)
+    # Як у Llama 3: додані спецтокени, яких немає в all_special_ids
+    tokenizer.add_tokens([AddedToken("<|end_of_text|>", special=True), AddedToken("<|start_header_id|>", special=True)])
+    end_id, header_id = tokenizer.convert_tokens_to_ids(["<|end_of_text|>", "<|start_header_id|>"])
+    assert end_id not in tokenizer.all_special_ids
+
+    masker = SchemaTokenMasker(EXTRACTION_SCHEMA, tokenizer, eos_token_ids=[end_id])
+    inside_string = _run(masker.automaton, '{"sentiment_type": "positive", "mentioned_aspects": ["ці')
+    allowed = masker.allowed_ids(inside_string)
+    assert allowed and end_id not in allowed and header_id not in allowed
+    assert masker.advance(inside_string, header_id) is None
+    assert masker.advance(inside_string, end_id) is None
+
+    complete = _run(masker.automaton, VALID[0])
+    assert end_id in masker.allowed_ids(complete)
+    assert header_id not in masker.allowed_ids(complete)
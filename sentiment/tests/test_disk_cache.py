@@ -0,0 +1,47 @@
+from sentiment.src.disk_cache import DiskCache
+from sentiment.src.ling_features import LinguisticExtractor
+
+
+def test_memory_hits_protect_keys_from_eviction(tmp_path):
+    cache = DiskCache(str(tmp_path / "cache.sqlite"), max_entries=10, memory_size=100, touch_batch=1, evict_every=1)
+    cache.set("hot", 1)
+    for i in range(20):
+        cache.set(f"cold{i}", i)
+        # Влучання лише в пам'ять, на диск потрапляє через touch
+        assert cache.get("hot") == 1
+    assert cache.stats()["disk_hits"] == 0
+    cache.close()
+
+    reopened = DiskCache(str(tmp_path / "cache.sqlite"), max_entries=10, memory_size=0)
+    assert reopened.get("hot") == 1
+    assert reopened.get("cold0") is None
+    assert reopened.stats()["entries"] <= 10
+
+
+def test_eviction_runs_every_n_inserts(tmp_path):
+    cache = DiskCache(str(tmp_path / "cache.sqlite"), max_entries=10, memory_size=0, evict_every=5)
+    for i in range(14):
+        cache.set(f"k{i}", i)
+    # Перевірки після 1-ї, 6-ї та 11-ї вставки: між ними кеш може трохи перевищити ліміт
+    assert cache.stats()["entries"] == 12
+    cache.set("k14", 14)
+    cache.set("k15", 15)
+    assert cache.stats()["entries"] <= 10
+
+
+def test_ling_cache_key_depends_on_model_dir():
+    first = LinguisticExtractor(use_gpu=False, model_dir="/models/a")
+    second = LinguisticExtractor(use_gpu=False, model_dir="/models/b")
+    assert first._cache_key("текст") != second._cache_key("текст")
+    assert first._cache_key("текст") == LinguisticExtractor(use_gpu=False, model_dir="/models/a")._cache_key("текст")
+
+
+def test_evicted_keys_leave_memory_layer(tmp_path):
+    cache = DiskCache(str(tmp_path / "cache.sqlite"), max_entries=10, memory_size=100, evict_every=1)
+    for i in range(11):
+        cache.set(f"k{i}", i)
+    # Найстаріші записи видалено з диска — і з пам'яті теж
+    assert cache.get("k0") is None
+    assert cache.get("k10") == 10
+    n_cached = sum(cache.get(f"k{i}") is not None for i in range(11))
+    assert n_cached == cache.stats()["entries"] == 9
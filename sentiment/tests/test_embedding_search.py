@@ -0,0 +1,44 @@
+import numpy as np
+from gensim.models import KeyedVectors
+from sentiment.src.embedding_search import EmbeddingIndex
+
+
+def _keyed_vectors(n_words, dim=8, seed=0):
+    kv = KeyedVectors(dim)
+    kv.add_vectors([f"w{i}" for i in range(n_words)],
+                   np.random.default_rng(seed).normal(size=(n_words, dim)).astype(np.float32))
+    return kv
+
+
+def _assert_same(result, expected):
+    assert [[word for word, _ in row] for row in result] == [[word for word, _ in row] for row in expected]
+    np.testing.assert_allclose([score for row in result for _, score in row],
+                               [score for row in expected for _, score in row], rtol=1e-5)
+
+
+def test_neighbors_match_exact_search():
+    index = EmbeddingIndex.build(_keyed_vectors(300), n_lists=8, n_probe=8)
+    words = ["w0", "w17", "w299"]
+    _assert_same(index.neighbors(words, topn=5), index.exact_neighbors(words, topn=5))
+
+
+def test_single_word_vocabulary_returns_empty_list():
+    index = EmbeddingIndex.build(_keyed_vectors(1), n_lists=1, n_probe=1)
+    assert index.neighbors(["w0"], topn=5) == [[]]
+    assert index.exact_neighbors(["w0"], topn=5) == [[]]
+
+
+def test_short_probed_lists_are_topped_up():
+    # Кожен кластер — одне слово: з n_probe=1 у найближчому списку лише саме слово запиту
+    index = EmbeddingIndex.build(_keyed_vectors(20), n_lists=20, n_probe=1)
+    result = index.neighbors(["w3"], topn=4)[0]
+    assert len(result) == 4
+    assert "w3" not in [word for word, _ in result]
+    _assert_same([result], index.exact_neighbors(["w3"], topn=4))
+
+
+def test_save_load_roundtrip(tmp_path):
+    index = EmbeddingIndex.build(_keyed_vectors(100), n_lists=4, n_probe=2)
+    index.save(str(tmp_path))
+    loaded = EmbeddingIndex.load(str(tmp_path))
+    assert loaded.neighbors(["w5", "missing"], topn=3) == index.neighbors(["w5", "missing"], topn=3)
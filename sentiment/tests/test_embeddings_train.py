@@ -0,0 +1,48 @@
+import os
+import numpy as np
+import pytest
+from gensim.models import Word2Vec
+from sentiment.src.embeddings_train import train_resumable
+
+CORPUS = [["добрий", "товар", "швидка", "доставка"], ["поганий", "товар", "повільна", "доставка"],
+          ["чудовий", "сервіс", "добрий", "магазин"], ["жахливий", "сервіс", "поганий", "магазин"]] * 20
+
+
+def _train(path, **kwargs):
+    return train_resumable(str(path), corpus_tokens=CORPUS, epochs=3, vector_size=16, min_count=1, workers=1,
+                           **kwargs)
+
+
+def test_resume_matches_uninterrupted_run(tmp_path, monkeypatch):
+    expected = _train(tmp_path / "full")
+
+    # Обриваємо навчання на другій епосі
+    original_train = Word2Vec.train
+    calls = []
+
+    def failing_train(self, *args, **kwargs):
+        calls.append(1)
+        if len(calls) == 2:
+            raise KeyboardInterrupt
+        return original_train(self, *args, **kwargs)
+
+    monkeypatch.setattr(Word2Vec, "train", failing_train)
+    with pytest.raises(KeyboardInterrupt):
+        _train(tmp_path / "resumed")
+    assert sorted(os.listdir(tmp_path / "resumed")) == ["epoch-1"]
+
+    monkeypatch.setattr(Word2Vec, "train", original_train)
+    resumed = _train(tmp_path / "resumed")
+    assert sorted(os.listdir(tmp_path / "resumed")) == ["epoch-3"]
+    np.testing.assert_array_equal(expected.wv.vectors, resumed.wv.vectors)
+
+
+def test_interrupted_save_keeps_previous_checkpoint(tmp_path):
+    _train(tmp_path)
+    # Обірваний запис наступної епохи лишає лише тимчасову теку
+    os.makedirs(tmp_path / ".epoch-4.tmp")
+    (tmp_path / ".epoch-4.tmp" / "model.ckpt").write_bytes(b"")
+
+    model = _train(tmp_path)
+    assert model.wv.vectors.shape[1] == 16
+    assert "epoch-3" in os.listdir(tmp_path)
@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+from sklearn.pipeline import Pipeline
+from sklearn.svm import LinearSVC
+from sentiment.src.fast_predict import LinearTextPredictor
+from sentiment.src.out_of_core import HashingTfidfVectorizer
+
+TEXTS = ["добрий товар швидка доставка", "поганий товар", "чудовий сервіс", "жахливий сервіс і доставка",
+         "нормальний магазин", "так собі якість"] * 3
+LABELS = {"binary": [1, 0, 1, 0, 1, 0] * 3, "multiclass": ["pos", "neg", "pos", "neg", "neu", "neu"] * 3}
+QUERIES = ["добрий сервіс", "жахливий товар", "нормальна доставка", "невідомі слова", "", "товар товар товар"]
+
+VARIANTS = {
+    "logreg": lambda: Pipeline([("tfidf", TfidfVectorizer(ngram_range=(1, 2), sublinear_tf=True)),
+                                ("logreg", LogisticRegression())]),
+    "svm": lambda: Pipeline([("tfidf", TfidfVectorizer(analyzer="char_wb", ngram_range=(2, 4), sublinear_tf=True)),
+                             ("svm", LinearSVC())]),
+    "hashing": lambda: Pipeline([("tfidf", HashingTfidfVectorizer(n_features=2 ** 16)),
+                                 ("svm", SGDClassifier(loss="hinge", random_state=0))]),
+}
+
+
+@pytest.mark.parametrize("variant", VARIANTS)
+@pytest.mark.parametrize("labels", LABELS)
+def test_predictions_match_pipeline(variant, labels):
+    pipeline = VARIANTS[variant]().fit(TEXTS, LABELS[labels])
+    predictor = LinearTextPredictor(pipeline)
+
+    expected = pipeline.predict(QUERIES)
+    np.testing.assert_array_equal(predictor.predict_many(QUERIES), expected)
+    assert [predictor.predict(q) for q in QUERIES] == list(expected)
+    np.testing.assert_allclose(predictor.decision_function_many(QUERIES), pipeline.decision_function(QUERIES),
+                               rtol=1e-9, atol=1e-12)
+
+
+@pytest.mark.parametrize("labels", LABELS)
+def test_empty_batch(labels):
+    pipeline = VARIANTS["logreg"]().fit(TEXTS, LABELS[labels])
+    predictor = LinearTextPredictor(pipeline)
+    assert len(predictor.predict_many([])) == 0
+    assert predictor.decision_function_many([]).shape[0] == 0
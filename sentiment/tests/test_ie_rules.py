@@ -0,0 +1,11 @@
+import pytest
+from sentiment.src.bench_ie_rules import columns_to_records, synthetic_corpus
+from sentiment.src.ie_rules import RuleBasedExtractor
+
+
+@pytest.mark.parametrize("n_jobs", [0, 1, 2])
+def test_extract_all_batch_matches_extract_all(n_jobs):
+    extractor = RuleBasedExtractor()
+    texts = synthetic_corpus(300)
+    columns = extractor.extract_all_batch(texts, n_jobs=n_jobs, chunksize=64)
+    assert columns_to_records(columns, len(texts)) == [extractor.extract_all(t) for t in texts]
@@ -0,0 +1,67 @@
+import threading
+from sentiment.src.llm_backends import TransformersBackend, StubBackend, configure_llm, get_llm
+from sentiment.src.llm_extract import _messages
+
+INSTRUCTION_A = "Інструкція А: витягни сутності з відгуку. " * 4
+INSTRUCTION_B = "Інструкція Б: визнач тональність відгуку. " * 4
+# Чергування двох статичних префіксів, як у Triager/Extractor
+PROMPTS = [prefix + f"Відгук {i}: товар {i * 7}" for i in range(3) for prefix in (INSTRUCTION_A, INSTRUCTION_B)]
+
+
+def _generate(backend, prompts):
+    return [backend.generate(_messages(p), max_new_tokens=12, do_sample=False) for p in prompts]
+
+
+def test_prefix_cache_is_opt_in(tiny_llm_pipe):
+    assert TransformersBackend(pipe=tiny_llm_pipe).prefix_cache is False
+
+
+def test_prefix_cache_matches_uncached_greedy_output(tiny_llm_pipe):
+    expected = _generate(TransformersBackend(pipe=tiny_llm_pipe), PROMPTS)
+    cached = TransformersBackend(pipe=tiny_llm_pipe, prefix_cache=True)
+
+    assert _generate(cached, PROMPTS) == expected
+    # Кожна інструкція отримала власний префікс; повторний прохід бере їх з кешу
+    n_prefixes = len(cached._prefixes)
+    assert n_prefixes >= 2
+    assert _generate(cached, PROMPTS) == expected
+    assert len(cached._prefixes) == n_prefixes
+
+
+def test_prefix_cache_concurrent_calls(tiny_llm_pipe):
+    expected = _generate(TransformersBackend(pipe=tiny_llm_pipe), PROMPTS)
+    cached = TransformersBackend(pipe=tiny_llm_pipe, prefix_cache=True)
+    results = [None] * len(PROMPTS)
+
+    def worker(i):
+        results[i] = _generate(cached, [PROMPTS[i]])[0]
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(len(PROMPTS))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == expected
+
+
+def test_stub_backend_registry():
+    configure_llm("stub", response='{"sentiment_type": "neutral"}')
+    try:
+        backend = get_llm()
+        assert isinstance(backend, StubBackend)
+        assert backend.generate_batch([_messages("a"), _messages("b")]) == ['{"sentiment_type": "neutral"}'] * 2
+        assert backend.calls == 2
+    finally:
+        configure_llm()
+
+
+def test_dtype_option_and_env(monkeypatch):
+    monkeypatch.delenv("LLM_DTYPE", raising=False)
+    assert TransformersBackend(model_id="m").dtype == "bfloat16"
+    monkeypatch.setenv("LLM_DTYPE", "float16")
+    assert TransformersBackend(model_id="m").dtype == "float16"
+    configure_llm("transformers", model_id="m", dtype="float32")
+    try:
+        assert get_llm().dtype == "float32"
+    finally:
+        configure_llm()
@@ -0,0 +1,77 @@
+import json
+import pytest
+from sentiment.src.json_schema import EXTRACTION_SCHEMA
+from sentiment.src import llm_backends
+from sentiment.src.llm_backends import StubBackend, TransformersBackend, use_llm
+from sentiment.src.llm_extract import call_llm, call_llm_batch
+from sentiment.src.repair_loop import run_extraction_pipeline, run_extraction_pipeline_batch
+
+VALID = {"sentiment_type": "positive", "mentioned_aspects": ["доставка"], "advantages": "швидко",
+         "disadvantages": None, "rating_mentioned": 5}
+
+
+@pytest.fixture
+def llm():
+    """Тимчасово підміняє спільний бекенд (use_llm) і відновлює його після тесту."""
+    previous = llm_backends._INSTANCE
+    yield use_llm
+    use_llm(previous)
+
+
+def _user_content(messages):
+    return messages[-1]["content"]
+
+
+def test_batch_matches_sequential_call_llm(tiny_llm_pipe, llm):
+    backend = TransformersBackend(pipe=tiny_llm_pipe)
+    llm(backend)
+    prompts = ["Відгук: товар добрий, доставка швидка", "Ок", "Відгук: ціна висока", "Відгук"]
+    expected = [call_llm(p) for p in prompts]
+    assert call_llm_batch(prompts, batch_size=2, backend=backend) == expected
+
+
+def test_batch_keeps_order_and_strips_fences():
+    def responder(messages):
+        prompt = _user_content(messages)
+        return f'```json\n{{"prompt": "{prompt}"}}\n```' if len(prompt) % 2 else f'{{"prompt": "{prompt}"}}'
+
+    prompts = ["ccc", "a", "bbbbbb", "dd", "eeeee"]
+    outputs = call_llm_batch(prompts, batch_size=2, backend=StubBackend(responder=responder))
+    assert [json.loads(o)["prompt"] for o in outputs] == prompts
+
+
+def _responder(messages):
+    # Перша спроба для текстів з "поганий" — невалідна, repair-промпт виправляє
+    prompt = _user_content(messages)
+    if "поганий" in prompt and "зламаний" not in prompt:
+        return '{"sentiment_type": "bad"}'
+    return json.dumps(VALID, ensure_ascii=False)
+
+
+def test_batch_pipeline_resubmits_only_failed_items(llm):
+    texts = ["добрий товар", "поганий товар", "нормально", "поганий сервіс"]
+    stub = StubBackend(responder=_responder)
+    submitted = []
+
+    def llm_batch(prompts, batch_size=8, **kwargs):
+        submitted.append(prompts)
+        return call_llm_batch(prompts, batch_size=batch_size, backend=stub, **kwargs)
+
+    results = run_extraction_pipeline_batch(texts, EXTRACTION_SCHEMA, max_repairs=2, batch_size=3, llm_batch=llm_batch)
+
+    assert [len(prompts) for prompts in submitted] == [4, 2]
+    assert all("поганий" in prompt for prompt in submitted[1])
+    assert [r["repairs_needed"] for r in results] == [0, 1, 0, 1]
+
+    llm(StubBackend(responder=_responder))
+    assert results == [run_extraction_pipeline(t, EXTRACTION_SCHEMA, max_repairs=2) for t in texts]
+
+
+def test_batch_pipeline_gives_up_after_max_repairs():
+    stub = StubBackend(response='{"sentiment_type": "bad"}')
+    results = run_extraction_pipeline_batch(
+        ["a", "b"], EXTRACTION_SCHEMA, max_repairs=1,
+        llm_batch=lambda prompts, batch_size=8, **kw: call_llm_batch(prompts, batch_size, backend=stub, **kw)
+    )
+    assert [r["status"] for r in results] == ["fail", "fail"]
+    assert stub.calls == 4
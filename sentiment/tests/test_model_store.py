@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+from sklearn.pipeline import Pipeline
+from sklearn.svm import LinearSVC
+from sentiment.src.model_store import save_linear_pipeline, load_linear_pipeline
+
+TEXTS = ["добрий товар швидка доставка", "поганий товар", "чудовий сервіс", "жахливий сервіс і доставка",
+         "нормальний магазин", "так собі якість"] * 3
+BINARY = [1, 0, 1, 0, 1, 0] * 3
+MULTICLASS = ["pos", "neg", "pos", "neg", "neu", "neu"] * 3
+QUERIES = ["добрий сервіс", "жахливий товар", "нормальна доставка", "невідомі слова"]
+
+
+def _fit(classifier, labels, **tfidf_params):
+    pipeline = Pipeline([("tfidf", TfidfVectorizer(ngram_range=(1, 2), sublinear_tf=True, **tfidf_params)),
+                         ("clf", classifier)])
+    return pipeline.fit(TEXTS, labels)
+
+
+@pytest.mark.parametrize("classifier", [LogisticRegression(), SGDClassifier(loss="log_loss", random_state=0)])
+@pytest.mark.parametrize("labels", [BINARY, MULTICLASS])
+def test_roundtrip_matches_pipeline(tmp_path, classifier, labels):
+    pipeline = _fit(classifier, labels)
+    save_linear_pipeline(pipeline, str(tmp_path))
+    model = load_linear_pipeline(str(tmp_path))
+
+    np.testing.assert_array_equal(model.predict(QUERIES), pipeline.predict(QUERIES))
+    np.testing.assert_allclose(model.decision_function(QUERIES), pipeline.decision_function(QUERIES), rtol=1e-6)
+    np.testing.assert_allclose(model.predict_proba(QUERIES), pipeline.predict_proba(QUERIES), rtol=1e-6)
+
+
+def test_no_predict_proba_without_source_support(tmp_path):
+    pipeline = _fit(LinearSVC(), MULTICLASS)
+    save_linear_pipeline(pipeline, str(tmp_path))
+    model = load_linear_pipeline(str(tmp_path))
+    assert not hasattr(model, "predict_proba")
+    np.testing.assert_array_equal(model.predict(QUERIES), pipeline.predict(QUERIES))
+
+
+def test_custom_tokenizer_is_refused(tmp_path):
+    pipeline = _fit(LogisticRegression(), BINARY, tokenizer=str.split, token_pattern=None)
+    with pytest.raises(ValueError):
+        save_linear_pipeline(pipeline, str(tmp_path / "model"))
+    assert not (tmp_path / "model").exists()
@@ -0,0 +1,39 @@
+import pytest
+from sentiment.src.ner_pipeline import create_rule_model, needs_full_model, common_lowercase_words
+
+
+@pytest.fixture(scope="module")
+def rule_model():
+    return create_rule_model()
+
+
+@pytest.mark.parametrize("text", [
+    "Привіт. Київ гарний",
+    "Дзвонила в підтримку… Олена дзвонила двічі",
+    "“Олег” сказав, що все буде",
+    "Олександр привіз посилку",
+    "Все добре, але Петро запізнився",
+])
+def test_names_are_routed(rule_model, text):
+    assert needs_full_model(rule_model(text))
+
+
+@pytest.mark.parametrize("text", [
+    "Товар прийшов вчасно. Дуже задоволена.",
+    "Дякую за швидку доставку!",
+    "Замовлення оформила ввечері.\nПрийшло на наступний день",
+    "Ціна 1200 грн, все чудово",
+])
+def test_plain_reviews_are_not_routed(rule_model, text):
+    assert not needs_full_model(rule_model(text))
+
+
+def test_common_words_reduce_routed_share(rule_model):
+    corpus = ["Замовив телефон, все працює.", "Вчора замовив ще один.", "Оператор передзвонив. Київ поруч.",
+              "Гарний оператор.", "Олена дуже допомогла."]
+    docs = list(rule_model.pipe(corpus))
+    common_words = common_lowercase_words(rule_model, corpus, min_count=1)
+
+    assert {"замовив", "оператор"} <= common_words
+    assert [needs_full_model(doc) for doc in docs] == [True, False, True, False, True]
+    assert [needs_full_model(doc, common_words) for doc in docs] == [False, False, True, False, True]
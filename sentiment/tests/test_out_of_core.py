@@ -0,0 +1,38 @@
+import numpy as np
+import pandas as pd
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import SGDClassifier
+from sentiment.src.model_store import save_linear_pipeline, load_linear_pipeline
+from sentiment.src.out_of_core import HashingTfidfVectorizer, train_out_of_core
+
+TEXTS = ["добрий товар швидка доставка", "поганий товар повільна доставка", "чудовий сервіс",
+         "жахливий сервіс", "добрий магазин", "поганий магазин"] * 10
+LABELS = [1, 0, 1, 0, 1, 0] * 10
+
+
+def test_streaming_idf_matches_full_fit():
+    full = HashingTfidfVectorizer(n_features=2 ** 18).fit(TEXTS)
+    streaming = HashingTfidfVectorizer(n_features=2 ** 18)
+    for start in range(0, len(TEXTS), 7):
+        streaming.partial_fit(TEXTS[start:start + 7])
+    np.testing.assert_allclose(streaming.idf_, full.idf_)
+
+    # Без колізій хешів значення ті самі, що й у TfidfVectorizer (з точністю до порядку колонок)
+    expected = TfidfVectorizer(ngram_range=(1, 2), sublinear_tf=True).fit_transform(TEXTS)
+    actual = full.transform(TEXTS)
+    for row in range(3):
+        np.testing.assert_allclose(np.sort(actual[row].data), np.sort(expected[row].data))
+
+
+def test_train_out_of_core_from_csv(tmp_path):
+    path = tmp_path / "train.csv"
+    # Впорядкований за мітками файл і маленькі порції — як великий CSV
+    pd.DataFrame({"text": TEXTS, "target": LABELS}).sort_values("target").to_csv(path, index=False)
+    pipeline = train_out_of_core(str(path), SGDClassifier(loss="hinge", random_state=42), "svm",
+                                 chunksize=16, n_epochs=5, n_features=2 ** 18)
+
+    assert (pipeline.predict(TEXTS) == np.array(LABELS)).mean() == 1.0
+    save_linear_pipeline(pipeline, str(tmp_path / "model"))
+    model = load_linear_pipeline(str(tmp_path / "model"))
+    np.testing.assert_array_equal(model.predict(TEXTS), pipeline.predict(TEXTS))
+    np.testing.assert_allclose(model.decision_function(TEXTS), pipeline.decision_function(TEXTS), rtol=1e-6)
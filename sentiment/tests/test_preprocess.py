@@ -0,0 +1,38 @@
+import csv
+import pytest
+from sentiment.src.preprocess import TextPreprocessor
+
+
+def _read(path):
+    with open(path, encoding="utf-8", newline="") as f:
+        return list(csv.DictReader(f))
+
+
+def test_preprocess_batch_matches_preprocess():
+    preprocessor = TextPreprocessor()
+    texts = ["Привіт  світ!!! Тест.", "", "Дзвоніть 067 123 45 67"]
+    expected = [preprocessor.preprocess(t) for t in texts]
+    assert list(preprocessor.preprocess_batch(texts, n_jobs=0)) == expected
+    assert list(preprocessor.preprocess_batch(texts, n_jobs=2, chunksize=1)) == expected
+
+
+def test_preprocess_csv_empty_input(tmp_path):
+    (tmp_path / "in.csv").write_text("", encoding="utf-8")
+    assert TextPreprocessor().preprocess_csv(str(tmp_path / "in.csv"), str(tmp_path / "out.csv"), n_jobs=1) == 0
+    assert (tmp_path / "out.csv").read_text(encoding="utf-8") == ""
+
+
+def test_preprocess_csv_ragged_rows(tmp_path):
+    (tmp_path / "in.csv").write_text("id,text\n1,Добрий товар.\n2,Другий,зайве\n3\n", encoding="utf-8")
+    n_rows = TextPreprocessor().preprocess_csv(str(tmp_path / "in.csv"), str(tmp_path / "out.csv"), n_jobs=1)
+    rows = _read(tmp_path / "out.csv")
+
+    assert n_rows == 3
+    assert [row["clean_normalized"] for row in rows] == ["Добрий товар.", "Другий", ""]
+    assert list(rows[0]) == ["id", "text", "clean_normalized", "sentences", "sentence_count"]
+
+
+def test_preprocess_csv_missing_text_column(tmp_path):
+    (tmp_path / "in.csv").write_text("id,body\n1,текст\n", encoding="utf-8")
+    with pytest.raises(ValueError):
+        TextPreprocessor().preprocess_csv(str(tmp_path / "in.csv"), str(tmp_path / "out.csv"), n_jobs=1)
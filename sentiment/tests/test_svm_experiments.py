@@ -0,0 +1,69 @@
+import json
+import os
+from sentiment.src import svm_experiments
+from sentiment.src.svm_experiments import run_svm_sweep, load_leaderboard
+
+X_TRAIN = ["добрий товар", "чудова доставка", "поганий сервіс", "жахлива якість"] * 5
+Y_TRAIN = [1, 1, 0, 0] * 5
+X_VAL = ["добрий сервіс", "жахлива доставка"]
+Y_VAL = [1, 0]
+GRID = {"C": [0.1, 1.0], "ngram_range": [(1, 1), (1, 2)]}
+
+
+def _sweep(tmp_path, **kwargs):
+    args = {"X_train": X_TRAIN, "y_train": Y_TRAIN, "X_val": X_VAL, "y_val": Y_VAL, "grid": GRID, "n_jobs": 1,
+            **kwargs}
+    return run_svm_sweep(leaderboard_path=str(tmp_path / "leaderboard.jsonl"), cache_dir=str(tmp_path / "cache"),
+                         **args)
+
+
+def _lines(tmp_path):
+    with open(tmp_path / "leaderboard.jsonl", encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_resume_computes_only_missing_configs(tmp_path, monkeypatch):
+    _sweep(tmp_path, grid={"C": [0.1], "ngram_range": [(1, 1), (1, 2)]})
+    assert len(_lines(tmp_path)) == 2
+
+    fitted = []
+    original_fit = svm_experiments._fit_job
+    monkeypatch.setattr(svm_experiments, "_fit_job",
+                        lambda path, config, *args: fitted.append(config["C"]) or original_fit(path, config, *args))
+    leaderboard = _sweep(tmp_path)
+    assert fitted == [1.0, 1.0]
+    assert len(leaderboard) == 4
+    assert len({row["data_key"] for row in _lines(tmp_path)}) == 1
+
+
+def test_different_data_is_not_skipped(tmp_path):
+    _sweep(tmp_path)
+    leaderboard = _sweep(tmp_path, y_val=[0, 1])
+    assert len(leaderboard) == 4
+    assert len(_lines(tmp_path)) == 8
+    assert len(load_leaderboard(str(tmp_path / "leaderboard.jsonl"))) == 8
+
+
+def test_truncated_cache_file_is_rebuilt(tmp_path):
+    _sweep(tmp_path)
+    cache = tmp_path / "cache"
+    for name in os.listdir(cache):
+        if name.endswith("_val.npz"):
+            # Обірваний запис до виправлення: _train є, _val немає, а тимчасовий файл обрізаний
+            os.remove(cache / name)
+            (cache / name.replace("_val.npz", "_val.tmp.npz")).write_bytes(b"PK")
+    (tmp_path / "leaderboard.jsonl").unlink()
+
+    assert len(_sweep(tmp_path)) == 4
+    assert not [name for name in os.listdir(cache) if ".tmp" in name]
+
+
+
+def _scores(leaderboard):
+    return sorted((row["C"], row["ngram_range"], row["macro_f1"]) for row in leaderboard)
+
+
+def test_n_jobs_zero_runs_sequentially(tmp_path):
+    expected = _scores(_sweep(tmp_path / "one"))
+    assert _scores(_sweep(tmp_path / "zero", n_jobs=0)) == expected
+    assert _scores(_sweep(tmp_path / "pool", n_jobs=2)) == expected
@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.metrics import f1_score
+from sentiment.src.threshold_eval import evaluate_thresholds
+from sentiment.src.threshold_sweep import threshold_sweep, best_thresholds, bootstrap_threshold_ci
+
+
+def _data(n=120, seed=0):
+    rng = np.random.default_rng(seed)
+    y_true = rng.choice(["positive", "negative"], size=n)
+    # Округлення дає однакові оцінки — перевіряємо обробку зв'язків
+    scores = np.round(rng.normal(size=n) + (y_true == "negative"), 1)
+    return y_true, scores
+
+
+@pytest.mark.filterwarnings("ignore::sklearn.exceptions.UndefinedMetricWarning")
+def test_sweep_matches_brute_force_evaluate_thresholds(capsys):
+    y_true, scores = _data()
+    sweep = threshold_sweep(y_true, scores, pos_label="negative")
+    assert sweep["threshold"].is_unique and len(sweep) == len(np.unique(scores))
+
+    for row in sweep.itertuples():
+        y_pred = evaluate_thresholds(y_true, scores, row.threshold, pos_label="negative")
+        assert row.tp == np.sum((y_pred == "negative") & (y_true == "negative"))
+        assert row.fp == np.sum((y_pred == "negative") & (y_true == "positive"))
+        assert np.isclose(row.f1, f1_score(y_true, y_pred, pos_label="negative"))
+    capsys.readouterr()
+
+
+def test_best_thresholds_multiclass():
+    rng = np.random.default_rng(1)
+    classes = np.array(["negative", "neutral", "positive"])
+    y_true = rng.choice(classes, size=90)
+    scores = rng.normal(size=(90, 3)) + (y_true[:, None] == classes)
+    sweep = threshold_sweep(y_true, scores, classes=classes, cost_fn=2.0)
+
+    best = best_thresholds(sweep)
+    assert list(best["class"]) == list(classes)
+    for row in best.to_dict("records"):
+        assert row["f1"] == sweep.loc[sweep["class"] == row["class"], "f1"].max()
+    cheapest = best_thresholds(sweep, metric="cost")
+    assert all(cheapest.set_index("class")["cost"] == sweep.groupby("class")["cost"].min())
+
+
+def test_bootstrap_ci_shape_and_ordering():
+    y_true, scores = _data()
+    thresholds = [-0.5, 0.0, 0.5, 1.0]
+    ci = bootstrap_threshold_ci(y_true, scores, thresholds=thresholds, pos_label="negative", n_boot=300,
+                                batch_size=128, seed=7)
+
+    assert len(ci) == 4 * len(thresholds) + 1
+    assert set(ci["metric"]) == {"precision", "recall", "f1", "cost", "best_f1_threshold"}
+    assert (ci["low"] <= ci["high"]).all()
+    metrics = ci[ci["metric"].isin(["precision", "recall", "f1"])]
+    assert metrics[["low", "high", "value"]].apply(lambda c: c.between(0, 1)).all().all()
+
+    # Точкові значення — ті самі, що й у повному переборі
+    sweep = threshold_sweep(y_true, scores, pos_label="negative")
+    for t in thresholds:
+        expected = sweep[sweep["threshold"] >= t].iloc[-1]["f1"] if (sweep["threshold"] >= t).any() else 0.0
+        assert np.isclose(ci[(ci["metric"] == "f1") & (ci["threshold"] == t)]["value"].item(), expected)
+
+    # Фіксований seed — відтворюваний результат
+    again = bootstrap_threshold_ci(y_true, scores, thresholds=thresholds, pos_label="negative", n_boot=300,
+                                   batch_size=128, seed=7)
+    pd.testing.assert_frame_equal(ci, again)
@@ -0,0 +1,46 @@
+import joblib
+import numpy as np
+import pytest
+from sentiment.src.topic_modeling import IncrementalTopicModel, run_topics_incremental
+
+WORDS = ["товар", "доставка", "сервіс", "ціна", "якість", "магазин", "курʼєр", "упаковка"]
+
+
+def _corpus(n_docs, seed):
+    rng = np.random.default_rng(seed)
+    return [" ".join(rng.choice(WORDS, size=6)) for _ in range(n_docs)]
+
+
+def test_incremental_lsa_state_roundtrip(tmp_path):
+    state = str(tmp_path / "topics.joblib")
+    run_topics_incremental(_corpus(40, 0), None, state, kind="lsa", n_components=3)
+    model, vectorizer, matrix = run_topics_incremental(_corpus(10, 1), None, state, kind="lsa", n_components=3)
+
+    assert matrix.shape == (10, 3)
+    assert not hasattr(model, "explained_variance_ratio_")
+    loaded = IncrementalTopicModel.load(state)
+    assert loaded.n_docs_seen == 50
+    np.testing.assert_allclose(loaded.transform(["товар ціна"]), model.transform(vectorizer.transform(["товар ціна"])))
+
+
+def test_kind_mismatch_raises(tmp_path):
+    state = str(tmp_path / "topics.joblib")
+    run_topics_incremental(_corpus(40, 0), None, state, kind="lda", n_components=3)
+    with pytest.raises(ValueError):
+        run_topics_incremental(_corpus(10, 1), None, state, kind="lsa", n_components=3)
+
+
+def test_failed_save_keeps_previous_state(tmp_path, monkeypatch):
+    state = str(tmp_path / "topics.joblib")
+    run_topics_incremental(_corpus(40, 0), None, state, kind="lda", n_components=3)
+
+    def failing_dump(obj, path):
+        with open(path, "wb") as f:
+            f.write(b"partial")
+        raise OSError("disk full")
+
+    monkeypatch.setattr(joblib, "dump", failing_dump)
+    with pytest.raises(OSError):
+        run_topics_incremental(_corpus(10, 1), None, state, kind="lda", n_components=3)
+    monkeypatch.undo()
+    assert IncrementalTopicModel.load(state).n_docs_seen == 40